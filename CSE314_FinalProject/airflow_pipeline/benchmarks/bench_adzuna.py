@@ -0,0 +1,119 @@
+# Adzuna harvesting against a local fake API: the notebook's one-page-at-a-time
+# loop (sleeping 1/rate between pages) vs harvest_adzuna_jobs under the same
+# rate budget. Checks both keep the same jobs and counts wasted requests.
+# run from airflow_pipeline/:  python -m benchmarks.bench_adzuna --rate 10 --latency 0.2
+import argparse
+import json
+import os
+import tempfile
+import time
+import sqlite3
+from urllib.parse import urlsplit, parse_qs
+
+import requests
+
+from benchmarks.local_server import LocalServer
+from scripts.adzuna_jobs import (
+    ADZUNA_RAW_TABLE,
+    INTERN_KEYWORDS,
+    FOCUS_KEYWORDS,
+    RESULTS_PER_PAGE,
+    MAX_PAGES,
+    scrape_adzuna_jobs,
+)
+
+TITLES = [
+    "Software Engineering Intern", "Data Science Internship", "Marketing Intern",
+    "Backend Developer Intern", "Cloud Intern", "Sales Associate", "Product Design Intern",
+]
+
+
+def adzuna_route(total_by_keyword):
+    # results for keyword k are jobs 0..total-1; "internship" overlaps "intern"
+    # on its first half so cross-keyword dedup has work to do
+    def route(path):
+        url = urlsplit(path)
+        page = int(url.path.rstrip("/").rsplit("/", 1)[-1])
+        keyword = parse_qs(url.query)["what"][0]
+        total = total_by_keyword.get(keyword, 0)
+        offset = 0 if keyword == "intern" else total // 2
+        first = (page - 1) * RESULTS_PER_PAGE
+        results = [
+            {
+                "id": str(offset + i),
+                "title": TITLES[(offset + i) % len(TITLES)],
+                "company": {"display_name": f"Company {(offset + i) % 97}"},
+                "location": {"display_name": "New York, NY"},
+                "category": {"label": "IT Jobs"},
+                "created": "2025-03-09T10:07:17Z",
+                "description": "Join our team for the summer.",
+                "redirect_url": f"https://www.adzuna.com/details/{offset + i}",
+            }
+            for i in range(first, min(first + RESULTS_PER_PAGE, total))
+        ]
+        return 200, json.dumps({"results": results})
+    return route
+
+
+def notebook_loop(url_template, rate):
+    # ScrapeJobs.ipynb, minus the printing
+    all_jobs, requests_made = [], 0
+    for intern_keyword in INTERN_KEYWORDS:
+        for page in range(1, MAX_PAGES + 1):
+            params = {'app_id': 'x', 'app_key': 'y', 'what': intern_keyword, 'where': 'United States',
+                      'results_per_page': RESULTS_PER_PAGE, 'content-type': 'application/json'}
+            data = requests.get(url_template.format(page=page), params=params).json()
+            requests_made += 1
+            if 'results' not in data or not data['results']:
+                break
+            for job in data['results']:
+                title = job['title'].lower()
+                has_intern = any(kw in title for kw in INTERN_KEYWORDS)
+                has_focus = any(kw in title for kw in FOCUS_KEYWORDS)
+                if has_intern and has_focus:
+                    if job['redirect_url'] not in [j['redirect_url'] for j in all_jobs]:
+                        all_jobs.append(job)
+            time.sleep(1 / rate)
+    return all_jobs, requests_made
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--intern-jobs", type=int, default=1_500)
+    parser.add_argument("--internship-jobs", type=int, default=1_000)
+    parser.add_argument("--rate", type=float, default=10.0, help="requests per second budget")
+    parser.add_argument("--in-flight", type=int, default=4)
+    parser.add_argument("--latency", type=float, default=0.2)
+    args = parser.parse_args()
+
+    route = adzuna_route({"intern": args.intern_jobs, "internship": args.internship_jobs})
+    with LocalServer(route, latency=args.latency) as server:
+        url_template = server.url + "/v1/api/jobs/us/search/{page}"
+
+        start = time.perf_counter()
+        expected, nb_requests = notebook_loop(url_template, args.rate)
+        nb_secs = time.perf_counter() - start
+        print(f"notebook loop   {len(expected):5d} jobs  {nb_requests:4d} requests  {nb_secs:6.2f}s")
+
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_path, db_path = os.path.join(tmp, "jobs.csv"), os.path.join(tmp, "jobs.db")
+            stats = scrape_adzuna_jobs(
+                csv_path, db_path, rate_limit=args.rate, max_in_flight=args.in_flight,
+                url_template=url_template, credentials=("x", "y"),
+            )
+            print(f"harvester       {stats['jobs_kept']:5d} jobs  {stats['requests']:4d} requests  "
+                  f"{stats['seconds']:6.2f}s  ({stats['cancelled']} cancelled before sending)  "
+                  f"{nb_secs / stats['seconds']:.1f}x")
+
+            with sqlite3.connect(db_path) as conn:
+                urls = {row[0] for row in conn.execute(f'SELECT "URL" FROM "{ADZUNA_RAW_TABLE}"')}
+            with open(csv_path, encoding="utf-8") as f:
+                csv_rows = sum(1 for _ in f) - 1
+
+    assert urls == {job["redirect_url"] for job in expected}, "harvester kept different jobs"
+    assert csv_rows == len(urls) == stats["jobs_kept"]
+    print("harvester kept the same jobs as the notebook loop")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# build_bridge_tables vs the old iterrows loop, plus a scaling run to show the
+# cost per company stays flat as the company count grows.
+# run from airflow_pipeline/:  python -m benchmarks.bench_bridge_tables
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from scripts.clean_jobs_data import build_bridge_tables
+
+
+def iterrows_bridge_tables(companies):
+    # the loop clean_data() used before build_bridge_tables
+    industry_set = set()
+    company_industries = []
+    for _, row in companies.iterrows():
+        raw = row.get("industries","")
+        if pd.notna(raw):
+            for ind in [i.strip() for i in raw.split(",")]:
+                industry_set.add(ind)
+                company_industries.append((row["normalized_slug"], ind))
+    industries_table = pd.DataFrame({"name": sorted(industry_set)})
+    industries_table["industry_id"] = industries_table.index + 1
+    company_industries_table = (
+        pd.DataFrame(company_industries, columns=["normalized_slug","industry_name"])
+          .merge(industries_table, left_on="industry_name", right_on="name")
+          [["normalized_slug","industry_id"]]
+    )
+    return industries_table, company_industries_table
+
+
+def synthetic_companies(n, distinct_industries=300, seed=314):
+    rng = np.random.default_rng(seed)
+    names = np.array([f"Industry {i}" for i in range(distinct_industries)], dtype=object)
+    counts = rng.integers(0, 5, n)
+    industries = [
+        ", ".join(names[rng.integers(0, distinct_industries, k)]) if k else np.nan
+        for k in counts
+    ]
+    return pd.DataFrame({"normalized_slug": [f"company{i}" for i in range(n)], "industries": industries})
+
+
+def pairs(industries, bridge):
+    # compare by meaning, not by id numbering (build_bridge_tables hashes names)
+    named = bridge.merge(industries, on="industry_id")
+    return sorted(map(tuple, named[["normalized_slug", "name"]].to_numpy().tolist()))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--check-rows", type=int, default=20_000)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50_000, 100_000, 200_000, 400_000])
+    args = parser.parse_args()
+
+    companies = synthetic_companies(args.check_rows)
+    start = time.perf_counter()
+    old_industries, old_bridge = iterrows_bridge_tables(companies)
+    old_secs = time.perf_counter() - start
+    start = time.perf_counter()
+    new_industries, new_bridge = build_bridge_tables(companies, "normalized_slug", "industries", "industry_id")
+    new_secs = time.perf_counter() - start
+    assert old_industries["name"].tolist() == new_industries["name"].tolist(), "industries differ"
+    assert pairs(old_industries, old_bridge) == pairs(new_industries, new_bridge), "bridge rows differ"
+    print(f"{args.check_rows:,} companies: iterrows {old_secs:.2f}s, build_bridge_tables {new_secs:.3f}s "
+          f"({old_secs / new_secs:.0f}x), identical output")
+
+    print(f"{'companies':>10} {'pairs':>10} {'seconds':>8} {'us/company':>11}")
+    for n in args.sizes:
+        companies = synthetic_companies(n)
+        start = time.perf_counter()
+        _, bridge = build_bridge_tables(companies, "normalized_slug", "industries", "industry_id")
+        secs = time.perf_counter() - start
+        print(f"{n:>10,} {len(bridge):>10,} {secs:>8.2f} {secs / n * 1e6:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
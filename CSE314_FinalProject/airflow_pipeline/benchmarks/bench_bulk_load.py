@@ -0,0 +1,82 @@
+# Old per-table connect/write/close loop vs bulk_load over one shared session,
+# both against the SQLite stand-in sink.
+# run from airflow_pipeline/:  python -m benchmarks.bench_bulk_load --rows 200000
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from utils.snowflake_utils import SQLiteSink, bulk_load
+
+
+def synthetic_exports(rows, seed=314):
+    rng = np.random.default_rng(seed)
+    companies = max(rows // 20, 1)
+    return {
+        "TEST2_INTERNSHIPS": pd.DataFrame({
+            "company_id": rng.integers(1, companies, rows),
+            "title": np.array(["SWE Intern", "Data Intern", "PM Intern"], dtype=object)[rng.integers(0, 3, rows)],
+            "location": [f"City {i % 500}, CA" for i in range(rows)],
+            "hourly_rate": rng.uniform(20, 120, rows),
+            "monthly_pay": rng.uniform(3000, 20000, rows),
+            "internship_id": np.arange(1, rows + 1),
+        }),
+        "TEST2_COMPANIES": pd.DataFrame({
+            "normalized_slug": [f"company{i}" for i in range(companies)],
+            "description": ["builds things"] * companies,
+            "company_id": np.arange(1, companies + 1),
+        }),
+        "TEST2_LOCATIONS": pd.DataFrame({
+            "city": [f"City {i}" for i in range(500)], "state": ["CA"] * 500,
+            "country": ["United States"] * 500, "location_id": np.arange(1, 501),
+        }),
+        "TEST2_INTERNSHIP_LOCATIONS": pd.DataFrame({
+            "internship_id": np.arange(1, rows + 1), "location_id": rng.integers(1, 501, rows),
+            "is_remote": np.zeros(rows, dtype=bool),
+        }),
+        "TEST2_INDUSTRIES": pd.DataFrame({"name": [f"Industry {i}" for i in range(300)], "industry_id": np.arange(1, 301)}),
+        "TEST2_COMPANY_INDUSTRIES": pd.DataFrame({
+            "company_id": rng.integers(1, companies, companies * 2), "industry_id": rng.integers(1, 301, companies * 2),
+        }),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--chunk-size", type=int, default=50_000)
+    args = parser.parse_args()
+
+    tables = synthetic_exports(args.rows)
+    total_rows = sum(len(df) for df in tables.values())
+
+    with tempfile.TemporaryDirectory() as tmp, contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        for table_name, df in tables.items():
+            sink = SQLiteSink(os.path.join(tmp, "per_table.db"))
+            sink.write(df, table_name)
+            sink.close()
+        per_table_secs = time.perf_counter() - start
+
+        sink = SQLiteSink(os.path.join(tmp, "bulk.db"))
+        start = time.perf_counter()
+        results = bulk_load(list(zip(tables.values(), tables.keys())), sink,
+                            max_workers=args.workers, chunk_size=args.chunk_size)
+        bulk_secs = time.perf_counter() - start
+        sink.close()
+
+    print(f"{total_rows:,} rows across {len(tables)} tables")
+    for r in results:
+        print(f"  {r['table']:28s} {r['rows']:>9,} rows {r['seconds']:6.2f}s")
+    print(f"connect per table: {per_table_secs:6.2f}s ({total_rows / per_table_secs:,.0f} rows/s)")
+    print(f"bulk_load:         {bulk_secs:6.2f}s ({total_rows / bulk_secs:,.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+# ScrapeJobs.ipynb's Adzuna cleaning cell (whole-CSV read, concatenated
+# duplicate key, uncompiled re.sub per row via .apply, CSV write + read back)
+# vs clean_adzuna_jobs, on a synthetic raw CSV with HTML in the descriptions,
+# ~10% reposts and a few rows missing a company. The notebook's to_sql cell
+# is replaced by load_internships so both end with the same search indexes.
+# Reports rows/s through cleaning (and the CSV write) per worker count, the
+# total with the database load, and checks the cleaned CSV and internships
+# table match the notebook's.
+# run from airflow_pipeline/:  python -m benchmarks.bench_clean_adzuna --rows 500000 --workers 1 4
+import argparse
+import os
+import re
+import sqlite3
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.bench_internships_store import synthetic_jobs
+from scripts.clean_adzuna_jobs import PARALLEL_MIN_ROWS, clean_adzuna_jobs
+from scripts.internships_store import load_internships
+
+
+def synthetic_raw_csv(path, rows, seed=314):
+    rng = np.random.default_rng(seed)
+    df = synthetic_jobs(rows, seed)
+    # Adzuna descriptions come with markup and ragged whitespace
+    df["Description"] = "<p>" + df["Description"].str.replace(". ", ".</p>\n  <p>", regex=False) + "</p>  "
+    reposts = np.flatnonzero(rng.random(rows) < 0.1)
+    sources = rng.integers(0, rows, len(reposts))
+    df.loc[reposts, ["Title", "Company", "Location"]] = df.loc[sources, ["Title", "Company", "Location"]].to_numpy()
+    df.loc[rng.random(rows) < 0.01, "Company"] = None
+    df.to_csv(path, index=False)
+
+
+def notebook_clean(csv_path, clean_csv_path):
+    # the notebook cell, verbatim apart from paths
+    df = pd.read_csv(csv_path)
+    df['Created'] = pd.to_datetime(df['Created'], errors='coerce')
+    df['unique_key'] = df['Title'] + df['Company'] + df['Location']
+    df = df.drop_duplicates(subset='unique_key').drop(columns='unique_key')
+    df = df.dropna(subset=['Title', 'Company', 'Location'])
+
+    def clean_description(desc):
+        desc = re.sub('<[^<]+?>', '', desc)
+        desc = re.sub(r'\s+', ' ', desc)
+        return desc.strip()
+
+    df['Description'] = df['Description'].apply(clean_description)
+    df = df.reset_index(drop=True)
+    df.to_csv(clean_csv_path, index=False)
+
+
+def table_rows(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        return pd.read_sql('SELECT * FROM internships ORDER BY rowid', conn)
+    finally:
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=500_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, os.cpu_count() or 1])
+    parser.add_argument("--chunk-rows", type=int, default=50_000)
+    parser.add_argument("--parallel-min-rows", type=int, default=PARALLEL_MIN_ROWS,
+                        help="0 to use the pool whatever the input size")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        raw = os.path.join(tmp, "raw.csv")
+        synthetic_raw_csv(raw, args.rows)
+        print(f"{args.rows:,} raw rows, {os.path.getsize(raw) / 2**20:.0f} MiB")
+
+        expected_csv, expected_db = os.path.join(tmp, "notebook.csv"), os.path.join(tmp, "notebook.db")
+        start = time.perf_counter()
+        notebook_clean(raw, expected_csv)
+        clean_secs = time.perf_counter() - start
+        load_internships(pd.read_csv(expected_csv), expected_db)
+        secs = time.perf_counter() - start
+        print(f"notebook           {secs:7.2f}s total  {secs - clean_secs:6.2f}s of it loading   "
+              f"{args.rows / clean_secs:10,.0f} rows/s cleaning")
+        expected, expected_table = pd.read_csv(expected_csv), table_rows(expected_db)
+
+        for workers in dict.fromkeys(args.workers):
+            out_csv, out_db = os.path.join(tmp, f"clean_{workers}.csv"), os.path.join(tmp, f"clean_{workers}.db")
+            stats = clean_adzuna_jobs(raw, out_csv, out_db, chunk_rows=args.chunk_rows, workers=workers,
+                                      parallel_min_rows=args.parallel_min_rows)
+            same = pd.read_csv(out_csv).equals(expected) and table_rows(out_db).equals(expected_table)
+            print(f"{stats['workers']:>2} worker(s)       {stats['seconds']:7.2f}s total  {stats['index_seconds']:6.2f}s of it indexing  "
+                  f"{stats['rows_per_second']:10,.0f} rows/s cleaning  {'same output' if same else 'DIFFERENT output'}")
+            assert same
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+# CompanyResolver's trigram blocking vs scoring every known company, on
+# synthetic company names where a share of them reappear as variants (legal
+# suffix, punctuation/case, a dropped letter). Reports resolution time per
+# scale, precision/recall of the merges against the known entities, how many
+# variants plain normalize_slug would have merged, and that blocking picks
+# the same companies as the all-pairs scan.
+# run from airflow_pipeline/:  python -m benchmarks.bench_company_resolution --companies 5000 20000 50000
+import argparse
+import time
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+
+from scripts.company_resolution import CompanyResolver, key_ngrams, normalize_slug
+
+ONSETS = ["b", "c", "d", "f", "g", "h", "j", "k", "l", "m", "n", "p", "r", "s", "t", "v", "w", "y", "z",
+          "br", "cl", "dr", "fl", "gr", "kr", "pl", "qu", "sh", "st", "th", "tr", "ch", "sp", "bl"]
+SYLLABLES = [o + v + c for o in ONSETS for v in ["a", "e", "i", "o", "u", "ai", "ea", "ou", "y"]
+             for c in ["", "n", "r", "x", "l", "m", "s", "t", "ck", "nd"]]
+WORDS = ["", "", "", " Labs", " Capital", " Systems", " Health", " Robotics", " Energy", " AI"]
+SUFFIXES = [" Inc", ", Inc.", " LLC", " Ltd", " Corp", " Corporation", " Limited"]
+
+
+class AllPairsResolver(CompanyResolver):
+    """Scores the key against every known company instead of the blocked candidates."""
+
+    def _best_match(self, key):
+        grams = key_ngrams(key)
+        best, best_score = None, self.threshold
+        for canonical, other in self.grams.items():
+            score = 2 * len(grams & other) / (len(grams) + len(other))
+            if score > best_score or (score == best_score and (best is None or canonical < best)):
+                best, best_score = canonical, score
+        return best, best_score
+
+
+def synthetic_companies(n, variant_rate=0.3, seed=314):
+    """Slugs of n companies plus variants; entity[i] is the company slug i names."""
+    rng = np.random.default_rng(seed)
+    names, seen = [], set()
+    while len(names) < n:
+        base = "".join(rng.choice(SYLLABLES, rng.integers(2, 5))).capitalize() + WORDS[rng.integers(len(WORDS))]
+        if normalize_slug(base) not in seen:
+            seen.add(normalize_slug(base))
+            names.append(base)
+
+    slugs, entity = [n.replace(" ", "-") for n in names], list(range(n))
+    for i in np.flatnonzero(rng.random(n) < variant_rate):
+        name, kind = names[i], rng.integers(3)
+        if kind == 0:
+            variant = name + SUFFIXES[rng.integers(len(SUFFIXES))]
+        elif kind == 1:
+            variant = name.upper().replace(" ", ".")
+        else:
+            cut = rng.integers(1, len(name))
+            variant = name[:cut] + name[cut + 1:] if len(name) >= 10 else name + " Inc"
+        slugs.append(variant.replace(" ", "-"))
+        entity.append(i)
+    order = rng.permutation(np.arange(n, len(slugs)))  # variants arrive after their companies
+    return slugs[:n] + [slugs[i] for i in order], entity[:n] + [entity[i] for i in order]
+
+
+def merge_quality(resolved, entity):
+    # pairs of inputs put together by resolution vs pairs that really are one company
+    def pairs(labels):
+        groups = pd.Series(range(len(labels))).groupby(pd.Series(labels)).apply(list)
+        return {p for g in groups for p in combinations(g, 2)}
+    found, truth = pairs(resolved), pairs(entity)
+    return len(found & truth) / max(len(found), 1), len(found & truth) / max(len(truth), 1)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--companies", type=int, nargs="+", default=[5_000, 20_000])
+    parser.add_argument("--all-pairs-max", type=int, default=20_000)
+    args = parser.parse_args()
+
+    for n in args.companies:
+        slugs, entity = synthetic_companies(n)
+        column = pd.Series(slugs)
+
+        start = time.perf_counter()
+        resolver = CompanyResolver()
+        resolved = resolver.resolve_column(column, column.str.replace("-", " "))
+        blocked_secs = time.perf_counter() - start
+        precision, recall = merge_quality(resolved.tolist(), entity)
+        exact_recall = merge_quality(column.map(normalize_slug).tolist(), entity)[1]
+        line = (f"{n:>7d} companies + {len(slugs) - n:>6d} variants  blocked {blocked_secs:7.2f}s  "
+                f"precision {precision:.3f}  recall {recall:.3f} (normalize_slug alone {exact_recall:.3f})")
+
+        if n <= args.all_pairs_max:
+            start = time.perf_counter()
+            brute = AllPairsResolver().resolve_column(column, column.str.replace("-", " "))
+            brute_secs = time.perf_counter() - start
+            same = brute.equals(resolved)
+            line += f"  all-pairs {brute_secs:8.2f}s  {brute_secs / blocked_secs:6.1f}x  {'same matches' if same else 'DIFFERENT matches'}"
+            assert same
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+# The fan-out DAG's tasks vs the old scrape_data -> clean_data -> upload_data
+# chain, offline: listings come from benchmarks.synthetic, profile fetches are
+# stubbed with a per-page latency (each task gets its own pool of
+# FETCH_CONNECTIONS, as each worker would), and Snowflake is a SQLite file.
+# The fan-out tasks run on a thread pool standing in for Airflow workers,
+# started as soon as their upstream tasks finish. Reports the wall time of
+# both, the fan-out critical path from the measured task times, and checks
+# both produce the same export tables. With Airflow installed it also runs
+# the real DAG once through dag.test() on the same stubs.
+# run from airflow_pipeline/:  python -m benchmarks.bench_dag_fanout --rows 20000 --latency 0.05
+import argparse
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import scripts.scrape_clean_upload as pipeline
+from benchmarks.synthetic import companies_for, raw_companies, raw_internships, raw_simplify
+from scripts.scrape_clean_upload import (
+    COMPANY_EXPORTS,
+    EXPORT_TABLES,
+    INTERNSHIP_EXPORTS,
+    build_company_tables,
+    build_internship_tables,
+    clean_data,
+    clean_listings,
+    collect_profiles,
+    fetch_profile_shard,
+    scrape_data,
+    scrape_listings,
+    upload_data,
+    upload_table,
+)
+from utils.handoff import read_table
+from utils.snowflake_utils import SQLiteSink
+
+FETCH_CONNECTIONS = 32
+
+
+def install_stubs(rows, latency, db_path):
+    companies = companies_for(rows)
+    listings = raw_internships(rows, companies)
+    levels = raw_companies(companies).set_index("company_slug", drop=False)
+    simplify = raw_simplify(companies).set_index("company_name", drop=False)
+
+    def fetch_company_profiles(slugs, names, cache=None, **kwargs):
+        # every page costs `latency`, FETCH_CONNECTIONS of them at a time
+        pages = len(slugs) + len(names)
+        time.sleep(latency * -(-pages // FETCH_CONNECTIONS))
+        return (
+            [levels.loc[s].to_dict() for s in slugs],
+            [simplify.loc[n].to_dict() for n in names],
+        )
+
+    class Sink(SQLiteSink):
+        def __init__(self, config=None):
+            super().__init__(db_path)
+
+    pipeline.scrape_internships = lambda harvest=False: listings.copy()
+    pipeline.fetch_company_profiles = fetch_company_profiles
+    pipeline.SnowflakeSink = Sink
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    fn(*args, **kwargs)
+    return time.perf_counter() - start
+
+
+def run_sequential(directory):
+    return {
+        "scrape_data": timed(scrape_data, directory=directory),
+        "clean_data": timed(clean_data, directory=directory),
+        "upload_data": timed(upload_data, directory=directory),
+    }
+
+
+def run_fanout(directory, shards, workers):
+    """Runs the DAG's tasks on `workers` threads; returns (wall seconds, {task: seconds}, {task: upstream})."""
+    times, upstream = {}, {}
+    start = time.perf_counter()
+
+    def task(name, after, fn, *args, **kwargs):
+        upstream[name] = after
+        task_start = time.perf_counter()
+        result = fn(*args, directory=directory, **kwargs)
+        times[name] = time.perf_counter() - task_start
+        return result
+
+    shard_kwargs = task("scrape_listings", [], scrape_listings, shards=shards)
+    shard_tasks = [f"fetch_profile_shard[{kw['source']}-{kw['shard']}]" for kw in shard_kwargs]
+    with ThreadPoolExecutor(workers) as pool:
+        listings = pool.submit(task, "clean_listings", ["scrape_listings"], clean_listings)
+        for done in [
+            pool.submit(task, name, ["scrape_listings"], fetch_profile_shard, **kw)
+            for name, kw in zip(shard_tasks, shard_kwargs)
+        ]:
+            done.result()
+        task("collect_profiles", shard_tasks, collect_profiles)
+        task("build_company_tables", ["collect_profiles"], build_company_tables)
+        uploads = [
+            pool.submit(task, f"upload_table[{name}]", ["build_company_tables"], upload_table, name)
+            for name in COMPANY_EXPORTS
+        ]
+        listings.result()
+        task("build_internship_tables", ["build_company_tables", "clean_listings"], build_internship_tables)
+        uploads += [
+            pool.submit(task, f"upload_table[{name}]", ["build_internship_tables"], upload_table, name)
+            for name in INTERNSHIP_EXPORTS
+        ]
+        for done in uploads:
+            done.result()
+    return time.perf_counter() - start, times, upstream
+
+
+def critical_path(times, upstream):
+    finish = {}
+
+    def end(name):
+        if name not in finish:
+            finish[name] = times[name] + max((end(u) for u in upstream[name]), default=0.0)
+        return finish[name]
+
+    last = max(times, key=end)
+    path = [last]
+    while upstream[path[-1]]:
+        path.append(max(upstream[path[-1]], key=end))
+    return finish[last], path[::-1]
+
+
+def same_exports(a, b):
+    return all(read_table(name, directory=a).equals(read_table(name, directory=b)) for name, _ in EXPORT_TABLES)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds per profile page")
+    parser.add_argument("--shards", type=int, default=pipeline.PROFILE_SHARDS)
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sequential_dir, fanout_dir = os.path.join(tmp, "sequential"), os.path.join(tmp, "fanout")
+        os.makedirs(sequential_dir)
+        os.makedirs(fanout_dir)
+
+        install_stubs(args.rows, args.latency, os.path.join(tmp, "sequential.db"))
+        sequential = run_sequential(sequential_dir)
+        install_stubs(args.rows, args.latency, os.path.join(tmp, "fanout.db"))
+        wall, times, upstream = run_fanout(fanout_dir, args.shards, args.workers)
+        path_secs, path = critical_path(times, upstream)
+
+        print(f"{args.rows:,} listings, {companies_for(args.rows):,} companies, {args.latency * 1e3:.0f} ms/page, "
+              f"{args.shards} shards per source, {args.workers} workers")
+        print("sequential  " + "  ".join(f"{k} {v:6.2f}s" for k, v in sequential.items())
+              + f"   total {sum(sequential.values()):6.2f}s")
+        print(f"fan-out     wall {wall:6.2f}s   critical path {path_secs:6.2f}s   "
+              f"{sum(sequential.values()) / wall:4.1f}x")
+        for name in path:
+            print(f"  {name:<45} {times[name]:6.2f}s")
+        same = same_exports(sequential_dir, fanout_dir)
+        print(f"exports: {'identical' if same else 'DIFFERENT'}")
+        assert same
+
+        try:
+            import airflow  # noqa: F401
+        except ImportError:
+            print("airflow not installed; skipped dag.test()")
+            return
+        from scrape_clean_upload_dag import dag
+        install_stubs(args.rows, args.latency, os.path.join(tmp, "dag.db"))
+        print(f"dag.test() {timed(dag.test):6.2f}s")
+
+
+if __name__ == "__main__":
+    main()
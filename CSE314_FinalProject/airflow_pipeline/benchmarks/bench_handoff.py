@@ -0,0 +1,71 @@
+# CSV vs Arrow handoff for a large export_internships table: write, full read,
+# projected read, bytes on disk, and whether dtypes survive.
+# run from airflow_pipeline/:  python -m benchmarks.bench_handoff --rows 1000000
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from utils.handoff import write_table, read_table, handoff_path
+
+
+def synthetic_internships(rows, seed=314):
+    rng = np.random.default_rng(seed)
+    titles = np.array(["Software Engineer Intern", "Data Science Intern", "Quant Trader Intern", "PM Intern"], dtype=object)
+    locations = np.array([f"City {i}, CA - Summer 2025" for i in range(500)], dtype=object)
+    hourly = rng.uniform(20, 120, rows).round(2)
+    hourly[rng.random(rows) < 0.1] = np.nan
+    company_id = pd.array(rng.integers(1, 5_000, rows), dtype="Int64")
+    company_id[rng.random(rows) < 0.05] = pd.NA
+    return pd.DataFrame({
+        "company_id": company_id,
+        "title": titles[rng.integers(0, len(titles), rows)],
+        "location": locations[rng.integers(0, len(locations), rows)],
+        "hourly_rate": hourly,
+        "monthly_pay": (hourly * 160).round(0),
+        "degree_requirement": np.where(rng.random(rows) < 0.5, "Undergrad", None),
+        "perks_clean": np.where(rng.random(rows) < 0.5, "Free Food\nHousing", None),
+        "apply_link": [f"https://boards.greenhouse.io/c/jobs/{i}" for i in range(rows)],
+        "internship_id": np.arange(1, rows + 1),
+    })
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    df = synthetic_internships(args.rows)
+    projection = ["company_id", "hourly_rate", "internship_id"]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "export_internships.csv")
+        _, csv_write = timed(lambda: df.to_csv(csv_path, index=False))
+        csv_df, csv_read = timed(lambda: pd.read_csv(csv_path))
+        _, csv_proj = timed(lambda: pd.read_csv(csv_path, usecols=projection))
+
+        _, arrow_write = timed(lambda: write_table(df, "export_internships", directory=tmp))
+        arrow_df, arrow_read = timed(lambda: read_table("export_internships", directory=tmp))
+        _, arrow_proj = timed(lambda: read_table("export_internships", columns=projection, directory=tmp))
+
+        csv_bytes = os.path.getsize(csv_path)
+        arrow_bytes = os.path.getsize(handoff_path("export_internships", tmp))
+
+    print(f"{args.rows:,} rows of export_internships")
+    print(f"{'':10s} {'write':>8s} {'read':>8s} {'3 cols':>8s} {'MB':>8s}")
+    print(f"{'csv':10s} {csv_write:8.2f} {csv_read:8.2f} {csv_proj:8.2f} {csv_bytes / 1e6:8.1f}")
+    print(f"{'arrow':10s} {arrow_write:8.2f} {arrow_read:8.2f} {arrow_proj:8.2f} {arrow_bytes / 1e6:8.1f}")
+    print(f"company_id dtype after round trip: csv={csv_df['company_id'].dtype}, arrow={arrow_df['company_id'].dtype}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+# Virtualized-table harvesting against a DOM stub: the fixture rows are
+# repeated into a table of --rows rows of which only --window are rendered at
+# a time, and each scroll takes --render-delay to show the next window.
+# Compares the old sleep-then-parse scrape with harvest_internship_rows on
+# wall time, rows/s and completeness.
+# run from airflow_pipeline/:  python -m benchmarks.bench_harvest --rows 2000
+import argparse
+import os
+import re
+import time
+
+import lxml.html
+
+from scripts.html_parsers import parse_internship_rows
+from scripts.levels_harvester import (
+    READY_SCRIPT,
+    ROWS_SCRIPT,
+    SCROLL_SCRIPT,
+    PROGRESS_SCRIPT,
+    wait_for_rows,
+    harvest_internship_rows,
+)
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+LEGACY_SLEEP = 5  # what scrape_internships sleeps before parsing
+
+
+def fixture_rows(total):
+    with open(os.path.join(FIXTURES, "levels_internships.html"), encoding="utf-8") as f:
+        doc = lxml.html.document_fromstring(f.read())
+    templates = [lxml.html.tostring(tr, encoding="unicode") for tr in doc.cssselect("tr[data-index]")]
+    return [
+        re.sub(r'data-index="\d+"', f'data-index="{i}"', templates[i % len(templates)], count=1)
+        for i in range(total)
+    ]
+
+
+class VirtualTableDriver:
+    """
+    Stands in for a WebDriver on the Levels.fyi internships page. Only
+    `window` rows starting at `top` are in the DOM; scrolling the last row
+    into view moves `top` to it once `render_delay` has passed.
+    """
+
+    def __init__(self, rows, window=40, render_delay=0.05, load_delay=0.2):
+        self.rows = rows
+        self.window = window
+        self.render_delay = render_delay
+        self.top = 0
+        self.pending = None
+        self.loaded_at = time.perf_counter() + load_delay
+
+    def _render(self):
+        now = time.perf_counter()
+        if self.pending and now >= self.pending[1]:
+            self.top = self.pending[0]
+            self.pending = None
+        if now < self.loaded_at:
+            return []
+        return list(range(self.top, min(self.top + self.window, len(self.rows))))
+
+    @property
+    def page_source(self):
+        rendered = self._render()
+        return "<table><tbody>" + "".join(self.rows[i] for i in rendered) + "</tbody></table>"
+
+    def execute_script(self, script, *args):
+        rendered = self._render()
+        if script == READY_SCRIPT:
+            return bool(rendered)
+        if script == ROWS_SCRIPT:
+            return [[str(i), self.rows[i]] for i in rendered]
+        if script == PROGRESS_SCRIPT:
+            # the last row is only rendered once the table is scrolled to the bottom
+            return [rendered[-1] if rendered else -1, bool(rendered) and rendered[-1] == len(self.rows) - 1]
+        if script == SCROLL_SCRIPT:
+            if rendered:
+                self.pending = (rendered[-1], time.perf_counter() + self.render_delay)
+            return None
+        raise NotImplementedError(script)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=2_000)
+    parser.add_argument("--window", type=int, default=40)
+    parser.add_argument("--render-delay", type=float, default=0.05)
+    parser.add_argument("--settle-timeout", type=float, default=0.5)
+    args = parser.parse_args()
+
+    rows = fixture_rows(args.rows)
+    expected = parse_internship_rows("<table><tbody>" + "".join(rows) + "</tbody></table>")
+
+    # old path: fixed sleep, then whatever is rendered
+    driver = VirtualTableDriver(rows, args.window, args.render_delay)
+    start = time.perf_counter()
+    time.sleep(LEGACY_SLEEP)
+    legacy = parse_internship_rows(driver.page_source)
+    legacy_secs = time.perf_counter() - start
+    print(f"sleep + parse   {len(legacy):6d} rows in {legacy_secs:6.2f}s  {len(legacy) / legacy_secs:8.0f} rows/s  "
+          f"{len(legacy) / len(expected):6.1%} complete")
+
+    driver = VirtualTableDriver(rows, args.window, args.render_delay)
+    start = time.perf_counter()
+    wait_for_rows(driver)
+    harvested, stats = harvest_internship_rows(driver, settle_timeout=args.settle_timeout)
+    secs = time.perf_counter() - start
+    print(f"wait + harvest  {len(harvested):6d} rows in {secs:6.2f}s  {len(harvested) / secs:8.0f} rows/s  "
+          f"{len(harvested) / len(expected):6.1%} complete ({stats['scrolls']} scrolls)")
+
+    assert harvested == expected, "harvested rows differ from the full table"
+    print("harvested rows match the full table")
+
+
+if __name__ == "__main__":
+    main()
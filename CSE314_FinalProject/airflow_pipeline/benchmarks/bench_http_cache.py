@@ -0,0 +1,56 @@
+# Cold vs warm runs of fetch_company_profiles through HttpCache.
+# run from airflow_pipeline/:  python -m benchmarks.bench_http_cache
+import argparse
+import contextlib
+import io
+import tempfile
+import time
+
+from benchmarks.local_server import LocalServer
+from scripts.scrape_jobs import fetch_company_profiles
+from utils.http_cache import HttpCache
+
+
+def run(server, slugs, names, cache):
+    before_requests, before_bytes = server.requests, server.bytes_sent
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        result = fetch_company_profiles(
+            slugs, names, cache=cache,
+            levels_url=server.url + "/companies/{slug}",
+            simplify_url=server.url + "/c/{slug}",
+        )
+        secs = time.perf_counter() - start
+    return result, secs, server.requests - before_requests, server.bytes_sent - before_bytes
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--companies", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.05)
+    args = parser.parse_args()
+
+    names = [f"Company {i}" for i in range(args.companies)]
+    slugs = [f"company-{i}" for i in range(args.companies)]
+
+    with tempfile.TemporaryDirectory() as root, LocalServer(latency=args.latency) as server:
+        runs = [
+            ("cold", HttpCache(root)),
+            ("warm, within TTL", HttpCache(root)),
+            ("warm, TTL expired", HttpCache(root, ttl=0)),
+        ]
+        baseline = None
+        for label, cache in runs:
+            result, secs, requests_made, body_bytes = run(server, slugs, names, cache)
+            baseline = baseline or result
+            assert result == baseline, f"{label}: records differ from cold run"
+            stats = cache.stats
+            print(
+                f"{label:18s} {secs:6.2f}s  requests={requests_made:4d}  body bytes={body_bytes:8d}  "
+                f"hits={stats['hits']} 304={stats['revalidated']} misses={stats['misses']}"
+            )
+            cache.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+# ScrapeJobs.ipynb's LIKE / DATE() queries vs the internships_store query API
+# on a synthetic Adzuna table (default 1M rows, ~500-char descriptions like
+# Adzuna's). The notebook queries run on a plain to_sql table as today, the
+# API on the indexed copy; checks they return the same rows.
+# run from airflow_pipeline/:  python -m benchmarks.bench_internships_store --rows 1000000
+import argparse
+import os
+import sqlite3
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from scripts.internships_store import load_internships, search, recent, top_counts
+
+SENTENCES = np.array([
+    "You will build data pipelines with Python and SQL.",
+    "Experience with PostgreSQL or MySQL is a plus.",
+    "Strong communication skills are required.",
+    "Show leadership in a fast paced team.",
+    "Work on our React frontend and Node backend.",
+    "Interns join for Summer 2025 or Fall 2025.",
+    "We value curiosity, ownership and craftsmanship.",
+    "You will pair with senior engineers on production systems.",
+    "Familiarity with cloud platforms such as AWS or GCP.",
+    "Our mission is to make logistics faster and cheaper.",
+    "Benefits include housing, relocation and a stipend.",
+    "You will present your project to the whole company at the end of the term.",
+] + [f"Team {i} ships features for customers in region {i % 17} every week." for i in range(40)], dtype=object)
+TITLES = np.array([
+    "Software Engineering Intern", "Data Analyst Intern", "Data Engineering Internship",
+    "Backend Developer Intern", "Product Intern", "Machine Learning Intern", "IT Support Intern",
+], dtype=object)
+
+
+def synthetic_jobs(rows, seed=314):
+    rng = np.random.default_rng(seed)
+    # the first 12 sentences carry the searched-for terms and are rare, the
+    # filler is common, so most queries select a few percent of rows
+    weights = np.r_[np.full(12, 0.03 / 12), np.full(len(SENTENCES) - 12, 0.97 / (len(SENTENCES) - 12))]
+    picks = rng.choice(len(SENTENCES), (rows, 9), p=weights)
+    descriptions = [" ".join(SENTENCES[p]) for p in picks]
+    created = pd.Timestamp.now(tz="UTC").normalize() - pd.to_timedelta(rng.integers(0, 120 * 24 * 3600, rows), unit="s")
+    return pd.DataFrame({
+        "Title": TITLES[rng.integers(0, len(TITLES), rows)],
+        "Company": [f"Company {i}" for i in rng.integers(0, 20_000, rows)],
+        "Location": [f"City {i}, {s}" for i, s in zip(rng.integers(0, 3_000, rows), rng.choice(["CA", "NY", "TX", "WA"], rows))],
+        "Category": "IT Jobs",
+        "Created": created.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "Description": descriptions,
+        "URL": [f"https://www.adzuna.com/details/{i}" for i in range(rows)],
+    })
+
+
+def timed(fn, repeat=3):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def same_rows(a, b):
+    key = list(a.columns)
+    return len(a) == len(b) and a.sort_values(key).reset_index(drop=True).equals(b[key].sort_values(key).reset_index(drop=True))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    df = synthetic_jobs(args.rows)
+    with tempfile.TemporaryDirectory() as tmp:
+        plain_path, path = os.path.join(tmp, "plain.db"), os.path.join(tmp, "internships.db")
+        with sqlite3.connect(plain_path) as conn:
+            _, plain_load = timed(lambda: df.to_sql("internships", conn, if_exists="replace", index=False), 1)
+        _, indexed_load = timed(lambda: load_internships(df, path), 1)
+        print(f"load  to_sql {plain_load:6.2f}s {os.path.getsize(plain_path) / 2**20:7.0f} MiB   "
+              f"with indexes {indexed_load:6.2f}s {os.path.getsize(path) / 2**20:7.0f} MiB")
+        del df
+
+        conn, plain = sqlite3.connect(path), sqlite3.connect(plain_path)
+        cases = [
+            ("description mentions sql",
+             "SELECT title, company, location, url FROM internships WHERE LOWER(description) LIKE '%sql%'",
+             lambda: search(conn, "sql", fields=["Description"], columns=["Title", "Company", "Location", "URL"])),
+            ("title contains data",
+             "SELECT title, company, location FROM internships WHERE LOWER(title) LIKE '%data%'",
+             lambda: search(conn, "data", fields=["Title"], columns=["Title", "Company", "Location"])),
+            ("fall 2025 anywhere",
+             "SELECT title, company, location, created FROM internships "
+             "WHERE LOWER(title) LIKE '%fall 2025%' OR LOWER(description) LIKE '%fall 2025%'",
+             lambda: search(conn, "fall 2025", columns=["Title", "Company", "Location", "Created"])),
+            ("soft skills",
+             "SELECT * FROM internships WHERE LOWER(description) LIKE '%communication%' OR LOWER(description) LIKE '%leadership%'",
+             lambda: search(conn, ["communication", "leadership"], fields=["Description"])),
+            ("recent 30 days",
+             "SELECT title, company, location, created FROM internships "
+             "WHERE DATE(created) >= DATE('now', '-30 day') ORDER BY created DESC LIMIT 10",
+             lambda: recent(conn, days=30, limit=10)),
+            ("top companies",
+             "SELECT company, COUNT(*) AS total FROM internships GROUP BY company ORDER BY total DESC, company LIMIT 10",
+             lambda: top_counts(conn, "Company", limit=10)),
+        ]
+        for label, like_sql, api in cases:
+            expected, like_secs = timed(lambda: pd.read_sql_query(like_sql, plain), args.repeat)
+            got, api_secs = timed(api, args.repeat)
+            expected.columns = got.columns
+            if label == "top companies":
+                match = expected["total"].tolist() == got["total"].tolist()  # ties may order differently
+            else:
+                match = same_rows(expected, got)
+            print(f"{label:26s} {len(got):8d} rows  LIKE {like_secs:7.3f}s  index {api_secs:7.3f}s  "
+                  f"{like_secs / api_secs:6.1f}x  {'same rows' if match else 'MISMATCH'}")
+            assert match, label
+        conn.close()
+        plain.close()
+
+
+if __name__ == "__main__":
+    main()
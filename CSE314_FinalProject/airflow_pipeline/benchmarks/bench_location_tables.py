@@ -0,0 +1,92 @@
+# build_location_tables vs the old iterrows + merge loop from clean_data().
+# run from airflow_pipeline/:  python -m benchmarks.bench_location_tables --rows 200000
+import argparse
+import re
+import time
+
+import numpy as np
+import pandas as pd
+
+from scripts.clean_jobs_data import build_location_tables
+
+
+def iterrows_location_tables(internships_table):
+    # the loop clean_data() used before build_location_tables
+    location_set = set()
+    internship_locations = []
+    for _, row in internships_table.iterrows():
+        loc = row["location"]
+        if pd.notna(loc) and isinstance(loc, str):
+            loc_clean = loc.split(" - ")[0].strip()
+            parts = [x.strip() for x in re.split(r",|\n", loc_clean)]
+            if len(parts)==3:
+                city, state, country = parts
+            elif len(parts)==2:
+                city, state = parts; country=""
+            else:
+                city=parts[0]; state=country=""
+            location_set.add((city, state, country))
+            internship_locations.append((row["internship_id"], city, state, country))
+
+    locations_table = pd.DataFrame(list(location_set), columns=["city","state","country"])
+    locations_table["location_id"] = locations_table.index + 1
+    internship_locations_table = (
+        pd.DataFrame(internship_locations, columns=["internship_id","city","state","country"])
+          .merge(locations_table, on=["city","state","country"], how="left")
+          [["internship_id","location_id"]]
+    )
+    internship_locations_table["is_remote"] = False
+    return locations_table, internship_locations_table
+
+
+def synthetic_internships(rows, distinct, seed=314):
+    rng = np.random.default_rng(seed)
+    cities = [f"City {i}" for i in range(distinct)]
+    states = ["CA", "NY", "WA", "TX", "IL", ""]
+    seasons = ["Summer 2025", "Fall 2025", "Spring 2026"]
+    pool = []
+    for i, city in enumerate(cities):
+        state = states[i % len(states)]
+        if i % 10 == 0:
+            pool.append(f"{city}")
+        elif i % 3 == 0:
+            pool.append(f"{city}, {state}, United States - {seasons[i % 3]}")
+        else:
+            pool.append(f"{city}, {state} - {seasons[i % 3]}")
+    pool.append(np.nan)
+    locations = np.array(pool, dtype=object)[rng.integers(0, len(pool), rows)]
+    return pd.DataFrame({"internship_id": np.arange(1, rows + 1), "location": locations})
+
+
+def resolved(locations_table, internship_locations_table):
+    # compare by meaning, not by id numbering (the old set() order was arbitrary)
+    merged = internship_locations_table.merge(locations_table, on="location_id")
+    return set(map(tuple, merged[["internship_id", "city", "state", "country"]].to_numpy().tolist()))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--distinct", type=int, default=2_000)
+    args = parser.parse_args()
+
+    df = synthetic_internships(args.rows, args.distinct)
+
+    start = time.perf_counter()
+    old = iterrows_location_tables(df)
+    old_secs = time.perf_counter() - start
+
+    start = time.perf_counter()
+    new = build_location_tables(df)
+    new_secs = time.perf_counter() - start
+
+    assert len(old[0]) == len(new[0]), "different number of locations"
+    assert resolved(*old) == resolved(*new), "internships resolve to different locations"
+
+    print(f"{args.rows:,} rows, {args.distinct:,} distinct locations")
+    print(f"iterrows + merge:      {old_secs:7.2f}s")
+    print(f"build_location_tables: {new_secs:7.2f}s  ({old_secs / new_secs:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+# Cost of the instrumentation calls, enabled vs disabled (PIPELINE_METRICS=0),
+# against an uninstrumented loop, plus clean_data end to end both ways and a
+# look at the Prometheus textfile it produces.
+# run from airflow_pipeline/:  python -m benchmarks.bench_metrics
+import argparse
+import tempfile
+import time
+
+from benchmarks.synthetic import companies_for, raw_internships, raw_companies, raw_simplify
+from scripts.scrape_clean_upload import clean_data
+from utils import metrics
+from utils.handoff import write_table
+
+
+def per_call(fn, calls):
+    start = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return (time.perf_counter() - start) / calls * 1e9
+
+
+def timed_call():
+    with metrics.timer("bench_seconds", host="example.test"):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=1_000_000)
+    parser.add_argument("--rows", type=int, default=200_000)
+    args = parser.parse_args()
+
+    baseline = per_call(lambda: None, args.calls)
+    for enabled in (True, False):
+        metrics.REGISTRY.enabled = enabled
+        counted = per_call(lambda: metrics.count("bench_total", host="example.test"), args.calls)
+        timed = per_call(timed_call, args.calls)
+        print(f"{'enabled ' if enabled else 'disabled'}  count {counted - baseline:6.0f} ns/call   timer {timed - baseline:6.0f} ns/call")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        companies = companies_for(args.rows)
+        write_table(raw_internships(args.rows), "internships_raw", tmp)
+        write_table(raw_companies(companies), "companies_raw", tmp)
+        write_table(raw_simplify(companies), "simplify_raw", tmp)
+
+        task = metrics.instrument_task(clean_data)
+        for enabled in (False, True):
+            metrics.REGISTRY.enabled = enabled
+            start = time.perf_counter()
+            snapshot = task(tmp)
+            print(f"clean_data {args.rows:,} rows, metrics {'on ' if enabled else 'off'}  {time.perf_counter() - start:.2f}s")
+
+        print(f"\n{len(snapshot['counters'])} counters, {len(snapshot['histograms'])} histograms; textfile excerpt:")
+        print("\n".join(line for line in metrics.REGISTRY.prometheus().splitlines() if "_bucket" not in line)[:1500])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+# MinHash/LSH near-duplicate clustering vs exact pairwise Jaccard on
+# synthetic Adzuna-style postings with injected reposts (a few words changed,
+# a suffix on the title). On a sample small enough for all-pairs comparison,
+# reports precision/recall of the LSH pairs against the exact >= threshold
+# pairs; at scale, throughput, traced peak memory, recall of the injected
+# reposts, and that small batches give the same clusters as large ones.
+# rows/s is measured under tracemalloc, which slows everything several-fold.
+# run from airflow_pipeline/:  python -m benchmarks.bench_near_duplicates --sample 2000 --rows 100000 1000000
+import argparse
+import time
+import tracemalloc
+from itertools import combinations
+
+import numpy as np
+
+from scripts.near_duplicates import NearDuplicateIndex, posting_tokens, DEDUP_THRESHOLD, SHINGLE_SIZE
+
+VOCAB = np.array([f"word{i}" for i in range(20_000)], dtype=object)
+TITLES = np.array([
+    "Software Engineering Intern", "Data Analyst Intern", "Data Engineering Internship",
+    "Backend Developer Intern", "Product Intern", "Machine Learning Intern", "IT Support Intern",
+], dtype=object)
+SUFFIXES = ["", " - Summer 2025", " (Remote)", " - New York"]
+
+
+def synthetic_postings(rows, dup_rate=0.1, seed=314):
+    """
+    (titles, descriptions, source) where source[i] is the posting that i
+    reposts, or i itself. Descriptions are ~80 Zipf-distributed words.
+    """
+    rng = np.random.default_rng(seed)
+    cdf = np.cumsum(1 / np.arange(1, len(VOCAB) + 1))
+    lengths = rng.integers(60, 100, rows)
+    drawn = VOCAB[np.searchsorted(cdf, rng.random(lengths.sum()) * cdf[-1])].tolist()
+    ends = np.cumsum(lengths).tolist()
+    words = [drawn[end - n:end] for end, n in zip(ends, lengths.tolist())]
+    titles = TITLES[rng.integers(0, len(TITLES), rows)].tolist()
+    source = np.arange(rows)
+    reposts = np.flatnonzero(rng.random(rows) < dup_rate)
+    reposts = reposts[reposts > 0]
+    for i in reposts:
+        src = int(source[rng.integers(0, i)])
+        source[i] = src
+        copy = list(words[src])
+        for k in rng.choice(len(copy), rng.integers(0, 3), replace=False):
+            copy[k] = f"edit{rng.integers(1_000_000)}"
+        words[i] = copy
+        titles[i] = titles[src] + SUFFIXES[rng.integers(0, len(SUFFIXES))]
+    return titles, [" ".join(w) for w in words], source
+
+
+def shingle_set(title, description, k=SHINGLE_SIZE):
+    tokens = posting_tokens(title, description)
+    return {tuple(tokens[i:i + k]) for i in range(len(tokens) - k + 1)}
+
+
+def jaccard(titles, descriptions, i, j):
+    a, b = shingle_set(titles[i], descriptions[i]), shingle_set(titles[j], descriptions[j])
+    return len(a & b) / len(a | b)
+
+
+def exact_pairs(titles, descriptions, threshold):
+    sets = [shingle_set(t, d) for t, d in zip(titles, descriptions)]
+    return {(i, j) for i, j in combinations(range(len(sets)), 2)
+            if len(sets[i] & sets[j]) / len(sets[i] | sets[j]) >= threshold}
+
+
+def cluster_pairs(cluster_ids):
+    pairs = set()
+    members = {}
+    for i, c in enumerate(cluster_ids.tolist()):
+        members.setdefault(c, []).append(i)
+    for group in members.values():
+        pairs.update(combinations(group, 2))
+    return pairs
+
+
+def cluster(titles, descriptions, threshold, batch_size):
+    index = NearDuplicateIndex(threshold)
+    for start in range(0, len(titles), batch_size):
+        index.add(titles[start:start + batch_size], descriptions[start:start + batch_size])
+    return index
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sample", type=int, default=2_000)
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000])
+    parser.add_argument("--threshold", type=float, default=DEDUP_THRESHOLD)
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    args = parser.parse_args()
+
+    titles, descriptions, _ = synthetic_postings(args.sample)
+    start = time.perf_counter()
+    exact = exact_pairs(titles, descriptions, args.threshold)
+    pairwise_secs = time.perf_counter() - start
+    start = time.perf_counter()
+    index = cluster(titles, descriptions, args.threshold, args.batch_size)
+    lsh_secs = time.perf_counter() - start
+    found = cluster_pairs(index.cluster_ids())
+    print(f"sample {args.sample} postings, threshold {args.threshold}, {index.bands} bands x {index.rows} rows")
+    print(f"  exact pairwise {pairwise_secs:7.2f}s  {len(exact):6d} pairs")
+    print(f"  minhash/lsh    {lsh_secs:7.2f}s  {len(found):6d} pairs  "
+          f"precision {len(found & exact) / max(len(found), 1):.3f}  recall {len(found & exact) / max(len(exact), 1):.3f}")
+
+    for rows in args.rows:
+        titles, descriptions, source = synthetic_postings(rows)
+        tracemalloc.start()
+        start = time.perf_counter()
+        index = cluster(titles, descriptions, args.threshold, args.batch_size)
+        secs = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        ids = index.cluster_ids()
+
+        # one add() per 100k rows: a single batch for the smaller runs
+        one_pass = cluster(titles, descriptions, args.threshold, min(rows, 100_000)).cluster_ids()
+        # reposts whose edits keep them at or above the threshold should be caught
+        reposts = [i for i in np.flatnonzero(source != np.arange(rows)).tolist()
+                   if jaccard(titles, descriptions, i, int(source[i])) >= args.threshold]
+        caught = (ids[reposts] == ids[source[reposts]]).mean() if reposts else 1.0
+        index_mib = sum(k.nbytes + r.nbytes for runs in index.bucket_runs for k, r in runs) / 2**20
+        print(f"{rows:>9d} rows  {secs:7.2f}s  {rows / secs:8.0f} rows/s  peak {peak / 2**20:7.1f} MiB  "
+              f"index {index_mib:6.1f} MiB  clusters {len(np.unique(ids)):8d}  reposts >= threshold caught {caught:.3f}  "
+              f"{'batch-size independent' if np.array_equal(ids, one_pass) else 'DEPENDS ON BATCH SIZE'}")
+        assert np.array_equal(ids, one_pass)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+# The notebook's per-value parsers (clean_funding and fix_size_encoding from
+# cleaning_normalization.ipynb, via .apply) and pd.to_numeric(errors="coerce")
+# vs scripts.parse_amounts, on synthetic pay, funding and company-size
+# columns: plain and formatted amounts, K/M/B suffixes, ranges, open-ended
+# buckets, Excel-mangled sizes and junk. Reports values/s per column and
+# checks parse_amounts agrees everywhere the old parser produced a value.
+# run from airflow_pipeline/:  python -m benchmarks.bench_parse_amounts --values 1000000 5000000
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from scripts.parse_amounts import fix_size_encoding, parse_amount, parse_headcount
+
+SIZES = ["1-10", "10-Jan", "11-50", "Nov-50", "51-200", "201-500", "501-1,000", "1,001-5,000",
+         "5,001-10,000", "10,001+", "5000", None]
+
+
+def synthetic_columns(n, seed=314):
+    rng = np.random.default_rng(seed)
+    dollars = rng.integers(15, 9_000, n).astype(str)
+    cents = np.char.add(np.char.add(rng.integers(15, 90, n).astype(str), "."), rng.integers(0, 100, n).astype(str))
+    pay = np.select(
+        [rng.random(n) < p for p in (0.4, 0.5, 0.6, 0.7, 0.8)],
+        [dollars, np.char.add("$", dollars), cents, np.char.add(np.char.add("$", dollars), "/hr"), "n/a"],
+        np.char.add(np.char.add("$", dollars), " - $9,999"),
+    )
+    amount = np.char.add(np.char.add("$", np.round(rng.random(n) * 999, 1).astype(str)), rng.choice(["K", "M", "B"], n))
+    funding = np.where(rng.random(n) < 0.8, amount, rng.choice(["$1,500,000", "Undisclosed", "$1-5M", "$10M+"], n))
+    sizes = np.array(SIZES, dtype=object)[rng.integers(0, len(SIZES), n)]
+    return pd.Series(pay, dtype=object), pd.Series(funding, dtype=object), pd.Series(sizes, dtype=object)
+
+
+def notebook_clean_funding(val):
+    # cleaning_normalization.ipynb, verbatim
+    if pd.isna(val): return None
+    val = str(val).replace("$", "").replace(",", "").strip().upper()
+
+    try:
+        if "B" in val:
+            return float(val.replace("B", "")) * 1e9
+        elif "M" in val:
+            return float(val.replace("M", "")) * 1e6
+        elif "K" in val:
+            return float(val.replace("K", "")) * 1e3
+        else:
+            return float(val)
+    except:
+        return None
+
+
+def notebook_fix_size_encoding(val):
+    # cleaning_normalization.ipynb, verbatim
+    if pd.isna(val): return val
+    val = str(val)
+    if val in ["10-Jan", "1-10"]:
+        return "1-10"
+    elif val in ["Nov-50", "11-50"]:
+        return "11-50"
+    else:
+        return val
+
+
+def timed(fn, values):
+    start = time.perf_counter()
+    out = fn(values)
+    return out, len(values) / (time.perf_counter() - start)
+
+
+def agrees(old, new):
+    # wherever the old parser produced a number, the new one produces the same
+    old = pd.to_numeric(old, errors="coerce")
+    parsed = old.notna()
+    return np.allclose(old[parsed], new[parsed]), int(parsed.sum()), int(new.notna().sum())
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--values", type=int, nargs="+", default=[1_000_000, 5_000_000])
+    args = parser.parse_args()
+
+    for n in args.values:
+        pay, funding, sizes = synthetic_columns(n)
+        print(f"{n:,} values per column")
+        cases = [
+            ("pay", pay, lambda s: pd.to_numeric(s, errors="coerce"), parse_amount),
+            ("funding", funding, lambda s: s.apply(notebook_clean_funding), parse_amount),
+            ("headcount", sizes, lambda s: pd.to_numeric(s, errors="coerce"), parse_headcount),
+        ]
+        for name, values, old_fn, new_fn in cases:
+            old, old_rate = timed(old_fn, values)
+            new, new_rate = timed(new_fn, values)
+            same, old_parsed, new_parsed = agrees(old, new)
+            print(f"    {name:<10} old {old_rate:12,.0f} values/s  parse_amounts {new_rate:12,.0f} values/s  "
+                  f"parsed {old_parsed:>10,d} -> {new_parsed:>10,d}  {'agrees' if same else 'DISAGREES'}")
+            assert same
+
+        old, old_rate = timed(lambda s: s.apply(notebook_fix_size_encoding), sizes)
+        new, new_rate = timed(fix_size_encoding, sizes)
+        same = old.equals(new)
+        print(f"    {'size':<10} old {old_rate:12,.0f} values/s  parse_amounts {new_rate:12,.0f} values/s  "
+              f"{'same labels' if same else 'DIFFERENT labels'}")
+        assert same
+
+
+if __name__ == "__main__":
+    main()
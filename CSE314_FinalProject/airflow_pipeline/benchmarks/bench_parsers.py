@@ -0,0 +1,56 @@
+# bs4 vs lxml parser backends on the saved HTML fixtures.
+# run from airflow_pipeline/:  python -m benchmarks.bench_parsers
+import argparse
+import os
+import time
+
+from scripts.html_parsers import (
+    parse_internship_rows,
+    parse_company_info,
+    parse_simplify_company_profile,
+)
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+def load_fixture(name):
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+        return f.read()
+
+
+def timed(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    internships_html = load_fixture("levels_internships.html")
+    company_html = load_fixture("levels_company.html")
+    simplify_html = load_fixture("simplify_company.html")
+    url = "https://simplify.jobs/c/Stripe"
+
+    cases = [
+        ("internship rows", lambda backend: parse_internship_rows(internships_html, backend), True),
+        ("levels company", lambda backend: parse_company_info("stripe", company_html, backend), False),
+        ("simplify profile", lambda backend: parse_simplify_company_profile("Stripe", "Stripe", url, simplify_html, backend), False),
+    ]
+
+    for label, parse, many in cases:
+        results = {}
+        for backend in ("bs4", "lxml"):
+            records, secs = timed(lambda: parse(backend), args.repeat)
+            rows = (len(records) if many else 1) * args.repeat
+            results[backend] = (records, rows / secs)
+        assert results["bs4"][0] == results["lxml"][0], f"{label}: backends disagree"
+        bs4_rate, lxml_rate = results["bs4"][1], results["lxml"][1]
+        print(f"{label:17s} bs4 {bs4_rate:9.0f} rows/s   lxml {lxml_rate:9.0f} rows/s   {lxml_rate / bs4_rate:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+# Sequential get_* loop vs fetch_company_profiles against a local stand-in server.
+# run from airflow_pipeline/:  python -m benchmarks.bench_profile_fetch
+import argparse
+import contextlib
+import io
+import time
+
+from benchmarks.local_server import LocalServer
+from scripts.scrape_jobs import (
+    get_company_info,
+    get_simplify_company_profile,
+    fetch_company_profiles,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--companies", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--per-host", type=int, default=8)
+    args = parser.parse_args()
+
+    names = [f"Company {i}" for i in range(args.companies)]
+    slugs = [f"company-{i}" for i in range(args.companies)]
+
+    with LocalServer(latency=args.latency) as server:
+        levels_url = server.url + "/companies/{slug}"
+        simplify_url = server.url + "/c/{slug}"
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            seq_levels = [get_company_info(slug, levels_url) for slug in slugs]
+            seq_simplify = [get_simplify_company_profile(name, simplify_url) for name in names]
+            seq_secs = time.perf_counter() - start
+
+            start = time.perf_counter()
+            async_levels, async_simplify = fetch_company_profiles(
+                slugs, names, max_per_host=args.per_host,
+                levels_url=levels_url, simplify_url=simplify_url
+            )
+            async_secs = time.perf_counter() - start
+
+    assert seq_levels == async_levels, "Levels.fyi records differ"
+    assert seq_simplify == async_simplify, "Simplify records differ"
+
+    pages = 2 * args.companies
+    print(f"{pages} pages, {args.latency * 1000:.0f} ms simulated latency")
+    print(f"sequential: {seq_secs:.2f}s ({pages / seq_secs:.1f} pages/s)")
+    print(f"async:      {async_secs:.2f}s ({pages / async_secs:.1f} pages/s)")
+    print(f"speedup:    {seq_secs / async_secs:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
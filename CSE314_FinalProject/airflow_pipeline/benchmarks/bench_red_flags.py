@@ -0,0 +1,141 @@
+# The notebook's one-completion-per-cell red-flag loop vs scripts/red_flags.py
+# against a local stand-in for the chat completions endpoint. The stand-in
+# flags fixed phrases, so both must produce the same flags and scores, and
+# its latency grows with the number of texts in a request the way a real
+# completion's does with output length. The module runs twice: cold cache,
+# then warm (no requests at all).
+# run from airflow_pipeline/:  python -m benchmarks.bench_red_flags --companies 200
+import argparse
+import json
+import os
+import re
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+import requests
+
+from benchmarks.local_server import LocalServer
+from scripts.red_flags import RED_FLAG_COLUMNS, add_red_flag_columns
+
+PHRASES = {"long hours": 3, "high turnover": 4, "layoffs": 5, "unpaid": 5, "no mentorship": 2, "fast paced": 1}
+FILLER = ["We build tools for engineers.", "Our team is growing quickly.", "Interns ship real features.",
+          "We value ownership and curiosity.", "Offices in New York and Austin.", "Series B funded."]
+
+
+def stand_in(per_text_latency):
+    def post(path, body):
+        prompt = json.loads(body)["messages"][-1]["content"]
+        numbered = re.split(r"\n\nText (\d+): ", "\n\n" + prompt.split("\n\n", 1)[1])
+        if len(numbered) > 1:
+            texts = dict(zip(numbered[1::2], numbered[2::2]))
+            reply = {n: flag_text(t) for n, t in texts.items()}
+        else:  # the notebook's single-text prompt
+            texts = [prompt.split("Text: ", 1)[1]]
+            reply = flag_text(texts[0])
+        time.sleep(per_text_latency * len(texts))
+        content = "```json\n" + json.dumps(reply) + "\n```"
+        return 200, json.dumps({"choices": [{"message": {"role": "assistant", "content": content}}]})
+    return post
+
+
+def flag_text(text):
+    return {phrase: score for phrase, score in PHRASES.items() if phrase in text.lower()}
+
+
+def synthetic_companies(n, seed=314):
+    # about a third of cells empty, and texts drawn from a pool so boilerplate repeats
+    rng = np.random.default_rng(seed)
+    pool = [" ".join(rng.choice(FILLER + list(PHRASES), rng.integers(2, 6))) + f" Ref {i}."
+            for i in range(int(n * len(RED_FLAG_COLUMNS) * 0.5))]
+    data = {"company_name": [f"Company {i}" for i in range(n)]}
+    for col in RED_FLAG_COLUMNS:
+        cells = np.array(pool, dtype=object)[rng.integers(0, len(pool), n)]
+        cells[rng.random(n) < 0.33] = None
+        data[col] = cells
+    return pd.DataFrame(data)
+
+
+def notebook_loop(df, url):
+    # chat_gpt_api.ipynb: one synchronous completion per cell, then apply(axis=1)
+    def detect_red_flags_and_weights(text):
+        if pd.isna(text) or not text.strip():
+            return {}
+        prompt = (
+            "Identify any red‐flag concerns for job candidates in the following text. "
+            "For each one, give a severity score from 1 (minor) to 5 (major). "
+            "Return *only* a JSON object where keys are the red‐flag phrase and values are the score.\n\n"
+            f"Text: {text}"
+        )
+        resp = requests.post(url, json={"model": "gpt-3.5-turbo", "messages": [
+            {"role": "system", "content": "You are a concise assistant."},
+            {"role": "user", "content": prompt},
+        ]}).json()
+        raw = resp["choices"][0]["message"]["content"].strip()
+        try:
+            json_part = raw
+            if raw.startswith("```"):
+                json_part = raw.split("```")[1]
+            return json.loads(json_part.removeprefix("json"))
+        except json.JSONDecodeError:
+            return {}
+
+    df = df.copy()
+    flag_cols = [f'{col}_red_flags_with_weights' for col in RED_FLAG_COLUMNS]
+    for col in RED_FLAG_COLUMNS:
+        df[f'{col}_red_flags_with_weights'] = df[col].apply(detect_red_flags_and_weights)
+
+    def compute_red_flag_score(row):
+        total = 0
+        for col in flag_cols:
+            flags = row.get(col, {})
+            if isinstance(flags, dict):
+                total += sum(flags.values())
+        return total
+
+    df['red_flag_score'] = df.apply(compute_red_flag_score, axis=1)
+    return df
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--companies", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.1, help="seconds per request")
+    parser.add_argument("--per-text", type=float, default=0.05, help="extra seconds per text in a request")
+    parser.add_argument("--rate", type=float, default=10.0)
+    parser.add_argument("--in-flight", type=int, default=4)
+    args = parser.parse_args()
+
+    df = synthetic_companies(args.companies)
+    cells = df[RED_FLAG_COLUMNS].notna().to_numpy().sum()
+    distinct = pd.unique(df[RED_FLAG_COLUMNS].to_numpy().ravel())
+    print(f"{args.companies} companies, {cells} non-empty cells, {pd.notna(distinct).sum()} distinct texts")
+
+    with LocalServer(latency=args.latency, post=stand_in(args.per_text)) as server:
+        url = server.url + "/v1/chat/completions"
+
+        start = time.perf_counter()
+        expected = notebook_loop(df, url)
+        nb_secs = time.perf_counter() - start
+        print(f"notebook loop      {server.requests:5d} requests  {nb_secs:7.2f}s")
+
+        with tempfile.TemporaryDirectory() as tmp:
+            cache_path = os.path.join(tmp, "red_flags.db")
+            for label in ("module, cold cache", "module, warm cache"):
+                server.requests = 0
+                start = time.perf_counter()
+                got, _ = add_red_flag_columns(df, cache_path=cache_path, url=url, api_key="test",
+                                              rate_limit=args.rate, max_in_flight=args.in_flight)
+                secs = time.perf_counter() - start
+                same = (
+                    all(got[c].tolist() == expected[c].tolist() for c in expected.columns if c.endswith("_weights"))
+                    and np.array_equal(got["red_flag_score"].to_numpy(), expected["red_flag_score"].to_numpy())
+                )
+                print(f"{label:18s} {server.requests:5d} requests  {secs:7.2f}s  {nb_secs / secs:7.1f}x  "
+                      f"{'same flags and scores' if same else 'MISMATCH'}")
+                assert same
+
+
+if __name__ == "__main__":
+    main()
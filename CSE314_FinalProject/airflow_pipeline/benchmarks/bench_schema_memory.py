@@ -0,0 +1,93 @@
+# Peak RSS of clean_data on synthetic raw tables with the schema registry's
+# categoricals vs every string column as Python objects (the registry with
+# CATEGORY downgraded to STRING). Each run is a fresh spawned process so its
+# peak is its own (read from /proc/self/status, so Linux only). Also prints
+# memory_report for the frames clean_data works on, and checks both runs
+# write the same exports.
+# run from airflow_pipeline/:  python -m benchmarks.bench_schema_memory --rows 1000000
+import argparse
+import multiprocessing
+import os
+import tempfile
+import time
+
+from benchmarks.synthetic import companies_for, raw_companies, raw_internships, raw_simplify
+
+
+def _peak_rss_mib():
+    # VmHWM starts over at exec; ru_maxrss would carry the parent's peak in
+    with open("/proc/self/status") as f:
+        return next(int(line.split()[1]) for line in f if line.startswith("VmHWM")) / 2**10
+
+
+def _downgrade_categories(schemas):
+    for columns in schemas.TABLES.values():
+        for column, kind in columns.items():
+            if kind == schemas.CATEGORY:
+                columns[column] = schemas.STRING
+
+
+def _clean(directory, categories, queue):
+    import utils.schemas as schemas
+    from scripts.clean_jobs_data import clean_internships
+    from scripts.scrape_clean_upload import clean_data
+    from utils.handoff import read_table
+
+    if not categories:
+        _downgrade_categories(schemas)
+    base = _peak_rss_mib()
+    start = time.perf_counter()
+    clean_data(directory)
+    seconds = time.perf_counter() - start
+    peak = _peak_rss_mib()
+
+    raw = read_table("internships_raw", directory=directory)
+    report = schemas.memory_report({"internships_raw": raw, "internships_clean": clean_internships(raw)}, log=False)
+    queue.put((seconds, base, peak, report))
+
+
+def run(directory, categories):
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    child = ctx.Process(target=_clean, args=(directory, categories, queue))
+    child.start()
+    result = queue.get()
+    child.join()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="+", default=[200_000, 1_000_000])
+    args = parser.parse_args()
+
+    from utils.handoff import read_table, write_table
+    from scripts.scrape_clean_upload import EXPORT_TABLES
+
+    for rows in args.rows:
+        with tempfile.TemporaryDirectory() as tmp:
+            dirs = {}
+            for label in ("objects", "categoricals"):
+                dirs[label] = os.path.join(tmp, label)
+                os.makedirs(dirs[label])
+                write_table(raw_internships(rows), "internships_raw", dirs[label])
+                write_table(raw_companies(companies_for(rows)), "companies_raw", dirs[label])
+                write_table(raw_simplify(companies_for(rows)), "simplify_raw", dirs[label])
+
+            results = {label: run(dirs[label], label == "categoricals") for label in dirs}
+            for label, (seconds, base, peak, report) in results.items():
+                print(f"{rows:>9,d} rows  {label:<12}  clean_data {seconds:6.2f}s  "
+                      f"peak RSS {peak:7.1f} MiB  (+{peak - base:7.1f} over imports)")
+                for r in report.itertuples(index=False):
+                    print(f"    {r.table:<18} {r.mib:8.1f} MiB  object {r.object_mib:8.1f} MiB  "
+                          f"{r.categorical_columns} categorical columns")
+            same = all(
+                read_table(name, directory=dirs["objects"]).equals(read_table(name, directory=dirs["categoricals"]))
+                for name, _ in EXPORT_TABLES
+            )
+            print(f"    exports {'identical' if same else 'DIFFERENT'}")
+            assert same
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+# SimilarityIndex on synthetic postings (default 200k): fit time, adding a
+# batch incrementally vs refitting, single and batched top-k query latency
+# against the inverted (term x posting) matrix vs scoring every row
+# (rows @ q.T, what linear_kernel does), and reopening the saved index
+# memory-mapped vs read into memory. Checks the inverted-index results match
+# the full scan.
+# run from airflow_pipeline/:  python -m benchmarks.bench_similarity_index --rows 200000
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from benchmarks.bench_near_duplicates import synthetic_postings
+from scripts.similarity_index import SimilarityIndex, _top_k
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def full_scan(index, position, k):
+    # every row scored, then the same top-k selection
+    scores = (index.rows @ index.rows[position].T).tocoo()
+    return _top_k(scores.data, scores.row, k, exclude=position)
+
+
+def latencies(fn, items):
+    times = []
+    for item in items:
+        start = time.perf_counter()
+        fn(item)
+        times.append(time.perf_counter() - start)
+    return np.percentile(times, 50) * 1e3, np.percentile(times, 95) * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--add", type=int, default=10_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    args = parser.parse_args()
+
+    titles, descriptions, _ = synthetic_postings(args.rows + args.add)
+    texts = [f"{t} {d}" for t, d in zip(titles, descriptions)]
+    base, extra = texts[:args.rows], texts[args.rows:]
+
+    index, fit_secs = timed(lambda: SimilarityIndex().fit(base))
+    _, add_secs = timed(lambda: index.add(extra))
+    _, refit_secs = timed(lambda: SimilarityIndex().fit(texts))
+    print(f"fit {args.rows:,} postings {fit_secs:6.2f}s   add {args.add:,} {add_secs:6.2f}s   "
+          f"refit on {len(texts):,} {refit_secs:6.2f}s   vocabulary {len(index.vectorizer.vocabulary_):,}  "
+          f"nnz {index.rows.nnz + (index.delta.nnz if index.delta is not None else 0):,}")
+
+    index._fold()
+    rng = np.random.default_rng(7)
+    probes = rng.integers(0, len(index), args.queries).tolist()
+
+    # the inverted index must find what a scan of every row finds
+    mismatched = 0
+    for p in probes:
+        got = index.similar_to(p, args.k)
+        ids, scores = full_scan(index, p, args.k)
+        # postings tied with the k-th score (to float rounding) may swap in or out
+        clear = scores > scores[-1] + 1e-5
+        if not (np.allclose(got["score"], scores, atol=1e-5) and set(got["id"][clear]) == set(ids[clear].tolist())):
+            mismatched += 1
+    print(f"top-{args.k} for {len(probes)} postings: {'same as full scan' if not mismatched else f'{mismatched} differ'}")
+
+    scan_p50, scan_p95 = latencies(lambda p: full_scan(index, p, args.k), probes)
+    inv_p50, inv_p95 = latencies(lambda p: index.similar_to(p, args.k), probes)
+    free_p50, free_p95 = latencies(lambda t: index.query(t, args.k), [" ".join(t.split()[:8]) for t in texts[:args.queries]])
+    _, batch_secs = timed(lambda: index.similar_to(probes, args.k))
+    print(f"similar_to  full scan  p50 {scan_p50:7.2f} ms  p95 {scan_p95:7.2f} ms")
+    print(f"similar_to  inverted   p50 {inv_p50:7.2f} ms  p95 {inv_p95:7.2f} ms   {scan_p50 / inv_p50:5.1f}x")
+    print(f"free-text query        p50 {free_p50:7.2f} ms  p95 {free_p95:7.2f} ms")
+    print(f"batched similar_to     {len(probes) / batch_secs:7.0f} postings/s")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        _, save_secs = timed(lambda: index.save(tmp))
+        size = sum(os.path.getsize(os.path.join(tmp, f)) for f in os.listdir(tmp))
+        mapped, map_secs = timed(lambda: SimilarityIndex.load(tmp))
+        _, first_secs = timed(lambda: mapped.similar_to(probes[0], args.k))
+        loaded, load_secs = timed(lambda: SimilarityIndex.load(tmp, mmap=False))
+        same = all(mapped.similar_to(p, args.k).equals(loaded.similar_to(p, args.k)) for p in probes[:20])
+        print(f"save {save_secs:5.2f}s  {size / 2**20:6.1f} MiB   load mmap {map_secs * 1e3:7.1f} ms "
+              f"(first query {first_secs * 1e3:6.1f} ms)   load into memory {load_secs * 1e3:7.1f} ms   "
+              f"{'same results' if same else 'MISMATCH'}")
+        assert same and not mismatched
+        del mapped, loaded
+
+
+if __name__ == "__main__":
+    main()
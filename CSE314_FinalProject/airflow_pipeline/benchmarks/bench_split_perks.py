@@ -0,0 +1,69 @@
+# split_perks_columns vs df['perks'].apply(split_perks): randomized equivalence
+# check, then throughput at scale.
+# run from airflow_pipeline/:  python -m benchmarks.bench_split_perks --rows 1000000
+import argparse
+import random
+import time
+
+import numpy as np
+import pandas as pd
+
+from scripts.clean_jobs_data import split_perks, split_perks_columns
+
+PIECES = ["Undergrad", "undergrad", "Masters", "PhD", "PhDs", "Phd student", "Free Food",
+          "Housing", "Relocation", " ", "", '"', "\\n", "\n", "Masters\\n", "401k"]
+
+
+def random_perks(rng, n):
+    values = []
+    for _ in range(n):
+        if rng.random() < 0.05:
+            values.append(np.nan)
+            continue
+        k = rng.randint(0, 4)
+        values.append("".join(rng.choice(PIECES) + rng.choice(["", "\n", "\\n", " "]) for _ in range(k)))
+    return pd.Series(values, dtype=object)
+
+
+def check_equivalence(rng, n):
+    perks = random_perks(rng, n)
+    expected = perks.apply(split_perks)
+    actual = split_perks_columns(perks)
+    pd.testing.assert_frame_equal(
+        actual.reset_index(drop=True), expected.reset_index(drop=True), check_dtype=False
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--apply-rows", type=int, default=100_000,
+                        help="apply() is timed on a sample this size and reported as rows/s")
+    parser.add_argument("--seed", type=int, default=314)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    for _ in range(50):
+        check_equivalence(rng, 200)
+    print("equivalence: 50 random batches identical to split_perks")
+
+    sample = random_perks(rng, 10_000)
+    perks = pd.Series(np.resize(sample.to_numpy(), args.rows), dtype=object)
+
+    start = time.perf_counter()
+    split_perks_columns(perks)
+    vec_secs = time.perf_counter() - start
+
+    apply_rows = min(args.apply_rows, args.rows)
+    start = time.perf_counter()
+    perks.iloc[:apply_rows].apply(split_perks)
+    apply_secs = time.perf_counter() - start
+
+    vec_rate, apply_rate = args.rows / vec_secs, apply_rows / apply_secs
+    print(f"apply(split_perks):  {apply_rate:12,.0f} rows/s  ({apply_rows:,} rows)")
+    print(f"split_perks_columns: {vec_rate:12,.0f} rows/s  ({args.rows:,} rows in {vec_secs:.2f}s)")
+    print(f"speedup:             {vec_rate / apply_rate:12.1f}x")
+
+
+if __name__ == "__main__":
+    main()
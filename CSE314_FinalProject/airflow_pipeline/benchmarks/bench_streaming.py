@@ -0,0 +1,88 @@
+# Peak traced memory of the streaming pipeline as a synthetic listing feed
+# grows, next to materializing the same feed as one DataFrame and cleaning it.
+# Streaming peak should stay flat; materialized peak grows with the feed.
+# rows/s is measured under tracemalloc, which slows everything several-fold.
+# run from airflow_pipeline/:  python -m benchmarks.bench_streaming --rows 10000 100000 1000000
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from scripts.clean_jobs_data import clean_internships
+from scripts.stream_pipeline import stream_pipeline, STREAM_BATCH_SIZE
+
+
+class CountingSink:
+    """Drops every frame after counting it, so only the pipeline's own memory is traced."""
+
+    def __init__(self):
+        self.rows = {}
+
+    def write(self, df, table_name, chunk_size=None):
+        self.rows[table_name] = self.rows.get(table_name, 0) + len(df)
+        return len(df)
+
+
+def synthetic_feed(rows, companies=2_000, locations=500, seed=314):
+    # yields raw internship records lazily, the way iter_internships does
+    rng = np.random.default_rng(seed)
+    titles = ["Software Engineer Intern", "Data Science Intern", "Quant Trader Intern", "PM Intern"]
+    perks = ["Undergrad\nFree Food, Housing", "Masters", "Relocation", ""]
+    for start in range(0, rows, 10_000):
+        n = min(10_000, rows - start)
+        company = rng.integers(0, companies, n)
+        location = rng.integers(0, locations, n)
+        hourly = rng.uniform(20, 120, n).round(2)
+        monthly = (hourly * 160).round(0).astype(int)
+        title = rng.integers(0, len(titles), n)
+        perk = rng.integers(0, len(perks), n)
+        for i in range(n):
+            yield {
+                "company_slug": f"company-{company[i]}",
+                "company_name": f"Company {company[i]}",
+                "title": titles[title[i]],
+                "location": f"City {location[i]}, CA, United States - Summer 2025",
+                "hourly_rate": str(hourly[i]),
+                "monthly_pay": str(monthly[i]),
+                "perks": perks[perk[i]],
+                "apply_link": f"https://boards.greenhouse.io/c/jobs/{start + i}",
+            }
+
+
+def traced(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, peak, seconds
+
+
+def materialized(rows):
+    return len(clean_internships(pd.DataFrame(list(synthetic_feed(rows)))))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--batch-size", type=int, default=STREAM_BATCH_SIZE)
+    parser.add_argument("--materialized-max", type=int, default=1_000_000,
+                        help="skip the materialized comparison above this many rows")
+    args = parser.parse_args()
+
+    for rows in args.rows:
+        sink = CountingSink()
+        counts, peak, secs = traced(lambda: stream_pipeline(synthetic_feed(rows), sink, batch_size=args.batch_size))
+        assert counts["internships"] == rows, counts
+        line = f"{rows:>11,} rows  streaming peak {peak / 2**20:8.1f} MiB  {rows / secs:9.0f} rows/s"
+        if rows <= args.materialized_max:
+            _, peak, secs = traced(lambda: materialized(rows))
+            line += f"   materialized peak {peak / 2**20:8.1f} MiB"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+# Append vs upsert loads of repeated snapshots into the SQLite stand-in sink:
+# rows staged per run, time per run, and a check that the upserted table ends
+# up equal to the latest snapshot.
+# run from airflow_pipeline/:  python -m benchmarks.bench_upsert --rows 200000
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from utils.snowflake_utils import SQLiteSink, UPSERT_KEYS, ROW_HASH, upsert_dataframe
+
+TABLE = "TEST2_INTERNSHIPS"
+
+
+def snapshot(rows, seed=314):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "company_id": rng.integers(1, 5_000, rows),
+        "title": np.array(["SWE Intern", "Data Intern", "PM Intern"], dtype=object)[rng.integers(0, 3, rows)],
+        "location": [f"City {i % 500}, CA" for i in range(rows)],
+        "hourly_rate": rng.uniform(20, 120, rows).round(2),
+        "apply_link": [f"https://boards.greenhouse.io/c/jobs/{i}" for i in range(rows)],
+    })
+
+
+def churn(df, fraction, seed):
+    # change pay on some rows and add the same number of brand new postings
+    rng = np.random.default_rng(seed)
+    df = df.copy()
+    n = int(len(df) * fraction)
+    changed = rng.choice(len(df), n, replace=False)
+    df.loc[changed, "hourly_rate"] += 1.0
+    new = df.sample(n, random_state=seed).copy()
+    new["apply_link"] = [f"https://boards.greenhouse.io/c/jobs/new-{seed}-{i}" for i in range(n)]
+    return pd.concat([df, new], ignore_index=True)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--churn", type=float, default=0.01)
+    args = parser.parse_args()
+
+    keys = UPSERT_KEYS[TABLE]
+    runs = [("initial", snapshot(args.rows))]
+    runs.append(("no changes", runs[-1][1]))
+    runs.append((f"{args.churn:.0%} churn", churn(runs[-1][1], args.churn, seed=1)))
+
+    append_sink, upsert_sink = SQLiteSink(), SQLiteSink()
+    print(f"{'run':12s} {'append rows':>12s} {'append s':>9s} {'upsert rows':>12s} {'upsert s':>9s}")
+    for label, df in runs:
+        start = time.perf_counter()
+        appended = append_sink.write(df, TABLE)
+        append_secs = time.perf_counter() - start
+
+        start = time.perf_counter()
+        staged = upsert_dataframe(df, TABLE, keys, upsert_sink)
+        upsert_secs = time.perf_counter() - start
+        print(f"{label:12s} {appended:>12,} {append_secs:>9.2f} {staged:>12,} {upsert_secs:>9.2f}")
+
+    latest = runs[-1][1].drop_duplicates(subset=keys, keep="last")
+    loaded = pd.read_sql_query(f'SELECT * FROM "{TABLE}"', upsert_sink.conn).drop(columns=[ROW_HASH])
+    sort = lambda d: d.sort_values(keys).reset_index(drop=True)[list(latest.columns)]
+    pd.testing.assert_frame_equal(sort(latest), sort(loaded), check_dtype=False)
+    appended_total = pd.read_sql_query(f'SELECT COUNT(*) AS n FROM "{TABLE}"', append_sink.conn)["n"][0]
+    print(f"upserted table matches latest snapshot ({len(loaded):,} rows); append table holds {appended_total:,} rows")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+import hashlib
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+LEVELS_PAGE = """<html><body>
+<div class="company-page_companyDescription__JVjrt"><p>{slug} builds things.</p></div>
+<h6 class="MuiTypography-subtitle1"><a href="https://{slug}.com">site</a></h6>
+<h6 class="MuiTypography-subtitle1"><a href="https://twitter.com/{slug}">tw</a></h6>
+<h6 class="MuiTypography-subtitle1"><a href="https://linkedin.com/company/{slug}">li</a></h6>
+<div><h6>2004</h6><span>Year Founded</span></div>
+<div><h6>1,000</h6><span># of Employees</span></div>
+<iframe title="Company Address" src="https://maps.google.com/?q=1%20Main%20St,Springfield,IL"></iframe>
+</body></html>"""
+
+SIMPLIFY_PAGE = """<html><body>
+<h2>Simplify's Take</h2><p>{slug} is solid.</p>
+<h3>What believers are saying</h3><li>Good pay</li><li>Smart people</li>
+<h3>What critics are saying</h3><li>Long hours</li>
+<h3>What makes {slug} unique</h3><p>Scale.</p>
+<h3>Benefits</h3><li>Health Insurance</li><li>401k</li>
+<h3>About</h3><div>Founded a while ago.</div>
+<h5>4.2</h5><span>Simplify's Rating</span>
+<h5>A</h5><span>Competitive Edge</span>
+<h5>B+</h5><span>Growth Potential</span>
+<h5>C</h5><span>Rating Differentiation</span>
+</body></html>"""
+
+
+def profile_page(path):
+    slug = path.rstrip("/").rsplit("/", 1)[-1]
+    if path.startswith("/companies/"):
+        return 200, LEVELS_PAGE.format(slug=slug)
+    if path.startswith("/c/"):
+        return 200, SIMPLIFY_PAGE.format(slug=slug)
+    return 404, "<html><body>not found</body></html>"
+
+
+class LocalServer:
+    """
+    Stand-in HTTP server for the upstream sites. `route(path)` returns
+    (status, body) and every response is delayed by `latency` seconds so
+    fetch strategies can be compared offline. 200 responses carry an ETag
+    and a matching If-None-Match gets an empty 304. POSTs go to
+    `post(path, body)`, which returns (status, JSON text).
+    """
+
+    def __init__(self, route=profile_page, latency=0.05, post=None):
+        self.route = route
+        self.post = post
+        self.latency = latency
+        self.requests = 0
+        self.not_modified = 0
+        self.bytes_sent = 0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                server.requests += 1
+                time.sleep(server.latency)
+                status, body = server.route(self.path)
+                data = body.encode("utf-8")
+                etag = '"%s"' % hashlib.md5(data).hexdigest()
+                if status == 200 and self.headers.get("If-None-Match") == etag:
+                    server.not_modified += 1
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                server.bytes_sent += len(data)
+                self.send_response(status)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(data)))
+                if status == 200:
+                    self.send_header("ETag", etag)
+                self.end_headers()
+                try:
+                    self.wfile.write(data)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass  # client cancelled the request mid-response
+
+            def do_POST(self):
+                server.requests += 1
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                time.sleep(server.latency)
+                status, reply = server.post(self.path, body) if server.post else (405, "{}")
+                data = reply.encode("utf-8")
+                server.bytes_sent += len(data)
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                try:
+                    self.wfile.write(data)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
@@ -0,0 +1,156 @@
+# Benchmark suite: parse throughput on the recorded HTML fixtures, then
+# clean_internships, clean_data table building and a bulk load into a local
+# SQLite sink on synthetic data at each --scales size. Results are written to
+# benchmarks/results/<commit>.json; pass --compare with an older results file
+# to see per-case changes.
+# run from airflow_pipeline/:  python -m benchmarks.run_suite --scales 10000 100000 1000000
+import argparse
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import pandas as pd
+
+from benchmarks.bench_parsers import load_fixture
+from benchmarks.synthetic import companies_for, raw_internships, raw_companies, raw_simplify
+from scripts.clean_jobs_data import clean_internships
+from scripts.html_parsers import (
+    PARSER_BACKEND,
+    parse_internship_rows,
+    parse_company_info,
+    parse_simplify_company_profile,
+)
+from scripts.scrape_clean_upload import clean_data
+from utils.handoff import write_table, read_table
+from utils.snowflake_utils import SQLiteSink, bulk_load
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+EXPORTS = [
+    "export_internships", "export_companies", "export_locations",
+    "export_internship_locations", "export_industries", "export_company_industries",
+]
+
+
+def best_of(fn, repeat):
+    # (result, fastest seconds) over `repeat` runs
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def git_commit():
+    try:
+        commit = subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+        dirty = subprocess.call(["git", "diff", "--quiet", "HEAD", "--", "."]) != 0
+        return commit + ("-dirty" if dirty else "")
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def parse_cases(repeat):
+    internships_html = load_fixture("levels_internships.html")
+    company_html = load_fixture("levels_company.html")
+    simplify_html = load_fixture("simplify_company.html")
+    url = "https://simplify.jobs/c/Stripe"
+    cases = [
+        ("parse_internship_rows", lambda: len(parse_internship_rows(internships_html))),
+        ("parse_company_info", lambda: (parse_company_info("stripe", company_html), 1)[1]),
+        ("parse_simplify_company_profile", lambda: (parse_simplify_company_profile("Stripe", "Stripe", url, simplify_html), 1)[1]),
+    ]
+    for name, fn in cases:
+        rows, secs = best_of(lambda: sum(fn() for _ in range(20)), repeat)
+        yield {"case": name, "scale": None, "rows": rows, "seconds": secs, "backend": PARSER_BACKEND}
+
+
+def scaled_cases(rows, repeat):
+    interns = raw_internships(rows)
+    companies = companies_for(rows)
+
+    _, secs = best_of(lambda: clean_internships(interns), repeat)
+    yield {"case": "clean_internships", "scale": rows, "rows": rows, "seconds": secs}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        write_table(interns, "internships_raw", tmp)
+        write_table(raw_companies(companies), "companies_raw", tmp)
+        write_table(raw_simplify(companies), "simplify_raw", tmp)
+        del interns
+
+        _, secs = best_of(lambda: clean_data(tmp), repeat)
+        yield {"case": "clean_data", "scale": rows, "rows": rows, "seconds": secs}
+
+        def load():
+            with tempfile.NamedTemporaryFile(suffix=".db", dir=tmp) as db:
+                sink = SQLiteSink(db.name)
+                try:
+                    results = bulk_load(
+                        [(lambda name=name: read_table(name, directory=tmp), name.upper()) for name in EXPORTS],
+                        sink,
+                    )
+                finally:
+                    sink.close()
+            return sum(r["rows"] for r in results)
+
+        loaded, secs = best_of(load, repeat)
+        yield {"case": "bulk_load_sqlite", "scale": rows, "rows": loaded, "seconds": secs}
+
+
+def compare(results, baseline_path):
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    before = {(r["case"], r["scale"]): r for r in baseline["results"]}
+    print(f"\nvs {baseline['commit']} ({os.path.basename(baseline_path)}):")
+    for r in results:
+        old = before.get((r["case"], r["scale"]))
+        if old:
+            change = r["seconds"] / old["seconds"] - 1
+            print(f"  {r['case']:32s} {str(r['scale'] or ''):>9s}  {old['seconds']:8.3f}s -> {r['seconds']:8.3f}s  {change:+7.1%}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scales", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="results file (default: benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", help="earlier results file to diff against")
+    args = parser.parse_args()
+
+    results = []
+    for result in parse_cases(args.repeat):
+        results.append(result)
+    for rows in args.scales:
+        for result in scaled_cases(rows, args.repeat):
+            results.append(result)
+
+    for r in results:
+        r["rows_per_s"] = r["rows"] / r["seconds"]
+        print(f"{r['case']:32s} {str(r['scale'] or ''):>9s}  {r['seconds']:8.3f}s  {r['rows_per_s']:12.0f} rows/s")
+
+    commit = git_commit()
+    report = {
+        "commit": commit,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "machine": platform.machine(),
+        "repeat": args.repeat,
+        "results": results,
+    }
+    output = args.output or os.path.join(RESULTS_DIR, f"{commit}.json")
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nwrote {output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
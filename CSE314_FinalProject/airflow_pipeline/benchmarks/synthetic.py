@@ -0,0 +1,88 @@
+# Synthetic raw tables shaped like what scrape_data hands to clean_data, at any
+# size. Every listing's company has a Levels.fyi and a Simplify profile whose
+# slugs normalize to the same key, so clean_data's merges and id mapping do
+# the same work they do on scraped data.
+import numpy as np
+import pandas as pd
+
+TITLES = np.array([
+    "Software Engineer Intern", "Data Science Intern", "Quant Trader Intern",
+    "Product Manager Intern", "Machine Learning Intern", "Hardware Engineer Intern",
+], dtype=object)
+PERKS = np.array([
+    "Undergrad\nFree Food\nHousing", "Masters\nRelocation", "PhD", "Gym\nCommuter Benefits", "", None,
+], dtype=object)
+STATES = np.array(["CA", "NY", "WA", "TX", "MA", "IL"], dtype=object)
+SEASONS = np.array(["Summer 2025", "Fall 2025", "Winter 2026"], dtype=object)
+
+
+def companies_for(rows):
+    return max(50, rows // 50)
+
+
+def _money(rng, low, high, rows, missing=0.1):
+    values = rng.uniform(low, high, rows).round(2).astype(str).astype(object)
+    values[rng.random(rows) < missing] = ""
+    return values
+
+
+def raw_internships(rows, companies=None, locations=2_000, seed=314):
+    """internships_raw: one row per listing."""
+    rng = np.random.default_rng(seed)
+    companies = companies or companies_for(rows)
+    company = rng.integers(0, companies, rows)
+    location = rng.integers(0, locations, rows)
+    names = np.array([f"Company {i}" for i in range(companies)], dtype=object)
+    places = np.array([
+        f"City {i}, {STATES[i % len(STATES)]}" + (", United States" if i % 3 else "")
+        + f" - {SEASONS[i % len(SEASONS)]}"
+        for i in range(locations)
+    ], dtype=object)
+    return pd.DataFrame({
+        "company_slug": np.array([f"company-{i}" for i in range(companies)], dtype=object)[company],
+        "company_name": names[company],
+        "title": TITLES[rng.integers(0, len(TITLES), rows)],
+        "location": places[location],
+        "hourly_rate": _money(rng, 20, 120, rows),
+        "monthly_pay": _money(rng, 3_000, 20_000, rows),
+        "perks": PERKS[rng.integers(0, len(PERKS), rows)],
+        "apply_link": [f"https://boards.greenhouse.io/c/jobs/{i}" for i in range(rows)],
+    })
+
+
+def raw_companies(companies, seed=314):
+    """companies_raw: one Levels.fyi profile per company."""
+    rng = np.random.default_rng(seed)
+    slugs = [f"company-{i}" for i in range(companies)]
+    return pd.DataFrame({
+        "company_slug": slugs,
+        "description": [f"Company {i} builds things." for i in range(companies)],
+        "website": [f"https://{slug}.com" for slug in slugs],
+        "twitter": [f"https://twitter.com/{slug}" for slug in slugs],
+        "linkedin": [f"https://linkedin.com/company/{slug}" for slug in slugs],
+        "year_founded": rng.integers(1950, 2024, companies).astype(str),
+        "num_employees": rng.integers(10, 200_000, companies).astype(str),
+        "headquarters": [f"City {i}, {STATES[i % len(STATES)]}" for i in range(companies)],
+    })
+
+
+def raw_simplify(companies, seed=314):
+    """simplify_raw: one Simplify profile per company."""
+    rng = np.random.default_rng(seed)
+    names = [f"Company {i}" for i in range(companies)]
+    text = lambda label: [f"{label} for {name}." for name in names]
+    return pd.DataFrame({
+        "company_name": names,
+        "company_simplify_slug": [name.replace(" ", "-") for name in names],
+        "simplify_url": [f"https://simplify.jobs/c/{name.replace(' ', '-')}" for name in names],
+        "simplify_take": text("Take"),
+        "believer_points": text("Believers"),
+        "critic_points": text("Critics"),
+        "what_makes_unique": text("Unique"),
+        "benefits": ["Health Insurance\n401k"] * companies,
+        "about_text": text("About"),
+        "simplify_rating": rng.uniform(1, 5, companies).round(1).astype(str),
+        "competitive_edge": ["A"] * companies,
+        "growth_potential": ["B+"] * companies,
+        "rating_differentiation": ["C"] * companies,
+    })
@@ -0,0 +1,3 @@
+# Lets tests import scripts.* / utils.* / benchmarks.* the way the DAG and
+# benchmarks do: pytest puts this directory on sys.path.
+# run from airflow_pipeline/:  python -m pytest -q
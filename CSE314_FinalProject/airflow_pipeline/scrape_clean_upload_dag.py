@@ -2,7 +2,27 @@ from airflow import DAG
 from airflow.operators.python import PythonOperator
 from datetime import datetime, timedelta
 
-from scripts.scrape_clean_upload import scrape_data, clean_data, upload_data
+from scripts.scrape_clean_upload import (
+    COMPANY_EXPORTS,
+    INTERNSHIP_EXPORTS,
+    scrape_listings,
+    fetch_profile_shard,
+    collect_profiles,
+    build_company_tables,
+    clean_listings,
+    build_internship_tables,
+    upload_table,
+)
+from utils.metrics import instrument_task
+
+# scrape_listings returns one kwargs dict per profile shard, and dynamic task
+# mapping turns each into its own fetch_profile_shard task instance, so the
+# profile fetches spread over as many workers as are free. Company tables
+# and listing cleaning don't depend on each other; every export table loads
+# in its own task. All tasks share the handoff directory (and the scrape
+# manifest in it), so on more than one machine PIPELINE_HANDOFF_DIR has to
+# point at shared storage.
+# Offline:  python scrape_clean_upload_dag.py  (runs everything via dag.test())
 
 default_args = {
     'owner': 'airflow',
@@ -21,21 +41,60 @@ dag = DAG(
 )
 
 scrape_task = PythonOperator(
-    task_id='scrape_data',
-    python_callable=scrape_data,
+    task_id='scrape_listings',
+    python_callable=instrument_task(scrape_listings, keep_result=True),
+    op_kwargs={'incremental': True, 'harvest': True},
+    dag=dag,
+)
+
+fetch_tasks = PythonOperator.partial(
+    task_id='fetch_profile_shard',
+    python_callable=instrument_task(fetch_profile_shard, label_kwargs=('source', 'shard')),
+    dag=dag,
+).expand(op_kwargs=scrape_task.output)
+
+collect_task = PythonOperator(
+    task_id='collect_profiles',
+    python_callable=instrument_task(collect_profiles),
+    op_kwargs={'incremental': True},
     dag=dag,
 )
 
-clean_task = PythonOperator(
-    task_id='clean_data',
-    python_callable=clean_data,
+companies_task = PythonOperator(
+    task_id='build_company_tables',
+    python_callable=instrument_task(build_company_tables),
     dag=dag,
 )
 
-upload_task = PythonOperator(
-    task_id='upload_data',
-    python_callable=upload_data,
+listings_task = PythonOperator(
+    task_id='clean_listings',
+    python_callable=instrument_task(clean_listings),
     dag=dag,
 )
 
-scrape_task >> clean_task >> upload_task
+internships_task = PythonOperator(
+    task_id='build_internship_tables',
+    python_callable=instrument_task(build_internship_tables),
+    dag=dag,
+)
+
+upload_companies = PythonOperator.partial(
+    task_id='upload_company_tables',
+    python_callable=instrument_task(upload_table, label_kwargs=('name',)),
+    dag=dag,
+).expand(op_kwargs=[{'name': name, 'upsert': True} for name in COMPANY_EXPORTS])
+
+upload_internships = PythonOperator.partial(
+    task_id='upload_internship_tables',
+    python_callable=instrument_task(upload_table, label_kwargs=('name',)),
+    dag=dag,
+).expand(op_kwargs=[{'name': name, 'upsert': True} for name in INTERNSHIP_EXPORTS])
+
+scrape_task >> fetch_tasks >> collect_task >> companies_task
+scrape_task >> listings_task
+[companies_task, listings_task] >> internships_task
+companies_task >> upload_companies
+internships_task >> upload_internships
+
+if __name__ == "__main__":
+    dag.test()
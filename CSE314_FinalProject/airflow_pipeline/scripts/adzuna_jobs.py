@@ -0,0 +1,264 @@
+import asyncio
+import csv
+import os
+import re
+import sqlite3
+import time
+
+import aiohttp
+
+from scripts.internships_store import STORE_DB, STORE_TABLE
+from utils.rate_limit import RateLimiter
+
+# Module version of the Adzuna collection in ScrapeJobs.ipynb. Pages for every
+# keyword are requested concurrently but spaced out by a shared rate budget;
+# as soon as a keyword returns an empty `results` page, its outstanding
+# requests for later pages are cancelled. Matching jobs are deduplicated on
+# their Adzuna id and written to the sinks page by page.
+#
+# scrape_adzuna_jobs checks the credentials before touching any output, and
+# the sinks write to a temporary CSV and a staging table that only replace
+# the previous raw CSV and `adzuna_jobs_raw` table once the harvest is done,
+# so a failed run leaves the last good harvest in place. The raw rows get
+# their own table: `internships` holds the cleaned rows clean_adzuna_jobs
+# writes.
+
+ADZUNA_SEARCH_URL = "https://api.adzuna.com/v1/api/jobs/us/search/{page}"
+ADZUNA_CSV = "internship_jobs_us.csv"
+ADZUNA_DB = STORE_DB
+ADZUNA_TABLE = STORE_TABLE          # cleaned rows (clean_adzuna_jobs)
+ADZUNA_RAW_TABLE = "adzuna_jobs_raw"  # harvested rows, as returned
+
+INTERN_KEYWORDS = ['intern', 'internship']
+FOCUS_KEYWORDS = ['full stack', 'full-stack', 'frontend', 'front-end', 'front end', 'backend', 'back end','back-end', 'SWE', 'developer', 'development', 'develop', 'software', 'product', 'engineering', 'software engineering', 'engineer', 'technology', 'data', 'data analyst', 'data science', 'data engineer', 'data engineering', 'IT', 'information technology', 'devops', 'cloud engineer', 'cloud', 'artificial intelligence', 'machine learning', 'ML', 'AI', 'AI/ML']
+LOCATION = "United States"
+RESULTS_PER_PAGE = 50
+MAX_PAGES = 100
+
+RATE_LIMIT = 1.0     # requests per second across all keywords (the notebook slept 1s per page)
+MAX_IN_FLIGHT = 4    # concurrent requests; hides latency without exceeding RATE_LIMIT
+
+ADZUNA_COLUMNS = ["Title", "Company", "Location", "Category", "Created", "Description", "URL"]
+
+
+def load_adzuna_credentials():
+    app_id, app_key = os.environ.get("ADZUNA_APP_ID"), os.environ.get("ADZUNA_APP_KEY")
+    if not app_id or not app_key:
+        raise ValueError("Missing Adzuna credentials; set ADZUNA_APP_ID and ADZUNA_APP_KEY")
+    return app_id, app_key
+
+
+def keyword_pattern(keywords):
+    # one regex scan per title instead of a Python loop per keyword; matches
+    # exactly when `any(kw in title for kw in keywords)` would
+    return re.compile("|".join(re.escape(kw) for kw in keywords))
+
+
+def job_id(job):
+    return str(job.get("id") or job.get("redirect_url"))
+
+
+def job_row(job):
+    return {
+        'Title': job.get('title', 'N/A'),
+        'Company': job.get('company', {}).get('display_name', 'N/A'),
+        'Location': job.get('location', {}).get('display_name', 'N/A'),
+        'Category': job.get('category', {}).get('label', 'N/A'),
+        'Created': job.get('created', 'N/A'),
+        'Description': job.get('description', 'N/A'),
+        'URL': job.get('redirect_url', 'N/A')
+    }
+
+
+class CsvJobSink:
+    """
+    Appends job rows to `path`.tmp with the notebook's columns, flushing
+    per page; commit() moves it over `path`. Closed without a commit, the
+    temporary file is removed and `path` is left as it was.
+    """
+
+    def __init__(self, path=ADZUNA_CSV):
+        self.path, self.tmp_path = path, path + ".tmp"
+        self.file = open(self.tmp_path, "w", newline="", encoding="utf-8")
+        self.writer = csv.DictWriter(self.file, fieldnames=ADZUNA_COLUMNS)
+        self.writer.writeheader()
+
+    def write(self, rows):
+        self.writer.writerows(rows)
+        self.file.flush()
+        return len(rows)
+
+    def commit(self):
+        self.file.close()
+        os.replace(self.tmp_path, self.path)
+
+    def close(self):
+        self.file.close()
+        if os.path.exists(self.tmp_path):
+            os.remove(self.tmp_path)
+
+
+class SQLiteJobSink:
+    """
+    Writes job rows into a staging table of internships.db; commit()
+    swaps it in for `table` (adzuna_jobs_raw) in one transaction. Closed
+    without a commit, the staging table is dropped and `table` is left as
+    it was.
+    """
+
+    def __init__(self, path=ADZUNA_DB, table=ADZUNA_RAW_TABLE):
+        self.conn = sqlite3.connect(path)
+        self.table, self.staging = table, f"{table}_staging"
+        columns = ", ".join(f'"{c}" TEXT' for c in ADZUNA_COLUMNS)
+        self.conn.execute(f'DROP TABLE IF EXISTS "{self.staging}"')
+        self.conn.execute(f'CREATE TABLE "{self.staging}" ({columns})')
+        self.insert = f'INSERT INTO "{self.staging}" VALUES ({", ".join("?" for _ in ADZUNA_COLUMNS)})'
+
+    def write(self, rows):
+        self.conn.executemany(self.insert, [[row[c] for c in ADZUNA_COLUMNS] for row in rows])
+        self.conn.commit()
+        return len(rows)
+
+    def commit(self):
+        self.conn.execute("BEGIN")
+        self.conn.execute(f'DROP TABLE IF EXISTS "{self.table}"')
+        self.conn.execute(f'ALTER TABLE "{self.staging}" RENAME TO "{self.table}"')
+        self.conn.commit()
+
+    def close(self):
+        self.conn.execute(f'DROP TABLE IF EXISTS "{self.staging}"')
+        self.conn.commit()
+        self.conn.close()
+
+
+async def _fetch_results(session, url, params, limiter, in_flight, stats):
+    # None on a failed request, so it isn't mistaken for the end of the results
+    async with in_flight:
+        await limiter.wait()
+        stats["requests"] += 1
+        try:
+            async with session.get(url, params=params) as resp:
+                resp.raise_for_status()
+                data = await resp.json(content_type=None)
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            stats["failed"] += 1
+            print(f"Adzuna request failed for {url} {params.get('what')}: {e}")
+            return None
+    return data.get("results") or []
+
+
+async def _harvest_keyword(session, keyword, base_params, url_template, max_pages,
+                           limiter, in_flight, stats, on_results):
+    params = {**base_params, "what": keyword}
+    pages = {
+        asyncio.create_task(_fetch_results(session, url_template.format(page=page), params, limiter, in_flight, stats)): page
+        for page in range(1, max_pages + 1)
+    }
+    end = max_pages + 1
+    pending = set(pages)
+    while pending:
+        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            page, results = pages[task], task.result()
+            if results is None or page >= end:
+                continue
+            if not results:
+                # every later page is empty too: drop the requests still queued for them
+                end = page
+                for other in list(pending):
+                    if pages[other] > page:
+                        other.cancel()
+                        pending.discard(other)
+                        stats["cancelled"] += 1
+                print(f"No more results for '{keyword}' after page {page - 1}.")
+                continue
+            stats["pages"] += 1
+            on_results(results)
+
+
+async def _harvest_adzuna_jobs(keywords, base_params, url_template, max_pages, rate_limit,
+                               max_in_flight, on_results, stats):
+    limiter = RateLimiter(rate_limit)
+    in_flight = asyncio.Semaphore(max_in_flight)
+    timeout = aiohttp.ClientTimeout(total=30)
+    async with aiohttp.ClientSession(timeout=timeout) as session:
+        await asyncio.gather(*[
+            _harvest_keyword(session, keyword, base_params, url_template, max_pages,
+                             limiter, in_flight, stats, on_results)
+            for keyword in keywords
+        ])
+
+
+def harvest_adzuna_jobs(sinks, intern_keywords=INTERN_KEYWORDS, focus_keywords=FOCUS_KEYWORDS,
+                        location=LOCATION, max_pages=MAX_PAGES, rate_limit=RATE_LIMIT,
+                        max_in_flight=MAX_IN_FLIGHT, url_template=ADZUNA_SEARCH_URL, credentials=None):
+    """
+    Searches Adzuna for every intern keyword and streams the jobs whose
+    title mentions both an intern and a focus keyword into each sink
+    (anything with write(rows)). Each job is kept once, keyed by its
+    Adzuna id. Returns request/page/job counts and the elapsed seconds.
+    """
+    app_id, app_key = credentials or load_adzuna_credentials()
+    base_params = {
+        'app_id': app_id,
+        'app_key': app_key,
+        'where': location,
+        'results_per_page': RESULTS_PER_PAGE,
+        'content-type': 'application/json'
+    }
+    has_intern, has_focus = keyword_pattern(intern_keywords), keyword_pattern(focus_keywords)
+    seen = set()
+    stats = {"requests": 0, "failed": 0, "cancelled": 0, "pages": 0, "jobs_seen": 0, "jobs_kept": 0}
+
+    def on_results(results):
+        rows = []
+        for job in results:
+            stats["jobs_seen"] += 1
+            key = job_id(job)
+            if key in seen:
+                continue
+            title = job.get('title', '').lower()
+            if has_intern.search(title) and has_focus.search(title):
+                seen.add(key)
+                rows.append(job_row(job))
+        if rows:
+            for sink in sinks:
+                sink.write(rows)
+            stats["jobs_kept"] += len(rows)
+
+    start = time.perf_counter()
+    asyncio.run(_harvest_adzuna_jobs(
+        intern_keywords, base_params, url_template, max_pages, rate_limit, max_in_flight, on_results, stats
+    ))
+    stats["seconds"] = time.perf_counter() - start
+    print(
+        f"Adzuna: kept {stats['jobs_kept']} of {stats['jobs_seen']} jobs from {stats['pages']} pages, "
+        f"{stats['requests']} requests ({stats['failed']} failed, {stats['cancelled']} cancelled) "
+        f"in {stats['seconds']:.2f}s"
+    )
+    return stats
+
+
+def scrape_adzuna_jobs(csv_path=ADZUNA_CSV, db_path=ADZUNA_DB, credentials=None, **kwargs):
+    """
+    Harvests Adzuna into the raw CSV and the adzuna_jobs_raw table of
+    internships.db. Missing credentials raise before either is opened;
+    both are only replaced once the harvest has finished and, if any
+    request failed, at least one page came back.
+    """
+    credentials = credentials or load_adzuna_credentials()
+    sinks = []
+    try:
+        sinks.append(CsvJobSink(csv_path))
+        sinks.append(SQLiteJobSink(db_path))
+        stats = harvest_adzuna_jobs(sinks, credentials=credentials, **kwargs)
+        if stats["failed"] and not stats["pages"]:
+            raise RuntimeError(
+                f"All {stats['failed']} Adzuna requests failed; {csv_path} and {db_path} were left as they were"
+            )
+        for sink in sinks:
+            sink.commit()
+        return stats
+    finally:
+        for sink in sinks:
+            sink.close()
@@ -0,0 +1,181 @@
+import itertools
+import os
+import re
+import sqlite3
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from scripts.adzuna_jobs import ADZUNA_COLUMNS, ADZUNA_CSV, ADZUNA_DB, ADZUNA_TABLE
+from scripts.internships_store import drop_search_index, ensure_search_index
+from utils.schemas import read_csv
+
+# Module version of the Adzuna cleaning cell in ScrapeJobs.ipynb. The notebook
+# read the whole CSV, built its duplicate key by concatenating Title, Company
+# and Location, ran two uncompiled re.sub per description through .apply,
+# wrote the cleaned CSV and read it back for to_sql.
+#
+# Here the CSV is read CLEAN_CHUNK_ROWS rows at a time and the chunks are
+# cleaned in a process pool (at most two per worker in flight, so memory
+# stays bounded). Inputs under PARALLEL_MIN_ROWS are cleaned in this process:
+# a single chunk has nothing to run alongside, and shipping it to a worker
+# and back only adds the pool start and the pickling. Each chunk comes back with a 64-bit hash of the
+# (Title, Company, Location) tuple per row, and the parent keeps the first
+# row per hash in file order, as drop_duplicates(keep="first") did, before
+# appending the chunk to the cleaned CSV and internships.db. Hashing the
+# tuple also avoids the concatenated key's false matches ("ab" + "c" vs
+# "a" + "bc").
+
+ADZUNA_CLEAN_CSV = "internship_jobs_us_cleaned.csv"
+CLEAN_CHUNK_ROWS = 50_000
+CLEAN_WORKERS = os.cpu_count() or 1
+PARALLEL_MIN_ROWS = 2 * CLEAN_CHUNK_ROWS
+KEY_COLUMNS = ["Title", "Company", "Location"]
+
+# `<[^<]+?>` as the notebook wrote it, minus the lazy repetition; same matches
+_TAGS = re.compile(r"<[^<][^<>]*>")
+
+
+def clean_description(desc):
+    """
+    The notebook's clean_description: drop tags, collapse whitespace runs to
+    one space, strip. str.split() splits on exactly what \\s matches and is
+    several times faster than re.sub(r"\\s+", " ", ...).
+    """
+    return " ".join(_TAGS.sub("", desc).split())
+
+
+def clean_descriptions(descriptions):
+    """clean_description over a column; missing descriptions stay missing."""
+    return descriptions.astype(object).map(clean_description, na_action="ignore")
+
+
+def dedup_keys(df):
+    """A uint64 hash of each row's (Title, Company, Location)."""
+    return pd.util.hash_pandas_object(df[KEY_COLUMNS], index=False).to_numpy()
+
+
+def clean_chunk(chunk):
+    """
+    Cleans one chunk of raw Adzuna rows: drops rows missing a key column and
+    duplicates within the chunk, parses Created and cleans descriptions.
+    Returns (chunk, keys) with keys from dedup_keys.
+    """
+    chunk = chunk.dropna(subset=KEY_COLUMNS)
+    keys = dedup_keys(chunk)
+    first = ~pd.Series(keys).duplicated().to_numpy()
+    chunk, keys = chunk[first], keys[first]
+
+    created = pd.to_datetime(chunk["Created"], errors="coerce", utc=True, format="ISO8601")
+    chunk = chunk.assign(
+        # written out the way to_csv writes the notebook's datetime column
+        Created=created.astype(str).where(created.notna(), None),
+        Description=clean_descriptions(chunk["Description"]),
+    )
+    return chunk, keys
+
+
+def _cleaned_chunks(chunks, workers, stats, min_rows=PARALLEL_MIN_ROWS):
+    # read ahead up to min_rows; an input that ends before then stays in this process
+    chunks, head, rows = iter(chunks), [], 0
+    for chunk in chunks:
+        head.append(chunk)
+        rows += len(chunk)
+        if rows >= min_rows:
+            break
+    else:
+        workers = 1
+    chunks = itertools.chain(head, chunks)
+    stats["workers"] = workers
+    if workers <= 1:
+        yield from map(clean_chunk, chunks)
+        return
+    with ProcessPoolExecutor(workers) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(clean_chunk, chunk))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+class CleanedJobsWriter:
+    """
+    Appends cleaned chunks to the cleaned CSV and to the `internships`
+    table of internships.db, replaced like the notebook's to_sql. The search
+    indexes are built once at the end instead of by trigger per row.
+    """
+
+    def __init__(self, csv_path=ADZUNA_CLEAN_CSV, db_path=ADZUNA_DB, table=ADZUNA_TABLE):
+        self.file = open(csv_path, "w", newline="", encoding="utf-8")
+        self.header = True
+        self.conn = sqlite3.connect(db_path)
+        self.table = table
+        drop_search_index(self.conn, table)
+        self.conn.execute(f'DROP TABLE IF EXISTS "{table}"')
+        columns = ", ".join(f'"{c}" TEXT' for c in ADZUNA_COLUMNS)
+        self.conn.execute(f'CREATE TABLE "{table}" ({columns})')
+        self.insert = f'INSERT INTO "{table}" VALUES ({", ".join("?" for _ in ADZUNA_COLUMNS)})'
+
+    def write(self, df):
+        df = df[ADZUNA_COLUMNS]
+        df.to_csv(self.file, header=self.header, index=False)
+        self.header = False
+        values = df.astype(object)
+        self.conn.executemany(self.insert, values.where(values.notna(), None).itertuples(index=False, name=None))
+        self.conn.commit()
+        return len(df)
+
+    def close(self):
+        ensure_search_index(self.conn, self.table)
+        self.conn.commit()
+        self.conn.close()
+        self.file.close()
+
+
+def _counted(chunks, stats):
+    for chunk in chunks:
+        stats["rows_read"] += len(chunk)
+        stats["missing_key"] += int(chunk[KEY_COLUMNS].isna().any(axis=1).sum())
+        yield chunk
+
+
+def clean_adzuna_jobs(csv_path=ADZUNA_CSV, clean_csv_path=ADZUNA_CLEAN_CSV, db_path=ADZUNA_DB,
+                      chunk_rows=CLEAN_CHUNK_ROWS, workers=CLEAN_WORKERS, parallel_min_rows=PARALLEL_MIN_ROWS):
+    """
+    Cleans the raw Adzuna CSV into the cleaned CSV and internships.db, a
+    chunk at a time, with `workers` processes once the input reaches
+    `parallel_min_rows` rows. Returns row counts, the workers used, the
+    elapsed seconds (total, and the part spent building the search indexes
+    at the end) and rows/s through cleaning and writing.
+    """
+    stats = {"rows_read": 0, "rows_written": 0, "duplicates": 0, "missing_key": 0}
+    seen = set()
+    start = time.perf_counter()
+    chunks = read_csv(csv_path, "adzuna_jobs", chunksize=chunk_rows)
+    writer = CleanedJobsWriter(clean_csv_path, db_path)
+    try:
+        for i, (chunk, keys) in enumerate(_cleaned_chunks(_counted(chunks, stats), workers, stats, parallel_min_rows)):
+            new = [key not in seen for key in keys.tolist()]
+            seen.update(keys.tolist())
+            stats["rows_written"] += writer.write(chunk[new])
+            if i % 20 == 19:
+                print(f"Cleaned {stats['rows_read']:,} rows, {stats['rows_read'] / (time.perf_counter() - start):,.0f} rows/s")
+        stats["clean_seconds"] = time.perf_counter() - start
+    finally:
+        writer.close()
+
+    stats["seconds"] = time.perf_counter() - start
+    stats["index_seconds"] = stats["seconds"] - stats["clean_seconds"]
+    stats["rows_per_second"] = stats["rows_read"] / stats["clean_seconds"] if stats["clean_seconds"] else 0.0
+    stats["duplicates"] = stats["rows_read"] - stats["missing_key"] - stats["rows_written"]
+    print(
+        f"Adzuna cleaning: {stats['rows_read']:,} rows read, {stats['rows_written']:,} written "
+        f"({stats['duplicates']:,} duplicates, {stats['missing_key']:,} missing title/company/location), "
+        f"{stats['rows_per_second']:,.0f} rows/s with {stats['workers']} worker(s); "
+        f"{stats['seconds']:.2f}s including {stats['index_seconds']:.2f}s building the search indexes"
+    )
+    return stats
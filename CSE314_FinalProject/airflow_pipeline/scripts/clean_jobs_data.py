@@ -2,6 +2,8 @@ import re
 import numpy as np
 import pandas as pd
 
+from scripts.parse_amounts import parse_amount, parse_headcount
+
 # ——————— helper at module scope ———————
 degree_pattern = re.compile(r'^(Undergrad|Masters|PhD)\b', flags=re.IGNORECASE)
 
@@ -39,18 +41,71 @@ def split_perks(cell):
         'perks_clean':        text
     })
 
+def split_perks_columns(perks):
+    """
+    Vectorized split_perks over a whole column. Returns a DataFrame with
+    degree_requirement / perks_clean, same values as .apply(split_perks).
+    """
+    if perks.empty:
+        # str.split(expand=True) has no columns to index on an empty column
+        return pd.DataFrame({'degree_requirement': pd.Series(dtype=object, index=perks.index),
+                             'perks_clean': pd.Series(dtype=object, index=perks.index)})
+    text = perks.astype(str).str.strip().str.strip('"')
+
+    # only the first real or literal "\n" matters
+    parts = text.str.split(r'(?:\\n|\n)', n=1, expand=True, regex=True)
+    head = parts[0]
+    tail = parts[1] if 1 in parts.columns else pd.Series(np.nan, index=text.index, dtype=object)
+    has_tail = tail.notna()
+    is_degree = head.str.match(degree_pattern).fillna(False).astype(bool)
+
+    degree = pd.Series(np.nan, index=text.index, dtype=object)
+    degree[is_degree] = head[is_degree].str.strip()
+
+    perks_clean = text.copy()
+    perks_clean[is_degree & has_tail] = tail[is_degree & has_tail].str.strip()
+    perks_clean[is_degree & ~has_tail] = ''
+
+    missing = perks.isna()
+    degree[missing] = np.nan
+    perks_clean[missing] = np.nan
+
+    return pd.DataFrame({'degree_requirement': degree, 'perks_clean': perks_clean})
+
+def per_category(column, fn):
+    """
+    fn(Series) -> Series or DataFrame. A Categorical column (see
+    utils.schemas) is passed to fn once per distinct value and the result
+    is broadcast back through its codes, still categorical; any other
+    column goes to fn as is.
+    """
+    if not isinstance(column.dtype, pd.CategoricalDtype):
+        return fn(column)
+    codes = column.cat.codes.to_numpy()
+    result = fn(pd.Series(column.cat.categories, dtype=object))
+
+    def broadcast(values):
+        value_codes, uniques = pd.factorize(values)
+        # code -1 is a missing value in the column and stays missing
+        row_codes = np.where(codes >= 0, value_codes[codes], -1) if len(values) else codes
+        return pd.Series(pd.Categorical.from_codes(row_codes, categories=uniques), index=column.index)
+
+    if isinstance(result, pd.DataFrame):
+        return pd.DataFrame({c: broadcast(result[c]) for c in result.columns}, index=column.index)
+    return broadcast(result)
+
 def clean_internships(df_interns_raw):
     df = df_interns_raw.copy()
 
     # casting to nums
-    df['hourly_rate'] = pd.to_numeric(df['hourly_rate'], errors='coerce')
-    df['monthly_pay'] = pd.to_numeric(df['monthly_pay'], errors='coerce')
+    df['hourly_rate'] = parse_amount(df['hourly_rate'])
+    df['monthly_pay'] = parse_amount(df['monthly_pay'])
 
     # slug & name cleanup
-    df['company_slug'] = df['company_slug'].str.lower().str.strip()
-    df['company_name'] = df['company_name'].str.strip()
+    df['company_slug'] = per_category(df['company_slug'], lambda s: s.str.lower().str.strip())
+    df['company_name'] = per_category(df['company_name'], lambda s: s.str.strip())
 
-    df[['degree_requirement','perks_clean']] = df['perks'].apply(split_perks)
+    df[['degree_requirement','perks_clean']] = per_category(df['perks'], split_perks_columns)
 
     return df
 
@@ -59,7 +114,7 @@ def clean_companies(df_companies_raw):
     df = df_companies_raw.copy()
 
     df['year_founded']  = pd.to_numeric(df['year_founded'],  errors='coerce')
-    df['num_employees'] = pd.to_numeric(df['num_employees'], errors='coerce')
+    df['num_employees'] = parse_headcount(df['num_employees'])
     df['company_slug']  = df['company_slug'].str.lower().str.strip()
 
     return df
@@ -74,33 +129,110 @@ def clean_simplify_profiles(df_simplify_raw):
 
 # building extra tables to fulfill 3NF
 
-def build_locations_table(df_interns):
-    locs = set(zip(df_interns['city'], df_interns['state'], df_interns['country']))
-    return pd.DataFrame(locs, columns=['city', 'state', 'country'])
+# what makes a listing the same listing from one run to the next; the
+# internships upsert merges on the same columns
+INTERNSHIP_KEY = ['title', 'location', 'apply_link']
+
+def stable_ids(df, columns):
+    """
+    One id per row derived from its natural key, the values in `columns`:
+    the same company, listing, location or industry gets the same id on
+    every run, whatever else was scraped with it, so rows merged into an
+    existing table (see utils.snowflake_utils.upsert_dataframe) keep
+    pointing at each other. 63-bit hashes, so they fit a signed int64.
+    """
+    key = df[columns].astype({c: object for c in columns if not isinstance(df[c].dtype, pd.CategoricalDtype)})
+    hashed = pd.util.hash_pandas_object(key, index=False).to_numpy()
+    return (hashed >> np.uint64(1)).astype(np.int64)
+
+
+def parse_location(loc):
+    """
+    "City, State, Country - Season" -> (city, state, country); missing
+    parts come back as "".
+    """
+    loc_clean = loc.split(" - ")[0].strip()
+    parts = [x.strip() for x in re.split(r",|\n", loc_clean)]
+    if len(parts) == 3:
+        city, state, country = parts
+    elif len(parts) == 2:
+        city, state = parts
+        country = ""
+    else:
+        city = parts[0]
+        state = country = ""
+    return city, state, country
+
+
+def build_location_tables(df_interns, location_ids=None):
+    """
+    Builds the locations dimension and the internship -> location bridge
+    from the raw `location` strings. Each distinct string is parsed once and
+    location ids are broadcast back to rows through a lookup array, so the
+    cost scales with distinct locations rather than listings.
+
+    Pass the same `location_ids` dict across calls to build the tables a
+    chunk at a time: the returned locations_table only holds locations not
+    seen in earlier chunks.
+    """
+    codes, uniques = pd.factorize(df_interns['location'])
+
+    location_ids = {} if location_ids is None else location_ids
+    parsed = [parse_location(loc) if isinstance(loc, str) else None for loc in uniques]
+    new = list(dict.fromkeys(p for p in parsed if p is not None and p not in location_ids))
+
+    locations_table = pd.DataFrame(new, columns=['city', 'state', 'country'])
+    locations_table['location_id'] = stable_ids(locations_table, ['city', 'state', 'country'])
+    location_ids.update(zip(new, locations_table['location_id'].tolist()))
+
+    # last slot: code -1 (NaN)
+    unique_location_id = np.array([location_ids[p] if p is not None else 0 for p in parsed] + [0], dtype=np.int64)
+    row_location_id = unique_location_id[codes]
+    has_location = row_location_id != 0
+    internship_locations_table = pd.DataFrame({
+        'internship_id': df_interns['internship_id'].to_numpy()[has_location],
+        'location_id':   row_location_id[has_location],
+    })
+    internship_locations_table['is_remote'] = False
+
+    return locations_table, internship_locations_table
+
+
+def explode_delimited(df, key_col, list_col, sep=',', drop_empty=False):
+    """
+    One row per (key, value) for a column holding `sep`-delimited values,
+    e.g. industries "Fintech, Payments" or newline-separated benefits.
+    """
+    pairs = df[[key_col, list_col]].dropna(subset=[list_col])
+    pairs = pairs.assign(**{list_col: pairs[list_col].astype(str).str.split(sep, regex=False)})
+    pairs = pairs.explode(list_col, ignore_index=True)
+    pairs[list_col] = pairs[list_col].str.strip()
+    if drop_empty:
+        pairs = pairs[pairs[list_col] != ''].reset_index(drop=True)
+    return pairs
+
+
+def build_bridge_tables(df, key_col, list_col, id_col, sep=',', drop_empty=False):
+    """
+    Many-to-many helper. Returns (dimension_table, bridge_table):
+    dimension_table has `name` and `id_col` (stable_ids of the name), in
+    sorted name order; bridge_table maps each `key_col` value to `id_col`.
+    """
+    pairs = explode_delimited(df, key_col, list_col, sep=sep, drop_empty=drop_empty)
+    codes, names = pd.factorize(pairs[list_col], sort=True)
 
+    dimension_table = pd.DataFrame({'name': names})
+    dimension_table[id_col] = stable_ids(dimension_table, ['name'])
 
-def build_internship_locations_table(df_interns):
-    rows = [
-        (row.internship_id, row.city, row.state, row.country)
-        for _, row in df_interns.iterrows()
-    ]
-    return pd.DataFrame(rows, columns=['internship_id', 'city', 'state', 'country'])
+    bridge_table = pd.DataFrame({key_col: pairs[key_col], id_col: dimension_table[id_col].to_numpy()[codes]})
+    return dimension_table, bridge_table
 
 
 def build_industries_table(df_interns):
-    industry_set = set()
-    for inds in df_interns['industries'].dropna():
-        for ind in inds.split(','):
-            industry_set.add(ind.strip())
-    return pd.DataFrame({'name': sorted(industry_set)})
+    industries_table, _ = build_bridge_tables(df_interns, 'normalized_slug', 'industries', 'industry_id')
+    return industries_table[['name']]
 
 
 def build_company_industries_table(df_interns):
-    pairs = []
-    for _, row in df_interns.iterrows():
-        if pd.notna(row['industries']):
-            for ind in row['industries'].split(','):
-                ind = ind.strip()
-                if ind:
-                    pairs.append((row['normalized_slug'], ind))
-    return pd.DataFrame(pairs, columns=['normalized_slug', 'industry_name'])
+    pairs = explode_delimited(df_interns, 'normalized_slug', 'industries', drop_empty=True)
+    return pairs.rename(columns={'industries': 'industry_name'})
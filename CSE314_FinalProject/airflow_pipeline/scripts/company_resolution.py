@@ -0,0 +1,163 @@
+import math
+import os
+import re
+from collections import defaultdict
+
+import pandas as pd
+
+from utils.handoff import HANDOFF_DIR
+from utils.schemas import read_csv
+
+# Company entity resolution ahead of the Levels.fyi / Simplify merge.
+# normalize_slug only lines up slugs that are equal once punctuation is gone,
+# so "stripe" and "Stripe-Inc" or "doordash" and "Door Dash, Inc." end up as
+# separate companies. CompanyResolver maps every normalized slug to a
+# canonical one:
+#
+#   1. the slug (or display name) is reduced to a key: lowercase words with
+#      legal suffixes (inc, llc, ltd, corp, ...) dropped, spaces removed.
+#      Generic words like "group" or "technologies" stay in the key, since
+#      "Apex Group" and "Apex Technologies" are different companies; a
+#      variant that only differs by one still has to clear the threshold;
+#   2. equal keys are the same company;
+#   3. otherwise the key's rarest character trigrams are looked up in an
+#      inverted index of known companies, and only companies listed there
+#      are scored (Dice coefficient on trigrams) — near-linear rather than
+#      all-pairs, with the same result;
+#   4. the best candidate at or above the threshold becomes the alias
+#      target, else the slug starts a new company.
+#
+# Decisions are kept in an alias table (CSV, so a wrong match can be fixed
+# by hand) and reloaded next run: known slugs resolve without scoring, and a
+# corrected row wins over anything the matcher would decide.
+
+ALIASES_FILE = "company_aliases.csv"
+ALIASES_PATH = os.path.join(HANDOFF_DIR, ALIASES_FILE)
+ALIAS_COLUMNS = ["alias", "canonical", "key", "score"]
+MATCH_THRESHOLD = 0.85
+NGRAM = 3
+
+LEGAL_SUFFIXES = {
+    "inc", "incorporated", "llc", "llp", "ltd", "limited", "corp", "corporation",
+    "plc", "gmbh", "ag", "sa",
+}
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def normalize_slug(slug):
+    if pd.isna(slug):
+        return ""
+    return re.sub(r"[^a-z0-9]", "", slug.lower())
+
+
+def company_key(name):
+    """"Stripe, Inc." -> "stripe"; falls back to all words if only suffixes are left."""
+    words = _WORD.findall(str(name).lower())
+    core = [w for w in words if w not in LEGAL_SUFFIXES]
+    return "".join(core or words)
+
+
+def key_ngrams(key, n=NGRAM):
+    padded = f" {key} "
+    return {padded[i:i + n] for i in range(len(padded) - n + 1)}
+
+
+class CompanyResolver:
+    def __init__(self, threshold=MATCH_THRESHOLD):
+        self.threshold = threshold
+        self.aliases = {}                # normalized slug -> (canonical slug, key, score)
+        self.by_key = {}                 # key -> canonical slug
+        self.grams = {}                  # canonical slug -> trigram set of its key
+        self.postings = defaultdict(list)  # trigram -> canonical slugs
+
+    def _add_company(self, canonical, key):
+        self.by_key.setdefault(key, canonical)
+        if canonical in self.grams:
+            return
+        grams = key_ngrams(key)
+        self.grams[canonical] = grams
+        for gram in grams:
+            self.postings[gram].append(canonical)
+
+    def _best_match(self, key):
+        # Dice(A, B) >= t needs |A & B| >= t|A| / (2 - t), so any match shares
+        # at least one of A's (|A| - that + 1) rarest trigrams: only companies
+        # listed under those are candidates, and every candidate is scored in
+        # full, which finds exactly what scoring all companies would.
+        grams = key_ngrams(key)
+        min_shared = math.ceil(self.threshold * len(grams) / (2 - self.threshold) - 1e-9)
+        rarest = sorted(grams, key=lambda g: len(self.postings.get(g, ())))[:len(grams) - min_shared + 1]
+        candidates = set()
+        for gram in rarest:
+            candidates.update(self.postings.get(gram, ()))
+
+        # ties go to the alphabetically first company, so the result doesn't
+        # depend on the order candidates were found in
+        best, best_score = None, self.threshold
+        for canonical in candidates:
+            other = self.grams[canonical]
+            score = 2 * len(grams & other) / (len(grams) + len(other))
+            if score > best_score or (score == best_score and (best is None or canonical < best)):
+                best, best_score = canonical, score
+        return best, best_score
+
+    def resolve(self, slug, name=None):
+        """Canonical normalized slug for `slug`; `name`, if given, is what gets matched."""
+        alias = normalize_slug(slug)
+        if not alias:
+            return ""
+        known = self.aliases.get(alias)
+        if known is not None:
+            return known[0]
+
+        key = company_key(name if isinstance(name, str) and name.strip() else slug) or alias
+        canonical, score = self.by_key.get(key), 1.0
+        if canonical is None:
+            canonical, score = self._best_match(key)
+        if canonical is None:
+            canonical, score = alias, 1.0
+        self._add_company(canonical, key)
+        self.aliases[alias] = (canonical, key, round(score, 4))
+        return canonical
+
+    def resolve_column(self, slugs, names=None):
+        """resolve() over a column, once per distinct (slug, name)."""
+        names = pd.Series("", index=slugs.index, dtype=object) if names is None else names
+        # missing values become "" so every pair is a usable dict key
+        pairs = pd.DataFrame({"slug": slugs, "name": names}).astype(object).fillna("")
+        distinct = pairs.drop_duplicates()
+        resolved = {
+            (slug, name): self.resolve(slug, name)
+            for slug, name in zip(distinct["slug"], distinct["name"])
+        }
+        return pd.Series(
+            [resolved[pair] for pair in zip(pairs["slug"], pairs["name"])],
+            index=slugs.index, dtype=object,
+        )
+
+    def merged(self):
+        """Aliases that resolve to a different company than themselves."""
+        return {alias: canonical for alias, (canonical, _, _) in self.aliases.items() if alias != canonical}
+
+    def alias_table(self):
+        return pd.DataFrame(
+            [(alias, canonical, key, score) for alias, (canonical, key, score) in self.aliases.items()],
+            columns=ALIAS_COLUMNS,
+        )
+
+    def save(self, path=ALIASES_PATH):
+        tmp = f"{path}.tmp"
+        self.alias_table().to_csv(tmp, index=False)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path=ALIASES_PATH, threshold=MATCH_THRESHOLD):
+        resolver = cls(threshold)
+        if not os.path.exists(path):
+            return resolver
+        table = read_csv(path, "company_aliases", ALIAS_COLUMNS, keep_default_na=False)
+        for alias, canonical, key, score in table.itertuples(index=False):
+            resolver.aliases[alias] = (canonical, key, float(score))
+            resolver._add_company(canonical, key)
+        return resolver
@@ -0,0 +1,306 @@
+import re
+from bs4 import BeautifulSoup
+
+from utils.metrics import timer
+
+try:
+    import lxml.html
+    from lxml import etree
+    from lxml.cssselect import CSSSelector
+except ImportError:
+    lxml = None
+
+# "lxml" compiles every selector once at import and parses with libxml2;
+# "bs4" is the original BeautifulSoup/html.parser code, kept as the fallback
+PARSER_BACKEND = "lxml" if lxml is not None else "bs4"
+
+SECTION_HEADERS = ["h2", "h3", "h4", "h5"]
+SECTION_CONTENT = ["p", "li", "div"]
+
+
+def _backend(backend):
+    backend = backend or PARSER_BACKEND
+    if backend == "lxml" and lxml is None:
+        raise ImportError("lxml backend requested but lxml/cssselect is not installed")
+    return backend
+
+
+def parse_internship_rows(html, backend=None):
+    """
+    Parses the rendered Levels.fyi internships table into one dict per
+    `tr[data-index]` row (everything scrape_internships needs except the slug).
+    """
+    backend = _backend(backend)
+    with timer("parse_seconds", page="internships", backend=backend):
+        if backend == "lxml":
+            return _lxml_internship_rows(html)
+        return _bs4_internship_rows(html)
+
+
+def parse_company_info(slug, html, backend=None):
+    backend = _backend(backend)
+    with timer("parse_seconds", page="levels_company", backend=backend):
+        if backend == "lxml":
+            return _lxml_company_info(slug, html)
+        return _bs4_company_info(slug, html)
+
+
+def parse_simplify_company_profile(name, slug, url, html, backend=None):
+    backend = _backend(backend)
+    with timer("parse_seconds", page="simplify_company", backend=backend):
+        if backend == "lxml":
+            return _lxml_simplify_company_profile(name, slug, url, html)
+        return _bs4_simplify_company_profile(name, slug, url, html)
+
+
+def _internship_record(company_name, location_season, title, hourly, monthly, perks, apply_link):
+    return {
+        "company_name": company_name,
+        "title": title,
+        "location": location_season,
+        "hourly_rate": hourly,
+        "monthly_pay": monthly,
+        "perks": perks,
+        "apply_link": apply_link
+    }
+
+
+def _company_record(slug, description, links, year_founded, num_employees, address):
+    website = links[0] if links else ""
+    twitter, linkedin = "", ""
+    for href in links[1:]:
+        if "twitter.com" in href:
+            twitter = href
+        elif "linkedin.com" in href:
+            linkedin = href
+
+    return {
+        "company_slug": slug,
+        "description": description,
+        "website": website,
+        "twitter": twitter,
+        "linkedin": linkedin,
+        "year_founded": year_founded,
+        "num_employees": num_employees,
+        "headquarters": address
+    }
+
+
+def _address_from_iframe_src(src):
+    if "q=" in src:
+        match = re.search(r"q=([^&]+)", src)
+        if match:
+            return match.group(1).replace("%20", " ").replace(",", ", ")
+    return ""
+
+
+def _simplify_record(name, slug, url, section_text, rating):
+    return {
+        "company_name": name,
+        "company_simplify_slug": slug,
+        "simplify_url": url,
+        "simplify_take": section_text("Simplify's Take"),
+        "believer_points": section_text("What believers are saying"),
+        "critic_points": section_text("What critics are saying"),
+        "what_makes_unique": section_text("What makes"),
+        "benefits": section_text("Benefits"),
+        "about_text": section_text("About"),
+        "simplify_rating": rating("Simplify's Rating"),
+        "competitive_edge": rating("Competitive Edge"),
+        "growth_potential": rating("Growth Potential"),
+        "rating_differentiation": rating("Rating Differentiation")
+    }
+
+# ——————— BeautifulSoup backend ———————
+
+def _bs4_text(el):
+    return el.get_text(strip=True) if el else ""
+
+
+def _bs4_internship_rows(html):
+    soup = BeautifulSoup(html, "html.parser")
+    internships = []
+
+    for row in soup.find_all("tr", attrs={"data-index": True}):
+        try:
+            perk_tags = row.select(".tags-th p.cashInText")
+            apply_link_tag = row.select_one("a[href]")
+            internships.append(_internship_record(
+                _bs4_text(row.select_one(".company-info-cell h6")),
+                _bs4_text(row.select_one(".company-info-cell p")),
+                _bs4_text(row.select_one("span.badge")),
+                _bs4_text(row.select_one(".hourly-salary-td h6 span.cashInText")),
+                _bs4_text(row.select_one(".hourly-salary-td p.text-muted span.cashInText")),
+                "\n".join(p.get_text(strip=True) for p in perk_tags),
+                apply_link_tag["href"] if apply_link_tag else "",
+            ))
+        except Exception as e:
+            print(f"Error parsing internship row: {e}")
+            continue
+
+    return internships
+
+
+def _bs4_company_info(slug, html):
+    soup = BeautifulSoup(html, "html.parser")
+
+    def extract_caption_value(label):
+        span = soup.find("span", string=label)
+        if span:
+            h6 = span.find_previous_sibling("h6")
+            return h6.get_text(strip=True) if h6 else ""
+        return ""
+
+    iframe = soup.find("iframe", {"title": "Company Address"})
+    return _company_record(
+        slug,
+        _bs4_text(soup.select_one(".company-page_companyDescription__JVjrt > p")),
+        [a["href"] for a in soup.select("h6.MuiTypography-subtitle1 a[href]")],
+        extract_caption_value("Year Founded"),
+        extract_caption_value("# of Employees"),
+        _address_from_iframe_src(iframe.get("src", "")) if iframe else "",
+    )
+
+
+def _bs4_simplify_company_profile(name, slug, url, html):
+    soup = BeautifulSoup(html, "html.parser")
+
+    def extract_section_text(header_text):
+        header = soup.find(lambda tag: tag.name in SECTION_HEADERS and header_text.lower() in tag.text.lower())
+        content = []
+        if header:
+            for sibling in header.find_next_siblings():
+                if sibling.name in SECTION_HEADERS:
+                    break
+                if sibling.name in SECTION_CONTENT:
+                    content.append(sibling.get_text(strip=True))
+        return "\n".join(content)
+
+    def extract_rating(label):
+        span = soup.find("span", string=re.compile(label, re.I))
+        if span and span.find_previous("h5"):
+            return span.find_previous("h5").get_text(strip=True)
+        return ""
+
+    return _simplify_record(name, slug, url, extract_section_text, extract_rating)
+
+# ——————— lxml backend ———————
+# Text helpers reproduce BeautifulSoup semantics so both backends emit the
+# same records: get_text() skips comments and script/style/template bodies,
+# and `.string` only exists when an element holds a single text node.
+
+if lxml is not None:
+    _TEXT = etree.XPath("descendant::text()[not(ancestor::script or ancestor::style or ancestor::template)]")
+    _PREVIOUS_H5 = etree.XPath("(ancestor::h5 | preceding::h5)[last()]")
+    _SPANS = etree.XPath("//span")
+    _HEADERS = etree.XPath("//*[self::h2 or self::h3 or self::h4 or self::h5]")
+    _ROWS = CSSSelector("tr[data-index]")
+    _ROW_FIELDS = [
+        CSSSelector(".company-info-cell h6"),
+        CSSSelector(".company-info-cell p"),
+        CSSSelector("span.badge"),
+        CSSSelector(".hourly-salary-td h6 span.cashInText"),
+        CSSSelector(".hourly-salary-td p.text-muted span.cashInText"),
+    ]
+    _ROW_PERKS = CSSSelector(".tags-th p.cashInText")
+    _ROW_LINK = CSSSelector("a[href]")
+    _DESCRIPTION = CSSSelector(".company-page_companyDescription__JVjrt > p")
+    _COMPANY_LINKS = CSSSelector("h6.MuiTypography-subtitle1 a[href]")
+    _ADDRESS_IFRAME = etree.XPath("//iframe[@title='Company Address']")
+
+
+def _lxml_doc(html):
+    if not html or not html.strip():
+        html = "<html></html>"
+    return lxml.html.document_fromstring(html)
+
+
+def _lxml_text(el):
+    return "".join(s.strip() for s in _TEXT(el))
+
+
+def _lxml_first_text(selector, el):
+    found = selector(el)
+    return _lxml_text(found[0]) if found else ""
+
+
+def _lxml_string(el):
+    children = list(el)
+    if not children:
+        return el.text
+    if len(children) == 1 and not el.text and not children[0].tail and isinstance(children[0].tag, str):
+        return _lxml_string(children[0])
+    return None
+
+
+def _lxml_internship_rows(html):
+    doc = _lxml_doc(html)
+    internships = []
+
+    for row in _ROWS(doc):
+        try:
+            # each compiled selector runs exactly once per row
+            fields = [_lxml_first_text(selector, row) for selector in _ROW_FIELDS]
+            links = _ROW_LINK(row)
+            internships.append(_internship_record(
+                *fields,
+                "\n".join(_lxml_text(p) for p in _ROW_PERKS(row)),
+                links[0].get("href") if links else "",
+            ))
+        except Exception as e:
+            print(f"Error parsing internship row: {e}")
+            continue
+
+    return internships
+
+
+def _lxml_company_info(slug, html):
+    doc = _lxml_doc(html)
+
+    captions = {}
+    for span in _SPANS(doc):
+        label = _lxml_string(span)
+        if label in ("Year Founded", "# of Employees") and label not in captions:
+            h6 = next(span.itersiblings("h6", preceding=True), None)
+            captions[label] = _lxml_text(h6) if h6 is not None else ""
+
+    iframes = _ADDRESS_IFRAME(doc)
+    return _company_record(
+        slug,
+        _lxml_first_text(_DESCRIPTION, doc),
+        [a.get("href") for a in _COMPANY_LINKS(doc)],
+        captions.get("Year Founded", ""),
+        captions.get("# of Employees", ""),
+        _address_from_iframe_src(iframes[0].get("src", "")) if iframes else "",
+    )
+
+
+def _lxml_simplify_company_profile(name, slug, url, html):
+    doc = _lxml_doc(html)
+    headers = [(h, "".join(_TEXT(h)).lower()) for h in _HEADERS(doc)]
+    spans = [(span, _lxml_string(span)) for span in _SPANS(doc)]
+
+    def extract_section_text(header_text):
+        needle = header_text.lower()
+        header = next((h for h, text in headers if needle in text), None)
+        content = []
+        if header is not None:
+            for sibling in header.itersiblings():
+                if not isinstance(sibling.tag, str):
+                    continue
+                if sibling.tag in SECTION_HEADERS:
+                    break
+                if sibling.tag in SECTION_CONTENT:
+                    content.append(_lxml_text(sibling))
+        return "\n".join(content)
+
+    def extract_rating(label):
+        pattern = re.compile(label, re.I)
+        span = next((s for s, string in spans if string is not None and pattern.search(string)), None)
+        if span is not None:
+            h5 = _PREVIOUS_H5(span)
+            if h5:
+                return _lxml_text(h5[0])
+        return ""
+
+    return _simplify_record(name, slug, url, extract_section_text, extract_rating)
@@ -0,0 +1,140 @@
+import sqlite3
+import time
+
+import pandas as pd
+
+# Search indexes for the Adzuna `internships` table in internships.db.
+#
+# Title and Description go into an FTS5 table with the trigram tokenizer,
+# which matches case-insensitive substrings: the same rows as
+# LOWER(col) LIKE '%term%' for any term of 3+ characters, but looked up in an
+# index instead of lowercasing every row. The FTS table uses the internships
+# table as external content and triggers keep it in sync on every insert,
+# update and delete. Created, Company and Location get B-tree indexes for the
+# recency and top-N queries.
+#
+# The FTS rows are keyed on the internships table's implicit rowid, which
+# VACUUM may renumber; call ensure_search_index(conn, rebuild=True) after one.
+
+STORE_DB = "internships.db"
+STORE_TABLE = "internships"
+FTS_COLUMNS = ["Title", "Description"]
+INDEXED_COLUMNS = ["Created", "Company", "Location"]
+MIN_TRIGRAM = 3  # shorter terms can't use a trigram index and fall back to LIKE
+
+
+def _fts(table):
+    return f"{table}_fts"
+
+
+def drop_search_index(conn, table=STORE_TABLE):
+    for suffix in ("ai", "ad", "au"):
+        conn.execute(f'DROP TRIGGER IF EXISTS "{table}_{suffix}"')
+    conn.execute(f'DROP TABLE IF EXISTS "{_fts(table)}"')
+
+
+def ensure_search_index(conn, table=STORE_TABLE, rebuild=False):
+    """
+    Creates the FTS table, its sync triggers and the B-tree indexes on
+    `table` if they don't exist yet, filling the FTS table from the rows
+    already there. Safe to call on every load.
+    """
+    fts = _fts(table)
+    exists = conn.execute("SELECT 1 FROM sqlite_master WHERE name = ?", (fts,)).fetchone()
+    cols = ", ".join(f'"{c}"' for c in FTS_COLUMNS)
+    new_cols = ", ".join(f'new."{c}"' for c in FTS_COLUMNS)
+    old_cols = ", ".join(f'old."{c}"' for c in FTS_COLUMNS)
+
+    conn.execute(
+        f'CREATE VIRTUAL TABLE IF NOT EXISTS "{fts}" USING fts5('
+        f"{cols}, content='{table}', tokenize='trigram')"
+    )
+    conn.execute(
+        f'CREATE TRIGGER IF NOT EXISTS "{table}_ai" AFTER INSERT ON "{table}" BEGIN '
+        f'INSERT INTO "{fts}"(rowid, {cols}) VALUES (new.rowid, {new_cols}); END'
+    )
+    conn.execute(
+        f'CREATE TRIGGER IF NOT EXISTS "{table}_ad" AFTER DELETE ON "{table}" BEGIN '
+        f'INSERT INTO "{fts}"("{fts}", rowid, {cols}) VALUES (\'delete\', old.rowid, {old_cols}); END'
+    )
+    conn.execute(
+        f'CREATE TRIGGER IF NOT EXISTS "{table}_au" AFTER UPDATE ON "{table}" BEGIN '
+        f'INSERT INTO "{fts}"("{fts}", rowid, {cols}) VALUES (\'delete\', old.rowid, {old_cols}); '
+        f'INSERT INTO "{fts}"(rowid, {cols}) VALUES (new.rowid, {new_cols}); END'
+    )
+    for column in INDEXED_COLUMNS:
+        conn.execute(f'CREATE INDEX IF NOT EXISTS "{table}_{column.lower()}" ON "{table}" ("{column}")')
+
+    if rebuild or not exists:
+        conn.execute(f"INSERT INTO \"{fts}\"(\"{fts}\") VALUES ('rebuild')")
+    conn.commit()
+
+
+def load_internships(df, path=STORE_DB, table=STORE_TABLE):
+    """
+    Replaces `table` with `df` (what the notebook did with
+    to_sql(if_exists='replace')) and builds the search indexes once over
+    the loaded rows rather than row by row through the triggers.
+    """
+    conn = sqlite3.connect(path)
+    try:
+        start = time.perf_counter()
+        drop_search_index(conn, table)
+        df.to_sql(table, conn, if_exists="replace", index=False)
+        ensure_search_index(conn, table, rebuild=True)
+        print(f"Loaded {len(df)} rows into {path}:{table} with search indexes in {time.perf_counter() - start:.2f}s")
+    finally:
+        conn.close()
+
+
+def _phrase(term):
+    return '"' + term.replace('"', '""') + '"'
+
+
+def search(conn, terms, fields=FTS_COLUMNS, columns=None, limit=None, table=STORE_TABLE):
+    """
+    Rows where any of `terms` appears, case-insensitively, anywhere in any
+    of `fields`; the indexed equivalent of
+    LOWER(field) LIKE '%term%' OR ... Returns a DataFrame of `columns`
+    (default: all) in table order.
+    """
+    terms = [terms] if isinstance(terms, str) else list(terms)
+    select = ", ".join(f't."{c}"' for c in columns) if columns else "t.*"
+    indexed = [t for t in terms if len(t) >= MIN_TRIGRAM]
+    short = [t for t in terms if len(t) < MIN_TRIGRAM]
+
+    where, params = [], []
+    if indexed:
+        fts = _fts(table)
+        field_set = " ".join(f'"{f}"' for f in fields)
+        where.append(f't.rowid IN (SELECT rowid FROM "{fts}" WHERE "{fts}" MATCH ?)')
+        params.append(f"{{{field_set}}} : (" + " OR ".join(_phrase(t.lower()) for t in indexed) + ")")
+    for term in short:
+        for field in fields:
+            where.append(f'LOWER(t."{field}") LIKE ?')
+            params.append(f"%{term.lower()}%")
+
+    sql = f'SELECT {select} FROM "{table}" t WHERE ' + " OR ".join(where) + " ORDER BY t.rowid"
+    if limit:
+        sql += f" LIMIT {int(limit)}"
+    return pd.read_sql_query(sql, conn, params=params)
+
+
+def recent(conn, days=30, limit=10, columns=("Title", "Company", "Location", "Created"), now="now", table=STORE_TABLE):
+    """
+    Listings created in the last `days` days, newest first. Compares the
+    ISO-8601 Created text directly so the Created index is used.
+    """
+    select = ", ".join(f'"{c}"' for c in columns)
+    return pd.read_sql_query(
+        f'SELECT {select} FROM "{table}" WHERE "Created" >= DATE(?, ?) ORDER BY "Created" DESC LIMIT ?',
+        conn, params=[now, f"-{int(days)} day", limit],
+    )
+
+
+def top_counts(conn, column, limit=10, table=STORE_TABLE):
+    """Most frequent values of `column` with their counts (reads only the column's index)."""
+    return pd.read_sql_query(
+        f'SELECT "{column}", COUNT(*) AS total FROM "{table}" GROUP BY "{column}" ORDER BY total DESC LIMIT ?',
+        conn, params=[limit],
+    )
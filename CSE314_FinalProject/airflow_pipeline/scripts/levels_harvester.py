@@ -0,0 +1,137 @@
+import time
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+
+from scripts.html_parsers import parse_internship_rows
+
+# The Levels.fyi internships table is virtualized: only the rows near the
+# viewport exist as `tr[data-index]` at any moment. Instead of sleeping and
+# parsing whatever happens to be rendered, the harvester waits for the first
+# rows, then repeatedly collects the rendered rows, scrolls the last one into
+# view and waits for rows with a higher data-index. It stops once the table
+# is scrolled to the bottom and no new rows show up for END_SETTLE, or, if
+# the bottom can't be told, after HARVEST_PATIENCE scrolls with nothing new.
+# Everything runs through execute_script, so any object with that method
+# (a real WebDriver or a DOM stub) can be harvested.
+
+HARVEST_TIMEOUT = 20     # seconds to wait for the first rows to render
+SETTLE_TIMEOUT = 2       # seconds to wait for new rows after a scroll
+POLL_INTERVAL = 0.05
+HARVEST_PATIENCE = 2     # consecutive scrolls with no new rows before stopping
+END_SETTLE = 0.25        # seconds at the bottom with no new rows before stopping
+MAX_SCROLLS = 10_000
+
+READY_SCRIPT = """
+return document.readyState === 'complete'
+    && document.querySelector('tr[data-index]') !== null;
+"""
+
+# [[data-index, outerHTML], ...] for every row currently in the DOM
+ROWS_SCRIPT = """
+return Array.from(document.querySelectorAll('tr[data-index]'),
+                  row => [row.getAttribute('data-index'), row.outerHTML]);
+"""
+
+SCROLL_SCRIPT = """
+const rows = document.querySelectorAll('tr[data-index]');
+if (rows.length) { rows[rows.length - 1].scrollIntoView({block: 'start'}); }
+else { window.scrollBy(0, window.innerHeight); }
+"""
+
+# [highest data-index, whether the table's scroll container is at the bottom]
+PROGRESS_SCRIPT = """
+const rows = document.querySelectorAll('tr[data-index]');
+let max = -1;
+for (const row of rows) {
+    max = Math.max(max, parseInt(row.getAttribute('data-index'), 10));
+}
+let box = rows.length ? rows[rows.length - 1].parentElement : null;
+while (box && !(box.scrollHeight > box.clientHeight
+                && /(auto|scroll)/.test(getComputedStyle(box).overflowY))) {
+    box = box.parentElement;
+}
+box = box || document.scrollingElement;
+return [max, box.scrollTop + box.clientHeight >= box.scrollHeight - 1];
+"""
+
+
+def wait_for_rows(driver, timeout=HARVEST_TIMEOUT, poll=POLL_INTERVAL):
+    """Blocks until the document is loaded and the first table row exists."""
+    WebDriverWait(driver, timeout, poll_frequency=poll).until(
+        lambda d: d.execute_script(READY_SCRIPT)
+    )
+
+
+def _progress(highest, end_settle):
+    # WebDriverWait condition: "new" once a row past `highest` renders, "end"
+    # once the table has sat at the bottom with none for end_settle seconds
+    bottom_since = None
+
+    def check(driver):
+        nonlocal bottom_since
+        max_index, at_bottom = driver.execute_script(PROGRESS_SCRIPT)
+        if max_index > highest:
+            return "new"
+        if not at_bottom:
+            bottom_since = None
+            return False
+        now = time.perf_counter()
+        bottom_since = now if bottom_since is None else bottom_since
+        return "end" if now - bottom_since >= end_settle else False
+
+    return check
+
+
+def harvest_internship_rows(driver, settle_timeout=SETTLE_TIMEOUT, poll=POLL_INTERVAL,
+                            patience=HARVEST_PATIENCE, max_scrolls=MAX_SCROLLS, end_settle=END_SETTLE):
+    """
+    Scrolls the virtualized internships table to the end, collecting each
+    `tr[data-index]` row once. Returns (rows, stats): rows are the parsed
+    records in data-index order, stats has rows, seconds, rows_per_s and
+    completeness (rows collected / highest data-index + 1, which is below 1
+    when the scroll skipped past some rows).
+    """
+    start = time.perf_counter()
+    seen = {}
+    misses = scrolls = 0
+
+    while misses < patience and scrolls < max_scrolls:
+        for index, html in driver.execute_script(ROWS_SCRIPT):
+            seen.setdefault(int(index), html)
+        highest = max(seen, default=-1)
+        driver.execute_script(SCROLL_SCRIPT)
+        scrolls += 1
+
+        try:
+            progress = WebDriverWait(driver, settle_timeout, poll_frequency=poll).until(
+                _progress(highest, end_settle)
+            )
+        except TimeoutException:
+            misses += 1
+            continue
+        if progress == "end":
+            break
+        misses = 0
+
+    # catch rows rendered by the last scroll
+    for index, html in driver.execute_script(ROWS_SCRIPT):
+        seen.setdefault(int(index), html)
+
+    table = "<table><tbody>" + "".join(seen[i] for i in sorted(seen)) + "</tbody></table>"
+    rows = parse_internship_rows(table)
+
+    seconds = time.perf_counter() - start
+    expected = max(seen, default=-1) + 1
+    stats = {
+        "rows": len(rows),
+        "scrolls": scrolls,
+        "seconds": seconds,
+        "rows_per_s": len(rows) / seconds if seconds else 0.0,
+        "completeness": len(seen) / expected if expected else 1.0,
+    }
+    print(
+        f"Harvested {len(rows)} internship rows in {seconds:.2f}s over {scrolls} scrolls "
+        f"({stats['rows_per_s']:.0f} rows/s, {stats['completeness']:.1%} complete)"
+    )
+    return rows, stats
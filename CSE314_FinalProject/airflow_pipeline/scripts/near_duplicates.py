@@ -0,0 +1,265 @@
+import re
+from itertools import chain
+
+import numpy as np
+import pandas as pd
+
+# Near-duplicate postings (reposts, cross-listings with a reworded title or a
+# few changed words) via MinHash + LSH banding. Each posting's title and
+# cleaned description become a set of word shingles; a MinHash signature
+# estimates Jaccard similarity between those sets, and splitting signatures
+# into bands makes postings above the threshold land in a shared bucket with
+# high probability. Work per posting is constant, so cost grows linearly
+# instead of with the number of pairs.
+#
+# NearDuplicateIndex is incremental: add() a batch at a time, and each new
+# posting is matched against everything added before. It keeps only one
+# representative per bucket plus a union-find parent per posting, never the
+# text or full signatures, so memory is a few dozen bytes per posting per
+# band. save()/load() carry it across runs.
+
+NUM_PERM = 128
+SHINGLE_SIZE = 3        # words per shingle
+DEDUP_THRESHOLD = 0.8   # estimated Jaccard similarity treated as a duplicate
+RECALL_WEIGHT = 0.8     # missed duplicates cost more than extra candidates
+SHINGLE_CHUNK = 1 << 15  # shingles hashed per numpy step; bounds peak memory
+
+_MAX_HASH = np.uint32((1 << 32) - 1)
+_SHIFT = np.uint64(32)
+_TAGS = re.compile(r"<[^<]+?>")
+_TOKEN = re.compile(r"\w+")
+
+
+def lsh_params(threshold, num_perm=NUM_PERM, recall_weight=RECALL_WEIGHT):
+    """
+    (bands, rows) with bands * rows <= num_perm whose S-curve best
+    separates pairs above and below `threshold`: least false-positive area
+    plus false-negative area, the latter weighted by `recall_weight`.
+    """
+    s = np.linspace(0, 1, 201)
+    ds = s[1] - s[0]
+    best, best_err = None, float("inf")
+    for rows in range(1, num_perm + 1):
+        bands = num_perm // rows
+        p = 1 - (1 - s ** rows) ** bands
+        below = s <= threshold
+        err = ((1 - recall_weight) * p[below].sum() + recall_weight * (1 - p[~below]).sum()) * ds
+        if err < best_err:
+            best, best_err = (bands, rows), err
+    return best
+
+
+def posting_tokens(title, description):
+    # a missing title or description (NaN in a DataFrame) counts as no words
+    title = title if isinstance(title, str) else ""
+    description = description if isinstance(description, str) else ""
+    text = f"{title} {_TAGS.sub(' ', description)}".lower()
+    return _TOKEN.findall(text)
+
+
+def _merge_runs(older, newer):
+    # two sorted (keys, reps) runs with no key in common -> one sorted run
+    at = np.searchsorted(older[0], newer[0])
+    return np.insert(older[0], at, newer[0]), np.insert(older[1], at, newer[1])
+
+
+class NearDuplicateIndex:
+    def __init__(self, threshold=DEDUP_THRESHOLD, num_perm=NUM_PERM, shingle_size=SHINGLE_SIZE, seed=1):
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.seed = seed
+        self.bands, self.rows = lsh_params(threshold, num_perm)
+
+        rng = np.random.default_rng(seed)
+        # multiply-shift hashing: (a * x + b) >> 32 with odd a, wrapping at 2**64
+        self.perm_a = rng.integers(1, 1 << 63, num_perm, dtype=np.uint64) | np.uint64(1)
+        self.perm_b = rng.integers(0, 1 << 63, num_perm, dtype=np.uint64)
+        self.band_mix = rng.integers(1, 1 << 63, self.rows, dtype=np.uint64) | np.uint64(1)
+        self.shingle_mix = rng.integers(1, 1 << 63, shingle_size, dtype=np.uint64) | np.uint64(1)
+
+        # per band: runs of (sorted bucket keys, first posting that landed
+        # there). Each batch's new buckets are a new run, merged into the run
+        # before it once that one is no more than twice its size, so a band
+        # holds O(log n) runs and adding a batch doesn't copy every bucket.
+        self.bucket_runs = [[] for _ in range(self.bands)]
+        self.parent = []
+
+    def __len__(self):
+        return len(self.parent)
+
+    # ——— signatures ———
+
+    def _shingles(self, token_lists):
+        # hashes every word of the batch in one call, then combines k
+        # consecutive word hashes into shingle hashes wherever all k words
+        # belong to the same posting. Returns (hashes, posting of each hash).
+        lengths = np.fromiter((len(t) for t in token_lists), dtype=np.int64, count=len(token_lists))
+        words = np.fromiter(chain.from_iterable(token_lists), dtype=object, count=int(lengths.sum()))
+        word_hash = pd.util.hash_array(words, categorize=False) if len(words) else np.empty(0, dtype=np.uint64)
+        owner = np.repeat(np.arange(len(token_lists)), lengths)
+
+        k = self.shingle_size
+        n = len(word_hash) - k + 1
+        if n > 0:
+            shingles = np.zeros(n, dtype=np.uint64)
+            for i in range(k):
+                shingles += word_hash[i:i + n] * self.shingle_mix[i]
+            valid = owner[:n] == owner[k - 1:]
+            shingles, shingle_owner = shingles[valid], owner[:n][valid]
+        else:
+            shingles, shingle_owner = np.empty(0, dtype=np.uint64), np.empty(0, dtype=np.int64)
+
+        # postings shorter than k words get one shingle of all their words
+        short = np.flatnonzero((lengths > 0) & (lengths < k))
+        if len(short):
+            starts = np.r_[0, np.cumsum(lengths)[:-1]]
+            extra = np.array([
+                sum((word_hash[starts[d] + i] * self.shingle_mix[i] for i in range(lengths[d])), np.uint64(0))
+                for d in short
+            ], dtype=np.uint64)
+            order = np.argsort(np.r_[shingle_owner, short], kind="stable")
+            shingles = np.r_[shingles, extra][order]
+            shingle_owner = np.r_[shingle_owner, short][order]
+        return shingles, shingle_owner
+
+    def signatures(self, token_lists):
+        """MinHash signatures, one row per posting; empty postings get all-max rows."""
+        with np.errstate(over="ignore"):
+            shingles, owner = self._shingles(token_lists)
+            sig = np.full((len(token_lists), self.num_perm), _MAX_HASH, dtype=np.uint32)
+            if not len(shingles):
+                return sig
+            # cut the shingle array at posting boundaries into ~SHINGLE_CHUNK pieces
+            boundaries = np.flatnonzero(np.r_[True, owner[1:] != owner[:-1]])
+            cuts = boundaries[np.searchsorted(boundaries, np.arange(0, len(shingles), SHINGLE_CHUNK))]
+            cuts = np.unique(np.r_[cuts, len(shingles)])
+            for lo, hi in zip(cuts[:-1], cuts[1:]):
+                chunk = shingles[lo:hi]
+                permuted = ((self.perm_a[:, None] * chunk[None, :] + self.perm_b[:, None]) >> _SHIFT).astype(np.uint32)
+                starts = boundaries[(boundaries >= lo) & (boundaries < hi)] - lo
+                sig[owner[lo + starts]] = np.minimum.reduceat(permuted, starts, axis=1).T
+        return sig
+
+    def _band_keys(self, sig):
+        with np.errstate(over="ignore"):
+            banded = sig[:, :self.bands * self.rows].reshape(len(sig), self.bands, self.rows)
+            return (banded.astype(np.uint64) * self.band_mix).sum(axis=2, dtype=np.uint64)
+
+    # ——— clustering ———
+
+    def _find(self, i):
+        parent = self.parent
+        root = i
+        while parent[root] != root:
+            root = parent[root]
+        while parent[i] != root:
+            parent[i], i = root, parent[i]
+        return root
+
+    def _union(self, i, j):
+        ri, rj = self._find(i), self._find(j)
+        if ri != rj:
+            # the older posting stays the root, so cluster ids are the id of
+            # the first posting seen in the cluster
+            if ri < rj:
+                self.parent[rj] = ri
+            else:
+                self.parent[ri] = rj
+
+    def add(self, titles, descriptions):
+        """
+        Adds a batch of postings and returns their cluster ids (the id of
+        the earliest matching posting, or their own id). Posting ids are
+        consecutive across batches in the order added.
+        """
+        token_lists = [posting_tokens(t, d) for t, d in zip(titles, descriptions)]
+        first = len(self.parent)
+        ids = np.arange(first, first + len(token_lists))
+        self.parent.extend(ids.tolist())
+
+        nonempty = np.fromiter((len(t) > 0 for t in token_lists), dtype=bool, count=len(token_lists))
+        keys = self._band_keys(self.signatures(token_lists))[nonempty]
+        ids = ids[nonempty]
+
+        for band in range(self.bands):
+            band_keys, runs = keys[:, band], self.bucket_runs[band]
+
+            hit = np.zeros(len(band_keys), dtype=bool)
+            for known_keys, known_reps in runs:
+                pos = np.searchsorted(known_keys, band_keys)
+                found = pos < len(known_keys)
+                found[found] = known_keys[pos[found]] == band_keys[found]
+                for doc, rep in zip(ids[found].tolist(), known_reps[pos[found]].tolist()):
+                    self._union(doc, rep)
+                hit |= found
+
+            # new buckets: the first posting of the batch to land there is the rep
+            new_keys, first_idx, inverse = np.unique(band_keys[~hit], return_index=True, return_inverse=True)
+            new_reps = ids[~hit][first_idx]
+            for doc, rep in zip(ids[~hit].tolist(), new_reps[inverse].tolist()):
+                if doc != rep:
+                    self._union(doc, rep)
+            if len(new_keys):
+                runs.append((new_keys, new_reps))
+            while len(runs) > 1 and len(runs[-2][0]) <= 2 * len(runs[-1][0]):
+                runs.append(_merge_runs(runs.pop(-2), runs.pop()))
+
+        return np.array([self._find(i) for i in range(first, len(self.parent))], dtype=np.int64)
+
+    def cluster_ids(self):
+        """Current cluster id of every posting added so far."""
+        return np.array([self._find(i) for i in range(len(self.parent))], dtype=np.int64)
+
+    # ——— persistence ———
+
+    def _compact(self):
+        # every band down to a single run
+        for band, runs in enumerate(self.bucket_runs):
+            while len(runs) > 1:
+                runs.append(_merge_runs(runs.pop(-2), runs.pop()))
+            if not runs:
+                runs.append((np.empty(0, dtype=np.uint64), np.empty(0, dtype=np.int64)))
+
+    def save(self, path):
+        self._compact()
+        np.savez(
+            path,
+            config=np.array([self.threshold, self.num_perm, self.shingle_size, self.seed]),
+            parent=np.array(self.parent, dtype=np.int64),
+            **{f"keys_{b}": runs[0][0] for b, runs in enumerate(self.bucket_runs)},
+            **{f"reps_{b}": runs[0][1] for b, runs in enumerate(self.bucket_runs)},
+        )
+
+    @classmethod
+    def load(cls, path):
+        data = np.load(path)
+        threshold, num_perm, shingle_size, seed = data["config"]
+        index = cls(float(threshold), int(num_perm), int(shingle_size), int(seed))
+        index.parent = data["parent"].tolist()
+        index.bucket_runs = [[(data[f"keys_{b}"], data[f"reps_{b}"])] for b in range(index.bands)]
+        return index
+
+
+def cluster_postings(df, threshold=DEDUP_THRESHOLD, title_col="Title", description_col="Description",
+                     batch_size=10_000, index=None):
+    """
+    Returns `df` with a `cluster_id` column; postings in the same cluster
+    are near-duplicates. Pass an existing index to match against postings
+    from earlier runs.
+    """
+    if index is None:
+        index = NearDuplicateIndex(threshold)
+    first = len(index)
+    for start in range(0, len(df), batch_size):
+        batch = df.iloc[start:start + batch_size]
+        index.add(batch[title_col].tolist(), batch[description_col].tolist())
+    df = df.copy()
+    df["cluster_id"] = index.cluster_ids()[first:]
+    return df
+
+
+def drop_near_duplicates(df, **kwargs):
+    """Keeps the first posting of every near-duplicate cluster."""
+    clustered = cluster_postings(df, **kwargs)
+    return clustered.drop_duplicates(subset=["cluster_id"]).drop(columns="cluster_id")
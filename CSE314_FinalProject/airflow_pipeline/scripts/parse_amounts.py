@@ -0,0 +1,109 @@
+import numpy as np
+import pandas as pd
+
+# Column-at-a-time parsing of the scraped numbers: pay ("$45", "$7,800",
+# "$40 - $50/hr"), funding ("$1.2B", "$300M") and headcounts ("1-10",
+# "10,001+", and Excel's "10-Jan" / "Nov-50" for "1-10" / "11-50").
+#
+# Every parser factorizes its column, runs pandas string ops over the
+# distinct values only and broadcasts the result back through the codes, so
+# a column of millions of rows with a few thousand distinct strings costs
+# a few thousand parses. Anything that doesn't parse comes back NaN, as
+# pd.to_numeric(errors="coerce") did, and what to_numeric parsed still
+# parses the same: signs and exponents ("-5", "1e3") are kept.
+
+AMOUNT_UNITS = {"": 1.0, "K": 1e3, "M": 1e6, "B": 1e9, "T": 1e12}
+MONTHS = {m: i for i, m in enumerate(
+    ["JAN", "FEB", "MAR", "APR", "MAY", "JUN", "JUL", "AUG", "SEP", "OCT", "NOV", "DEC"], 1
+)}
+
+_NUMBER = r"(?:\d+(?:\.\d+)?|\.\d+)(?:E[-+]?\d+)?"
+_AMOUNT = (
+    rf"^(?P<low>[-+]?{_NUMBER})(?P<low_unit>[KMBT]?)"
+    rf"(?:(?:-|TO)(?P<high>{_NUMBER})(?P<high_unit>[KMBT]?))?"
+    r"(?P<open>\+?)"
+    r"(?:/(?:HR|HOUR|MO|MONTH|YR|YEAR))?$"
+)
+# "10-Jan" (day-month) and "Nov-50" (month-year, two-digit year) are Excel's
+# reading of "1-10" and "11-50"
+_DAY_MONTH = r"^(?P<day>\d{1,2})-(?P<month>[A-Z]{3})$"
+_MONTH_YEAR = r"^(?P<month>[A-Z]{3})-(?P<year>\d{2})$"
+
+
+def _distinct(values):
+    # codes into the distinct non-null values, as normalized text
+    codes, uniques = pd.factorize(pd.Series(values, copy=False))
+    text = pd.Series(uniques.astype(str), dtype=object).str.upper()
+    return codes, text.str.replace(r"[\s$,€£]", "", regex=True).str.replace("–", "-", regex=False)
+
+
+def _broadcast(codes, parsed, index):
+    # parsed: one float per distinct value; code -1 (missing) stays NaN
+    out = np.append(np.asarray(parsed, dtype=float), np.nan)
+    return pd.Series(out[codes], index=index, dtype="float64")
+
+
+def _ranges(text):
+    parts = text.str.extract(_AMOUNT)
+    high_unit = parts["high_unit"].fillna("")
+    # "$1-5M": the low end takes the high end's unit
+    low_unit = parts["low_unit"].where(parts["low_unit"] != "", high_unit).fillna("")
+    low = parts["low"].astype(float) * low_unit.map(AMOUNT_UNITS)
+    high = parts["high"].astype(float) * high_unit.map(AMOUNT_UNITS)
+    high = high.where(parts["high"].notna(), low.where(parts["open"] != "+"))
+    return low.to_numpy(dtype=float), high.to_numpy(dtype=float)
+
+
+def parse_amount_range(values):
+    """
+    (low, high) per value for amounts like "$45", "$7,800", "$1.2B",
+    "$40 - $50/hr", "$1-5M". A single amount has low == high; an open
+    one ("$10M+") has no high.
+    """
+    index = getattr(values, "index", None)
+    codes, text = _distinct(values)
+    low, high = _ranges(text)
+    return pd.DataFrame({"low": _broadcast(codes, low, index), "high": _broadcast(codes, high, index)})
+
+
+def parse_amount(values):
+    """One number per value: the amount, or the middle of a range (the low end of an open one)."""
+    index = getattr(values, "index", None)
+    codes, text = _distinct(values)
+    low, high = _ranges(text)
+    return _broadcast(codes, np.where(np.isnan(high), low, (low + high) / 2), index)
+
+
+def fix_size_encoding(values):
+    """
+    Company-size labels with Excel's date mangling undone ("10-Jan" ->
+    "1-10", "Nov-50" -> "11-50"); everything else is left as it was,
+    including dates that wouldn't be a size bucket low-high ("Jan-00").
+    """
+    values = pd.Series(values, copy=False)
+    codes, uniques = pd.factorize(values)
+    text = pd.Series(uniques.astype(str), dtype=object).str.upper().str.replace(r"\s", "", regex=True)
+
+    day_month = text.str.extract(_DAY_MONTH)
+    month_year = text.str.extract(_MONTH_YEAR)
+    first = day_month["month"].map(MONTHS).fillna(month_year["month"].map(MONTHS))
+    second = day_month["day"].where(day_month["day"].notna(), month_year["year"])
+    mangled = first.notna() & (first < pd.to_numeric(second))
+    fixed = pd.Series(uniques, dtype=object).where(
+        ~mangled, first.astype("Int64").astype(str) + "-" + second.astype(str)
+    )
+    out = np.append(fixed.to_numpy(dtype=object), None)[codes]
+    return pd.Series(out, index=values.index, dtype=object).where(codes >= 0, values)
+
+
+def parse_headcount_range(values):
+    """(low, high) employees for sizes/counts like "1-10", "10,001+", "5000", "Nov-50"."""
+    return parse_amount_range(fix_size_encoding(values))
+
+
+def parse_headcount(values):
+    """
+    One whole employee count per value: the count, or the low end of a size
+    bucket ("11-50" -> 11, "10,001+" -> 10001).
+    """
+    return parse_headcount_range(values)["low"]
@@ -0,0 +1,244 @@
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import time
+
+import aiohttp
+import numpy as np
+import pandas as pd
+
+from utils.rate_limit import RateLimiter
+
+# Module version of detect_red_flags_and_weights from analysis/chat_gpt_api.ipynb.
+# The notebook sent one chat completion per cell, five columns per company,
+# and paid again for the same text on every run. Here the texts of all
+# columns are deduplicated by hash, looked up in a persistent cache, and only
+# the misses go out, several numbered texts per request, concurrently under a
+# shared rate budget. Replies are cached per text, so later runs only pay for
+# new or edited text. red_flag_score is summed from per-text totals with
+# array indexing instead of df.apply(axis=1).
+
+OPENAI_CHAT_URL = "https://api.openai.com/v1/chat/completions"
+RED_FLAG_MODEL = "gpt-3.5-turbo"
+RED_FLAG_CACHE = "/tmp/red_flag_cache.db"
+PROMPT_VERSION = 1  # bump when the prompt changes so cached replies aren't reused
+
+RED_FLAG_COLUMNS = ['description', 'overview', 'believer_points', 'critic_points', 'what_makes_unique']
+
+TEXTS_PER_REQUEST = 10
+MAX_PROMPT_CHARS = 12_000
+RATE_LIMIT = 3.0     # requests per second
+MAX_IN_FLIGHT = 4
+MAX_RETRIES = 3      # on 429 / 5xx, with exponential backoff
+
+SYSTEM_PROMPT = "You are a concise assistant."
+
+
+def load_openai_key():
+    api_key = os.environ.get("OPENAI_API_KEY")
+    if not api_key:
+        raise ValueError("Missing OpenAI credentials; set OPENAI_API_KEY")
+    return api_key
+
+
+def text_hash(text, model=RED_FLAG_MODEL):
+    return hashlib.sha256(f"{model}\0{PROMPT_VERSION}\0{text.strip()}".encode("utf-8")).hexdigest()
+
+
+def batch_prompt(texts):
+    numbered = "\n\n".join(f"Text {i}: {text}" for i, text in enumerate(texts, 1))
+    return (
+        "Identify any red‐flag concerns for job candidates in each of the following texts. "
+        "For each one, give a severity score from 1 (minor) to 5 (major). "
+        "Return *only* a JSON object whose keys are the text numbers and whose values are "
+        "JSON objects where keys are the red‐flag phrase and values are the score.\n\n"
+        f"{numbered}"
+    )
+
+
+def parse_reply(raw, n):
+    """
+    One flags dict per text of the request, or None for a text the reply
+    left out or garbled (those aren't cached and count as no flags).
+    """
+    raw = raw.strip()
+    # sometimes GPT wraps JSON in ```json ...```
+    if raw.startswith("```"):
+        raw = raw.split("```")[1].removeprefix("json")
+    try:
+        data = json.loads(raw)
+    except json.JSONDecodeError:
+        return [None] * n
+    if not isinstance(data, dict):
+        return [None] * n
+
+    results = []
+    for i in range(1, n + 1):
+        flags = data.get(str(i))
+        if not isinstance(flags, dict):
+            results.append(None)
+            continue
+        results.append({
+            phrase: score for phrase, score in flags.items()
+            if isinstance(score, (int, float)) and not isinstance(score, bool)
+        })
+    return results
+
+
+def pack_batches(texts, per_request=TEXTS_PER_REQUEST, max_chars=MAX_PROMPT_CHARS):
+    """Groups texts into requests of at most `per_request` texts and ~`max_chars` characters."""
+    batch, size = [], 0
+    for text in texts:
+        if batch and (len(batch) == per_request or size + len(text) > max_chars):
+            yield batch
+            batch, size = [], 0
+        batch.append(text)
+        size += len(text)
+    if batch:
+        yield batch
+
+
+class RedFlagCache:
+    """Flags per text hash in SQLite; survives between runs."""
+
+    def __init__(self, path=RED_FLAG_CACHE):
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS red_flags (
+                text_hash TEXT PRIMARY KEY,
+                flags     TEXT NOT NULL,
+                scored_at REAL NOT NULL
+            )
+        """)
+        self.conn.commit()
+
+    def get_many(self, hashes):
+        found = {}
+        hashes = list(hashes)
+        for start in range(0, len(hashes), 500):
+            chunk = hashes[start:start + 500]
+            rows = self.conn.execute(
+                f"SELECT text_hash, flags FROM red_flags WHERE text_hash IN ({', '.join('?' for _ in chunk)})",
+                chunk,
+            )
+            found.update((h, json.loads(flags)) for h, flags in rows)
+        return found
+
+    def put_many(self, items):
+        now = time.time()
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO red_flags VALUES (?, ?, ?)",
+            [(h, json.dumps(flags), now) for h, flags in items],
+        )
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+
+async def _score_batch(session, url, model, texts, limiter, in_flight, stats):
+    payload = {
+        "model": model,
+        "messages": [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": batch_prompt(texts)},
+        ],
+    }
+    async with in_flight:
+        for attempt in range(MAX_RETRIES + 1):
+            await limiter.wait()
+            stats["requests"] += 1
+            try:
+                async with session.post(url, json=payload) as resp:
+                    if resp.status == 429 or resp.status >= 500:
+                        raise aiohttp.ClientResponseError(resp.request_info, (), status=resp.status)
+                    resp.raise_for_status()
+                    data = await resp.json(content_type=None)
+                return parse_reply(data["choices"][0]["message"]["content"], len(texts))
+            except aiohttp.ClientResponseError as e:
+                if (e.status == 429 or e.status >= 500) and attempt < MAX_RETRIES:
+                    await asyncio.sleep(2 ** attempt)
+                    continue
+                print(f"Red-flag request failed ({len(texts)} texts): {e}")
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError, KeyError, IndexError) as e:
+                print(f"Red-flag request failed ({len(texts)} texts): {e}")
+            return [None] * len(texts)
+
+
+async def _score_batches(batches, url, api_key, model, rate_limit, max_in_flight, stats):
+    limiter = RateLimiter(rate_limit)
+    in_flight = asyncio.Semaphore(max_in_flight)
+    headers = {"Authorization": f"Bearer {api_key}"}
+    timeout = aiohttp.ClientTimeout(total=120)
+    async with aiohttp.ClientSession(headers=headers, timeout=timeout) as session:
+        return await asyncio.gather(*[
+            _score_batch(session, url, model, batch, limiter, in_flight, stats) for batch in batches
+        ])
+
+
+def score_texts(texts, cache, url=OPENAI_CHAT_URL, api_key=None, model=RED_FLAG_MODEL,
+                per_request=TEXTS_PER_REQUEST, rate_limit=RATE_LIMIT, max_in_flight=MAX_IN_FLIGHT):
+    """
+    Red flags ({phrase: severity}) for each distinct non-empty text in
+    `texts`. Cached texts cost nothing; the rest are sent `per_request` at
+    a time and cached for later runs. Returns
+    ({text: flags}, stats).
+    """
+    stats = {"texts": 0, "cached": 0, "requests": 0, "failed": 0}
+    texts = list(dict.fromkeys(t for t in texts if isinstance(t, str) and t.strip()))
+    hashes = {t: text_hash(t, model) for t in texts}
+    known = cache.get_many(set(hashes.values()))
+    missing = [t for t in texts if hashes[t] not in known]
+    stats["texts"], stats["cached"] = len(texts), len(texts) - len(missing)
+
+    if missing:
+        batches = list(pack_batches(missing, per_request))
+        replies = asyncio.run(_score_batches(
+            batches, url, api_key or load_openai_key(), model, rate_limit, max_in_flight, stats
+        ))
+        fresh = []
+        for batch, flags in zip(batches, replies):
+            for text, text_flags in zip(batch, flags):
+                if text_flags is None:
+                    stats["failed"] += 1
+                else:
+                    fresh.append((hashes[text], text_flags))
+        cache.put_many(fresh)
+        known.update(fresh)
+
+    print(
+        f"Red flags: {stats['texts']} distinct texts, {stats['cached']} cached, "
+        f"{stats['requests']} requests, {stats['failed']} unscored"
+    )
+    return {t: known.get(hashes[t], {}) for t in texts}, stats
+
+
+def add_red_flag_columns(df, columns=RED_FLAG_COLUMNS, cache_path=RED_FLAG_CACHE, **kwargs):
+    """
+    Adds `<col>_red_flags_with_weights` for each of `columns` and
+    `red_flag_score` (the sum of every severity), as the notebook did.
+    Returns (df, stats).
+    """
+    df = df.copy()
+    columns = [c for c in columns if c in df.columns]
+    cells = df[columns].to_numpy(dtype=object).ravel()
+    codes, uniques = pd.factorize(pd.Series(cells, dtype=object))
+
+    cache = RedFlagCache(cache_path)
+    try:
+        flags, stats = score_texts(uniques, cache, **kwargs)
+    finally:
+        cache.close()
+
+    unique_flags = np.empty(len(uniques) + 1, dtype=object)  # last slot: code -1 (missing)
+    unique_flags[:-1] = [flags.get(t, {}) if isinstance(t, str) else {} for t in uniques]
+    unique_flags[-1] = {}
+    unique_totals = np.array([sum(f.values()) for f in unique_flags], dtype=float)
+
+    cell_flags = unique_flags[codes].reshape(len(df), len(columns))
+    for i, col in enumerate(columns):
+        df[f'{col}_red_flags_with_weights'] = cell_flags[:, i]
+    df['red_flag_score'] = unique_totals[codes].reshape(len(df), len(columns)).sum(axis=1)
+    return df, stats
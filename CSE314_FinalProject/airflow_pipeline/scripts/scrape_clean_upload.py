@@ -1,158 +1,413 @@
+import json
+import os
 import re
 import pandas as pd
 
 from scripts.scrape_jobs import (
     scrape_internships,
-    get_company_info,
-    get_simplify_company_profile
+    fetch_company_profiles,
 )
 
 from scripts.clean_jobs_data import (
     clean_internships,
     clean_companies,
     clean_simplify_profiles,
-    build_locations_table,
-    build_internship_locations_table,
-    build_industries_table,
-    build_company_industries_table,
+    build_location_tables,
+    build_bridge_tables,
+    per_category,
+    stable_ids,
+    INTERNSHIP_KEY,
 )
 
-from utils.snowflake_utils import upload_dataframe_to_snowflake
+from scripts.company_resolution import ALIASES_FILE, CompanyResolver, normalize_slug
+
+from scripts.scrape_manifest import (
+    load_manifest,
+    manifest_path,
+    save_manifest,
+    plan_refresh,
+    update_manifest,
+)
+
+from utils.handoff import HANDOFF_DIR, write_table, read_table
+from utils.http_cache import HttpCache
+from utils.metrics import stage
+from utils.schemas import memory_report
+from utils.snowflake_utils import SnowflakeSink, bulk_load
+
+# the only Simplify columns clean_data carries into companies_table
+SIMPLIFY_CLEAN_COLUMNS = [
+    "company_name", "company_simplify_slug", "simplify_url", "simplify_take",
+    "believer_points", "critic_points", "what_makes_unique", "benefits",
+]
 
 def slugify(name):
     return re.sub(r"[^a-z0-9]+", "-", name.lower().strip()).strip("-")\
 
-def normalize_slug(slug):
-    if pd.isna(slug):
-        return ""
-    return re.sub(r"[^a-z0-9]", "", slug.lower())
-
-def scrape_data():
-    df_interns = scrape_internships()
-    df_interns.to_csv("/tmp/internships_raw.csv", index=False)
+def scrape_data(incremental=False, harvest=False, directory=HANDOFF_DIR):
+    df_interns = scrape_internships(harvest)
+    write_table(df_interns, "internships_raw", directory)
     
     company_slugs = df_interns["company_slug"].dropna().unique()
-    company_data = [get_company_info(slug) for slug in company_slugs]
-    pd.DataFrame(company_data).to_csv("/tmp/companies_raw.csv", index=False)
-    
-    simplify_profiles = [get_simplify_company_profile(name) for name in df_interns["company_name"].dropna().unique()]
-    pd.DataFrame(simplify_profiles).to_csv("/tmp/simplify_raw.csv", index=False)
+    company_names = df_interns["company_name"].dropna().unique()
+
+    # incremental: only fetch companies we've never seen or haven't refreshed
+    # in a while, and reuse last run's records for everyone else
+    reused_levels, reused_simplify = {}, {}
+    fetch_slugs, fetch_names = company_slugs, company_names
+    if incremental:
+        manifest = load_manifest(manifest_path(directory))
+        fetch_slugs, reused_levels = plan_refresh(company_slugs, manifest["levels"])
+        fetch_names, reused_simplify = plan_refresh(company_names, manifest["simplify"])
 
-def clean_data():
-    df_levels     = pd.read_csv("/tmp/companies_raw.csv")
-    df_interns    = pd.read_csv("/tmp/internships_raw.csv")
-    df_simplify   = pd.read_csv("/tmp/simplify_raw.csv")
+    cache = HttpCache()
+    try:
+        with stage("fetch_company_profiles", companies=len(fetch_slugs)):
+            fetched_levels, fetched_simplify = fetch_company_profiles(fetch_slugs, fetch_names, cache=cache)
+    finally:
+        cache.report()
+        cache.close()
+
+    if incremental:
+        changed_levels = update_manifest(manifest["levels"], fetched_levels, "company_slug")
+        changed_simplify = update_manifest(manifest["simplify"], fetched_simplify, "company_name")
+        save_manifest(manifest, manifest_path(directory))
+        print(
+            f"Incremental scrape: fetched {len(fetched_levels)} Levels.fyi / {len(fetched_simplify)} Simplify "
+            f"profiles ({changed_levels} / {changed_simplify} new or changed), "
+            f"reused {len(reused_levels)} / {len(reused_simplify)}"
+        )
 
-    df_levels     = clean_companies(df_levels)
-    df_interns    = clean_internships(df_interns)
-    df_simplify   = clean_simplify_profiles(df_simplify)
+    fetched_levels = {r["company_slug"]: r for r in fetched_levels}
+    fetched_simplify = {r["company_name"]: r for r in fetched_simplify}
+    company_data = [reused_levels.get(slug) or fetched_levels[slug] for slug in company_slugs]
+    simplify_profiles = [reused_simplify.get(name) or fetched_simplify[name] for name in company_names]
 
-    df_levels    ["normalized_slug"] = df_levels    ["company_slug"].apply(normalize_slug)
-    df_interns   ["normalized_slug"] = df_interns   ["company_slug"].apply(normalize_slug)
-    df_simplify  ["normalized_slug"] = df_simplify  ["company_simplify_slug"].apply(normalize_slug)
+    write_table(pd.DataFrame(company_data), "companies_raw", directory)
+    write_table(pd.DataFrame(simplify_profiles), "simplify_raw", directory)
 
+# companies_table's columns; reindex rather than select, so columns no
+# scraper fills in yet come out null
+COMPANY_COLUMNS = [
+    "normalized_slug",
+    "company_name", "description", "overview",
+    "website", "twitter", "linkedin",
+    "year_founded", "founded_year",
+    "num_employees", "company_size",
+    "headquarters", "simplify_headquarters",
+    "company_stage", "total_funding",
+    "simplify_url", "simplify_take",
+    "believer_points", "critic_points", "what_makes_unique",
+    "benefits", "industries"
+]
+
+def resolve_companies(df_levels, df_simplify, df_intern_companies, resolver):
+    """
+    Adds normalized_slug to the Levels.fyi and Simplify frames: every slug
+    mapped to its company's canonical normalized slug, so "meta" and
+    "Meta-Platforms" merge as one company. Levels.fyi goes first so its
+    slugs are the canonical ones, then the listings' (slug, name) pairs.
+    """
+    df_levels    ["normalized_slug"] = resolver.resolve_column(df_levels["company_slug"])
+    resolver.resolve_column(df_intern_companies["company_slug"], df_intern_companies["company_name"])
+    df_simplify  ["normalized_slug"] = resolver.resolve_column(df_simplify["company_simplify_slug"], df_simplify["company_name"])
+
+
+def merge_companies(df_levels, df_simplify):
+    """One row per normalized_slug from the resolved profiles, without ids yet."""
     companies = pd.merge(
         df_levels, df_simplify,
         on="normalized_slug",
         how="outer",
         suffixes=("_levels","_simplify")
     )
-
-    companies_table = companies[[
-        "normalized_slug",
-        "company_name", "description", "overview",
-        "website", "twitter", "linkedin",
-        "year_founded", "founded_year",
-        "num_employees", "company_size",
-        "headquarters", "simplify_headquarters",
-        "company_stage", "total_funding",
-        "simplify_url", "simplify_take",
-        "believer_points", "critic_points", "what_makes_unique",
-        "benefits", "industries"
-    ]].drop_duplicates(subset=["normalized_slug"]).reset_index(drop=True)
-    companies_table["company_id"] = companies_table.index + 1
-
-    industry_set = set()
-    company_industries = []
-    for _, row in companies.iterrows():
-        raw = row.get("industries","")
-        if pd.notna(raw):
-            for ind in [i.strip() for i in raw.split(",")]:
-                industry_set.add(ind)
-                company_industries.append((row["normalized_slug"], ind))
-
-    industries_table = pd.DataFrame({"name": sorted(industry_set)})
-    industries_table["industry_id"] = industries_table.index + 1
-
-    company_industries_table = (
-        pd.DataFrame(company_industries, columns=["normalized_slug","industry_name"])
-          .merge(companies_table[["normalized_slug","company_id"]], on="normalized_slug")
-          .merge(industries_table, left_on="industry_name", right_on="name")
-          [["company_id","industry_id"]]
+    return (
+        companies.reindex(columns=COMPANY_COLUMNS)
+          .drop_duplicates(subset=["normalized_slug"])
+          .reset_index(drop=True)
     )
 
-    internships_table = (
-        pd.merge(
-            df_interns,
-            companies_table[["normalized_slug","company_id"]],
-            on="normalized_slug", how="left"
+
+def _company_tables(df_levels, df_simplify, df_intern_companies, resolver):
+    with stage("resolve_companies"):
+        resolve_companies(df_levels, df_simplify, df_intern_companies, resolver)
+        print(f"Company resolution: {len(resolver.aliases)} slugs, {len(resolver.merged())} merged into another company")
+
+    with stage("merge_companies"):
+        companies_table = merge_companies(df_levels, df_simplify)
+        companies_table["company_id"] = stable_ids(companies_table, ["normalized_slug"])
+
+    with stage("build_industries"):
+        industries_table, company_industries = build_bridge_tables(
+            companies_table, "normalized_slug", "industries", "industry_id"
+        )
+        company_ids = companies_table.set_index("normalized_slug")["company_id"]
+        company_industries["company_id"] = company_industries["normalized_slug"].map(company_ids)
+        company_industries_table = (
+            company_industries.dropna(subset=["company_id"])
+              .astype({"company_id": "int64"})
+              [["company_id","industry_id"]]
+              .reset_index(drop=True)
         )
-        [[
-            "company_id","title","location",
-            "hourly_rate","monthly_pay",
-            "degree_requirement","perks_clean","apply_link"
-        ]]
-        .drop_duplicates()
-        .reset_index(drop=True)
+
+    return companies_table, industries_table, company_industries_table
+
+
+def _internship_tables(df_interns, company_ids, resolver):
+    # company_ids: companies_table[["normalized_slug", "company_id"]]
+    df_interns["normalized_slug"] = resolver.resolve_column(df_interns["company_slug"], df_interns["company_name"])
+
+    with stage("merge_internships"):
+        internships_table = (
+            pd.merge(
+                df_interns,
+                company_ids,
+                on="normalized_slug", how="left"
+            )
+            [[
+                "company_id","title","location",
+                "hourly_rate","monthly_pay",
+                "degree_requirement","perks_clean","apply_link"
+            ]]
+            # one row per listing, so each gets its own id
+            .drop_duplicates(subset=INTERNSHIP_KEY, keep="last")
+            .reset_index(drop=True)
+        )
+        internships_table["internship_id"] = stable_ids(internships_table, INTERNSHIP_KEY)
+
+    with stage("build_locations"):
+        locations_table, internship_locations_table = build_location_tables(internships_table)
+
+    return internships_table, locations_table, internship_locations_table
+
+
+def clean_data(directory=HANDOFF_DIR, aliases_path=None):
+    with stage("clean_read"):
+        df_levels     = read_table("companies_raw", directory=directory)
+        df_interns    = read_table("internships_raw", directory=directory)
+        df_simplify   = read_table("simplify_raw", columns=SIMPLIFY_CLEAN_COLUMNS, directory=directory)
+
+    with stage("clean_frames"):
+        df_levels     = clean_companies(df_levels)
+        df_interns    = clean_internships(df_interns)
+        df_simplify   = clean_simplify_profiles(df_simplify)
+        memory_report({"companies": df_levels, "internships": df_interns, "simplify": df_simplify})
+
+    aliases_path = aliases_path or os.path.join(directory, ALIASES_FILE)
+    resolver = CompanyResolver.load(aliases_path)
+    companies_table, industries_table, company_industries_table = _company_tables(
+        df_levels, df_simplify, df_interns, resolver
+    )
+    resolver.save(aliases_path)
+    internships_table, locations_table, internship_locations_table = _internship_tables(
+        df_interns, companies_table[["normalized_slug", "company_id"]], resolver
     )
-    internships_table["internship_id"] = internships_table.index + 1
-
-    location_set = set()
-    internship_locations = []
-    for _, row in internships_table.iterrows():
-        loc = row["location"]
-        if pd.notna(loc) and isinstance(loc, str):
-            loc_clean = loc.split(" - ")[0].strip()
-            parts = [x.strip() for x in re.split(r",|\n", loc_clean)]
-            if len(parts)==3:
-                city, state, country = parts
-            elif len(parts)==2:
-                city, state = parts; country=""
+
+    with stage("write_exports"):
+        write_table(internships_table,          "export_internships",          directory)
+        write_table(companies_table,            "export_companies",            directory)
+        write_table(locations_table,            "export_locations",            directory)
+        write_table(internship_locations_table, "export_internship_locations", directory)
+        write_table(industries_table,           "export_industries",           directory)
+        write_table(company_industries_table,   "export_company_industries",   directory)
+
+
+EXPORT_TABLES = [
+    ("export_internships",             "TEST2_INTERNSHIPS"),
+    ("export_companies",               "TEST2_COMPANIES"),
+    ("export_locations",               "TEST2_LOCATIONS"),
+    ("export_internship_locations",    "TEST2_INTERNSHIP_LOCATIONS"),
+    ("export_industries",              "TEST2_INDUSTRIES"),
+    ("export_company_industries",      "TEST2_COMPANY_INDUSTRIES"),
+]
+
+
+def upload_data(upsert=False, directory=HANDOFF_DIR):
+    sink = SnowflakeSink()
+    try:
+        return bulk_load(
+            [(lambda name=name: read_table(name, memory_map=True, directory=directory), table) for name, table in EXPORT_TABLES],
+            sink,
+            upsert=upsert,
+        )
+    finally:
+        sink.close()
+
+
+# ——— fan-out DAG tasks ———
+# The same work as scrape_data / clean_data / upload_data, cut into tasks
+# that can run on different workers: profile fetching is sharded per
+# source, company and listing cleaning run side by side, and every export
+# table loads on its own. They pass data through the handoff directory,
+# which every worker must share.
+
+PROFILE_SHARDS = 4
+PROFILE_SOURCES = {
+    # source: (handoff table, record key, manifest section)
+    "levels":   ("companies_raw", "company_slug", "levels"),
+    "simplify": ("simplify_raw",  "company_name", "simplify"),
+}
+COMPANY_EXPORTS = ["export_companies", "export_industries", "export_company_industries"]
+INTERNSHIP_EXPORTS = ["export_internships", "export_locations", "export_internship_locations"]
+
+
+def _shard_path(source, shard, directory):
+    return os.path.join(directory, "profile_shards", f"{source}_{shard:03d}.json")
+
+
+def shard_keys(keys, shards=PROFILE_SHARDS):
+    """Splits `keys` into at most `shards` contiguous, order-preserving runs."""
+    keys = list(keys)
+    size = -(-len(keys) // shards) if keys else 0
+    return [keys[i:i + size] for i in range(0, len(keys), size)] if size else []
+
+
+def scrape_listings(incremental=False, harvest=False, shards=PROFILE_SHARDS, directory=HANDOFF_DIR):
+    """
+    Scrapes the listings into internships_raw and returns one kwargs dict
+    per profile shard to fetch: {"source", "shard", "keys", "incremental"}.
+    """
+    df_interns = scrape_internships(harvest)
+    write_table(df_interns, "internships_raw", directory)
+
+    keys = {
+        "levels": df_interns["company_slug"].dropna().unique().tolist(),
+        "simplify": df_interns["company_name"].dropna().unique().tolist(),
+    }
+    # clear out the last run's shards so collect_profiles only sees this run's
+    for source in PROFILE_SOURCES:
+        shard = 0
+        while os.path.exists(_shard_path(source, shard, directory)):
+            os.remove(_shard_path(source, shard, directory))
+            shard += 1
+    return [
+        {"source": source, "shard": i, "keys": chunk, "incremental": incremental}
+        for source, source_keys in keys.items()
+        for i, chunk in enumerate(shard_keys(source_keys, shards))
+    ]
+
+
+def fetch_profile_shard(source, shard, keys, incremental=False, directory=HANDOFF_DIR):
+    """
+    Fetches one shard of Levels.fyi or Simplify profiles. Records go to a
+    JSON file per shard, along with which of them were fetched rather than
+    reused, for collect_profiles to merge.
+    """
+    _, key_field, section = PROFILE_SOURCES[source]
+    to_fetch, reused = keys, {}
+    if incremental:
+        to_fetch, reused = plan_refresh(keys, load_manifest(manifest_path(directory))[section])
+
+    cache = HttpCache()
+    try:
+        with stage("fetch_company_profiles", source=source, companies=len(to_fetch)):
+            if source == "levels":
+                fetched, _ = fetch_company_profiles(to_fetch, [], cache=cache)
             else:
-                city=parts[0]; state=country=""
-            location_set.add((city, state, country))
-            internship_locations.append((row["internship_id"], city, state, country))
+                _, fetched = fetch_company_profiles([], to_fetch, cache=cache)
+    finally:
+        cache.report()
+        cache.close()
+
+    by_key = {r[key_field]: r for r in fetched}
+    records = [reused.get(key) or by_key[key] for key in keys]
+    path = _shard_path(source, shard, directory)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(f"{path}.tmp", "w") as f:
+        json.dump({"records": records, "fetched": fetched}, f)
+    os.replace(f"{path}.tmp", path)
+    print(f"{source} shard {shard}: {len(fetched)} fetched, {len(reused)} reused")
 
-    locations_table = pd.DataFrame(
-        list(location_set),
-        columns=["city","state","country"]
+
+def collect_profiles(incremental=False, directory=HANDOFF_DIR):
+    """
+    Concatenates the profile shards in shard order into companies_raw and
+    simplify_raw (the same tables scrape_data writes) and, when
+    incremental, records the fetched profiles in the manifest.
+    """
+    manifest = load_manifest(manifest_path(directory)) if incremental else None
+    for source, (table, key_field, section) in PROFILE_SOURCES.items():
+        records, fetched, shard = [], [], 0
+        while os.path.exists(_shard_path(source, shard, directory)):
+            with open(_shard_path(source, shard, directory)) as f:
+                part = json.load(f)
+            records.extend(part["records"])
+            fetched.extend(part["fetched"])
+            shard += 1
+        if incremental:
+            changed = update_manifest(manifest[section], fetched, key_field)
+            print(f"{source}: fetched {len(fetched)} profiles ({changed} new or changed), reused {len(records) - len(fetched)}")
+        write_table(pd.DataFrame(records), table, directory)
+    if incremental:
+        save_manifest(manifest, manifest_path(directory))
+
+
+def build_company_tables(directory=HANDOFF_DIR, aliases_path=None):
+    """companies / industries / company_industries exports, and the alias table build_internship_tables reads."""
+    with stage("clean_read"):
+        df_levels = read_table("companies_raw", directory=directory)
+        df_simplify = read_table("simplify_raw", columns=SIMPLIFY_CLEAN_COLUMNS, directory=directory)
+        df_intern_companies = read_table("internships_raw", columns=["company_slug", "company_name"], directory=directory)
+
+    with stage("clean_frames"):
+        df_levels = clean_companies(df_levels)
+        df_simplify = clean_simplify_profiles(df_simplify)
+        # just the slug / name cleanup clean_internships does; clean_listings does the rest
+        df_intern_companies = df_intern_companies.assign(
+            company_slug=per_category(df_intern_companies["company_slug"], lambda s: s.str.lower().str.strip()),
+            company_name=per_category(df_intern_companies["company_name"], lambda s: s.str.strip()),
+        )
+        memory_report({"companies": df_levels, "simplify": df_simplify})
+
+    aliases_path = aliases_path or os.path.join(directory, ALIASES_FILE)
+    resolver = CompanyResolver.load(aliases_path)
+    companies_table, industries_table, company_industries_table = _company_tables(
+        df_levels, df_simplify, df_intern_companies, resolver
     )
-    locations_table["location_id"] = locations_table.index + 1
+    resolver.save(aliases_path)
+
+    with stage("write_exports"):
+        write_table(companies_table,          "export_companies",          directory)
+        write_table(industries_table,         "export_industries",         directory)
+        write_table(company_industries_table, "export_company_industries", directory)
+
 
-    internship_locations_table = (
-        pd.DataFrame(internship_locations, columns=["internship_id","city","state","country"])
-          .merge(locations_table, on=["city","state","country"], how="left")
-          [["internship_id","location_id"]]
+def clean_listings(directory=HANDOFF_DIR):
+    """clean_internships on the raw listings; runs alongside build_company_tables."""
+    with stage("clean_read"):
+        df_interns = read_table("internships_raw", directory=directory)
+    with stage("clean_frames"):
+        df_interns = clean_internships(df_interns)
+        memory_report({"internships": df_interns})
+    write_table(df_interns, "internships_clean", directory)
+
+
+def build_internship_tables(directory=HANDOFF_DIR, aliases_path=None):
+    """internships / locations / internship_locations exports, once both tasks above are done."""
+    with stage("clean_read"):
+        df_interns = read_table("internships_clean", directory=directory)
+        company_ids = read_table("export_companies", columns=["normalized_slug", "company_id"], directory=directory)
+
+    resolver = CompanyResolver.load(aliases_path or os.path.join(directory, ALIASES_FILE))
+    internships_table, locations_table, internship_locations_table = _internship_tables(
+        df_interns, company_ids, resolver
     )
-    internship_locations_table["is_remote"] = False
-
-    internships_table.to_csv("/tmp/export_internships.csv",            index=False)
-    companies_table.to_csv(  "/tmp/export_companies.csv",              index=False)
-    locations_table.to_csv(  "/tmp/export_locations.csv",              index=False)
-    internship_locations_table.to_csv("/tmp/export_internship_locations.csv", index=False)
-    industries_table.to_csv(  "/tmp/export_industries.csv",            index=False)
-    company_industries_table.to_csv("/tmp/export_company_industries.csv", index=False)
-
-
-def upload_data():
-    to_load = [
-        ("/tmp/export_internships.csv",             "TEST2_INTERNSHIPS"),
-        ("/tmp/export_companies.csv",               "TEST2_COMPANIES"),
-        ("/tmp/export_locations.csv",               "TEST2_LOCATIONS"),
-        ("/tmp/export_internship_locations.csv",    "TEST2_INTERNSHIP_LOCATIONS"),
-        ("/tmp/export_industries.csv",              "TEST2_INDUSTRIES"),
-        ("/tmp/export_company_industries.csv",      "TEST2_COMPANY_INDUSTRIES"),
-    ]
-    for path, table in to_load:
-        df = pd.read_csv(path)
-        upload_dataframe_to_snowflake(df, table)
+
+    with stage("write_exports"):
+        write_table(internships_table,          "export_internships",          directory)
+        write_table(locations_table,            "export_locations",            directory)
+        write_table(internship_locations_table, "export_internship_locations", directory)
+
+
+def upload_table(name, upsert=False, directory=HANDOFF_DIR):
+    """Loads one export table into its Snowflake table."""
+    table = dict(EXPORT_TABLES)[name]
+    sink = SnowflakeSink()
+    try:
+        return bulk_load(
+            [(lambda: read_table(name, memory_map=True, directory=directory), table)],
+            sink,
+            upsert=upsert,
+        )
+    finally:
+        sink.close()
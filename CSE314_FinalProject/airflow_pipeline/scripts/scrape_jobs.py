@@ -1,13 +1,26 @@
 import re
+import asyncio
+import aiohttp
 import requests
-from bs4 import BeautifulSoup
 import pandas as pd
 import time
+from urllib.parse import urlsplit
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
-import snowflake.connector
-from snowflake.connector.pandas_tools import write_pandas
+
+from scripts.html_parsers import (
+    parse_internship_rows,
+    parse_company_info,
+    parse_simplify_company_profile,
+)
+from scripts.levels_harvester import wait_for_rows, harvest_internship_rows
+from utils.metrics import count, stage, timer
+from utils.snowflake_utils import upload_dataframe_to_snowflake
+
+LEVELS_INTERNSHIPS_URL = "https://www.levels.fyi/internships/"
+LEVELS_COMPANY_URL = "https://www.levels.fyi/companies/{slug}"
+SIMPLIFY_COMPANY_URL = "https://simplify.jobs/c/{slug}"
 
 def slugify(name):
     return re.sub(r"[^a-z0-9]+", "-", name.lower().strip()).strip("-")
@@ -15,7 +28,12 @@ def slugify(name):
 def simplifyify(name):
     return name.strip().replace(" ", "-")
 
-def scrape_internships():
+def scrape_internships(harvest=False):
+    internships = list(iter_internships(harvest))
+    print(f"Successfully scraped {len(internships)} internships")
+    return pd.DataFrame(internships)
+
+def chrome_options():
     options = webdriver.ChromeOptions()
     options.add_argument('--ignore-ssl-errors=yes')
     options.add_argument('--ignore-certificate-errors')
@@ -25,222 +43,180 @@ def scrape_internships():
     options.add_argument("--disable-dev-shm-usage")
     options.add_argument("--no-sandbox")
     options.add_argument("-headless")
+    return options
 
+def remote_driver():
     remote_webdriver = 'remote_chromedriver'
-    with webdriver.Remote(f'{remote_webdriver}:4444/wd/hub', options=options) as driver:
-    
-        driver.get("https://www.levels.fyi/internships/")
-        time.sleep(5)
-        
-        soup = BeautifulSoup(driver.page_source, "html.parser")
-        driver.quit()
-
-        rows = soup.find_all("tr", attrs={"data-index": True})
-
-        internships = []
-
-        for row in rows:
-            try:
-                company_name = row.select_one(".company-info-cell h6")
-                company_name = company_name.get_text(strip=True) if company_name else ""
-
-                location_season = row.select_one(".company-info-cell p")
-                location_season = location_season.get_text(strip=True) if location_season else ""
-
-                title = row.select_one("span.badge")
-                title = title.get_text(strip=True) if title else ""
-
-                hourly = row.select_one(".hourly-salary-td h6 span.cashInText")
-                hourly = hourly.get_text(strip=True) if hourly else ""
-
-                monthly = row.select_one(".hourly-salary-td p.text-muted span.cashInText")
-                monthly = monthly.get_text(strip=True) if monthly else ""
+    return webdriver.Remote(f'{remote_webdriver}:4444/wd/hub', options=chrome_options())
 
-                perk_tags = row.select(".tags-th p.cashInText")
-                perks = "\n".join(p.get_text(strip=True) for p in perk_tags)
-
-                apply_link_tag = row.select_one("a[href]")
-                apply_link = apply_link_tag["href"] if apply_link_tag else ""
-
-                company_slug = slugify(company_name)
-
-                internships.append({
-                    "company_slug": company_slug,
-                    "company_name": company_name,
-                    "title": title,
-                    "location": location_season,
-                    "hourly_rate": hourly,
-                    "monthly_pay": monthly,
-                    "perks": perks,
-                    "apply_link": apply_link
-                })
-
-            except Exception as e:
-                print(f"Error parsing internship row: {e}")
-                continue
-
-        print(f"Successfully scraped {len(internships)} internships")
-        return pd.DataFrame(internships)
-
-def get_company_info(slug):
-    url = f"https://www.levels.fyi/companies/{slug}"
+def load_internship_rows(driver, harvest=False):
+    with stage("selenium_page_load"):
+        driver.get(LEVELS_INTERNSHIPS_URL)
+        if harvest:
+            wait_for_rows(driver)
+        else:
+            time.sleep(5)
+    if harvest:
+        with stage("selenium_harvest"):
+            rows, _ = harvest_internship_rows(driver)
+    else:
+        with stage("parse_internships"):
+            rows = parse_internship_rows(driver.page_source)
+    count("rows_scraped_total", len(rows), source="levels_internships")
+    return rows
+
+def iter_internships(harvest=False):
+    """
+    Yields one raw internship record (with its company_slug) at a time,
+    for callers that stream rows instead of building the whole DataFrame.
+    With `harvest=True` the page is waited on and scrolled through (see
+    levels_harvester) instead of parsing what rendered after a fixed sleep.
+    """
+    with remote_driver() as driver:
+        rows = load_internship_rows(driver, harvest)
+
+    for row in rows:
+        yield {"company_slug": slugify(row["company_name"]), **row}
+
+def empty_company_info(slug):
+    return {
+        "company_slug": slug,
+        "description": "",
+        "website": "",
+        "twitter": "",
+        "linkedin": "",
+        "year_founded": "",
+        "num_employees": "",
+        "headquarters": ""
+    }
+
+def _count_response(host, text):
+    count("http_requests_total", host=host)
+    count("http_response_bytes_total", len(text), host=host)
+
+def fetch_page(url, cache=None):
+    host = urlsplit(url).hostname
+    try:
+        with timer("http_request_seconds", host=host):
+            if cache is None:
+                text = requests.get(url, timeout=10).text
+            else:
+                text = cache.get(url, timeout=10)
+    except Exception:
+        count("http_errors_total", host=host)
+        raise
+    _count_response(host, text)
+    return text
+
+async def fetch_page_async(session, url, cache=None):
+    host = urlsplit(url).hostname
+    try:
+        with timer("http_request_seconds", host=host):
+            if cache is None:
+                async with session.get(url) as res:
+                    text = await res.text(errors="replace")
+            else:
+                text = await cache.get_async(session, url)
+    except Exception:
+        count("http_errors_total", host=host)
+        raise
+    _count_response(host, text)
+    return text
+
+def get_company_info(slug, url_template=LEVELS_COMPANY_URL, cache=None):
+    url = url_template.format(slug=slug)
     print(f"Scraping Levels.fyi: {url}")
     try:
-        res = requests.get(url, timeout=10)
-        soup = BeautifulSoup(res.text, "html.parser")
-
-        def extract_text(selector):
-            el = soup.select_one(selector)
-            return el.get_text(strip=True) if el else ""
-
-        def extract_caption_value(label):
-            span = soup.find("span", text=label)
-            if span:
-                h6 = span.find_previous_sibling("h6")
-                return h6.get_text(strip=True) if h6 else ""
-            return ""
-
-        description = extract_text(".company-page_companyDescription__JVjrt > p")
-        links = soup.select("h6.MuiTypography-subtitle1 a[href]")
-        website = links[0]["href"] if links else ""
-        twitter, linkedin = "", ""
-        for a in links[1:]:
-            href = a["href"]
-            if "twitter.com" in href:
-                twitter = href
-            elif "linkedin.com" in href:
-                linkedin = href
-
-        year_founded = extract_caption_value("Year Founded")
-        num_employees = extract_caption_value("# of Employees")
-
-        iframe = soup.find("iframe", {"title": "Company Address"})
-        address = ""
-        if iframe and "q=" in iframe.get("src", ""):
-            match = re.search(r"q=([^&]+)", iframe["src"])
-            if match:
-                address = match.group(1).replace("%20", " ").replace(",", ", ")
-
-        return {
-            "company_slug": slug,
-            "description": description,
-            "website": website,
-            "twitter": twitter,
-            "linkedin": linkedin,
-            "year_founded": year_founded,
-            "num_employees": num_employees,
-            "headquarters": address
-        }
+        return parse_company_info(slug, fetch_page(url, cache))
 
     except Exception as e:
         print(f"Failed to scrape Levels.fyi company page: {e}")
-        return {
-            "company_slug": slug,
-            "description": "",
-            "website": "",
-            "twitter": "",
-            "linkedin": "",
-            "year_founded": "",
-            "num_employees": "",
-            "headquarters": ""
-        }
-
-def get_simplify_company_profile(name):
+        return empty_company_info(slug)
+
+def empty_simplify_profile(name, slug, url):
+    return {
+        "company_name": name,
+        "company_simplify_slug": slug,
+        "simplify_url": url,
+        "simplify_take": "",
+        "believer_points": "",
+        "critic_points": "",
+        "what_makes_unique": "",
+        "benefits": "",
+        "about_text": "",
+        "simplify_rating": "",
+        "competitive_edge": "",
+        "growth_potential": "",
+        "rating_differentiation": ""
+    }
+
+def get_simplify_company_profile(name, url_template=SIMPLIFY_COMPANY_URL, cache=None):
     slug = simplifyify(name)
-    url = f"https://simplify.jobs/c/{slug}"
+    url = url_template.format(slug=slug)
     print(f"Scraping detailed Simplify profile: {url}")
 
     try:
-        res = requests.get(url, timeout=10)
-        soup = BeautifulSoup(res.text, "html.parser")
-
-        def extract_section_text(header_text):
-            header = soup.find(lambda tag: tag.name in ["h2", "h3", "h4", "h5"] and header_text.lower() in tag.text.lower())
-            content = []
-            if header:
-                for sibling in header.find_next_siblings():
-                    if sibling.name in ["h2", "h3", "h4", "h5"]:
-                        break
-                    if sibling.name in ["p", "li", "div"]:
-                        content.append(sibling.get_text(strip=True))
-            return "\n".join(content)
-
-        def extract_rating(label):
-            span = soup.find("span", string=re.compile(label, re.I))
-            if span and span.find_previous("h5"):
-                return span.find_previous("h5").get_text(strip=True)
-            return ""
+        return parse_simplify_company_profile(name, slug, url, fetch_page(url, cache))
 
-        simplify_take = extract_section_text("Simplify's Take")
-        believers = extract_section_text("What believers are saying")
-        critics = extract_section_text("What critics are saying")
-        uniqueness = extract_section_text("What makes")
-        benefits = extract_section_text("Benefits")
-        about = extract_section_text("About")
+    except Exception as e:
+        print(f"Error scraping {url}: {e}")
+        return empty_simplify_profile(name, slug, url)
 
-        overall_rating = extract_rating("Simplify's Rating")
-        competitive_edge = extract_rating("Competitive Edge")
-        growth_potential = extract_rating("Growth Potential")
-        rating_diff = extract_rating("Rating Differentiation")
+# --- concurrent profile fetching ---
+# same output dicts as get_company_info / get_simplify_company_profile, but all
+# pages go through one pooled aiohttp session with a per-host connection cap.
+# Timeouts are sock_connect/sock_read, not total: a total clock would also run
+# while a request waits for a free per-host slot, so big batches timed out
+# before they were ever sent.
 
-        return {
-            "company_name": name,
-            "company_simplify_slug": slug,
-            "simplify_url": url,
-            "simplify_take": simplify_take,
-            "believer_points": believers,
-            "critic_points": critics,
-            "what_makes_unique": uniqueness,
-            "benefits": benefits,
-            "about_text": about,
-            "simplify_rating": overall_rating,
-            "competitive_edge": competitive_edge,
-            "growth_potential": growth_potential,
-            "rating_differentiation": rating_diff
-        }
+async def _fetch_company_info_async(session, slug, url_template, cache):
+    url = url_template.format(slug=slug)
+    print(f"Scraping Levels.fyi: {url}")
+    try:
+        html = await fetch_page_async(session, url, cache)
+        return parse_company_info(slug, html)
 
     except Exception as e:
-        print(f"Error scraping {url}: {e}")
-        return {
-            "company_name": name,
-            "company_simplify_slug": slug,
-            "simplify_url": url,
-            "simplify_take": "",
-            "believer_points": "",
-            "critic_points": "",
-            "what_makes_unique": "",
-            "benefits": "",
-            "about_text": "",
-            "simplify_rating": "",
-            "competitive_edge": "",
-            "growth_potential": "",
-            "rating_differentiation": ""
-        }
+        print(f"Failed to scrape Levels.fyi company page {url}: {e!r}")
+        return empty_company_info(slug)
 
-# --- Snowflake upload function ---
-
-def upload_dataframe_to_snowflake(df, table_name):
-    conn = snowflake.connector.connect(
-        user="MALLARD",
-        password="L1lysunsk@ter@gmail.com",
-        account="IOB55870",
-        warehouse="MALLARD_WH",
-        database="MALLARD_DB",
-        schema="FINAL_PROJECT"
-    )
+async def _fetch_simplify_company_profile_async(session, name, url_template, cache):
+    slug = simplifyify(name)
+    url = url_template.format(slug=slug)
+    print(f"Scraping detailed Simplify profile: {url}")
     try:
-        success, nchunks, nrows, _ = write_pandas(
-            conn=conn,
-            df=df,
-            table_name=table_name,
-            auto_create_table=True
-        )
-        if success:
-            print(f"Uploaded {nrows} rows to {table_name}!")
-        else:
-            print(f"Upload failed.")
-    finally:
-        conn.close()
+        html = await fetch_page_async(session, url, cache)
+        return parse_simplify_company_profile(name, slug, url, html)
+
+    except Exception as e:
+        print(f"Error scraping {url}: {e!r}")
+        return empty_simplify_profile(name, slug, url)
+
+async def _fetch_company_profiles(slugs, names, max_per_host, max_connections,
+                                  levels_url, simplify_url, cache, timeout):
+    connector = aiohttp.TCPConnector(limit=max_connections, limit_per_host=max_per_host)
+    timeout = aiohttp.ClientTimeout(total=None, sock_connect=timeout, sock_read=timeout)
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        levels_jobs = [_fetch_company_info_async(session, slug, levels_url, cache) for slug in slugs]
+        simplify_jobs = [_fetch_simplify_company_profile_async(session, name, simplify_url, cache) for name in names]
+        results = await asyncio.gather(*levels_jobs, *simplify_jobs)
+    return results[:len(levels_jobs)], results[len(levels_jobs):]
+
+def fetch_company_profiles(slugs, names, max_per_host=8, max_connections=32,
+                           levels_url=LEVELS_COMPANY_URL, simplify_url=SIMPLIFY_COMPANY_URL,
+                           cache=None, timeout=10):
+    """
+    Fetches Levels.fyi pages for `slugs` and Simplify pages for `names`
+    concurrently. Returns (company_data, simplify_profiles) as lists in
+    input order, matching the sequential get_* functions row for row.
+    Pass an HttpCache as `cache` to serve/revalidate pages from disk.
+    `timeout` (seconds) bounds connecting and each socket read once a
+    connection slot is free; time spent queued for a slot doesn't count.
+    """
+    return asyncio.run(_fetch_company_profiles(
+        list(slugs), list(names), max_per_host, max_connections,
+        levels_url, simplify_url, cache, timeout
+    ))
 
 def scrape_clean_upload():
     print("Scraping internship listings...")
@@ -0,0 +1,90 @@
+import hashlib
+import json
+import os
+import time
+
+from utils.handoff import HANDOFF_DIR
+
+# next to the handoff tables: the DAG's fetch shards read it, collect_profiles writes it
+MANIFEST_FILE = "scrape_manifest.json"
+REFRESH_AGE = 7 * 24 * 60 * 60  # re-scrape a known company after a week
+
+# the manifest remembers, per source, the last record scraped for every key
+# (company_slug for Levels.fyi, company_name for Simplify) plus a hash of it:
+# {"levels": {slug: {"hash": ..., "scraped_at": ..., "record": {...}}}, "simplify": {...}}
+
+# what a record carries even when its fetch failed (empty_company_info,
+# empty_simplify_profile); a record with nothing else is not worth keeping
+IDENTITY_FIELDS = {"company_slug", "company_name", "company_simplify_slug", "simplify_url"}
+
+def manifest_path(directory=HANDOFF_DIR):
+    return os.path.join(directory, MANIFEST_FILE)
+
+
+def load_manifest(path=None):
+    path = path or manifest_path()
+    if not os.path.exists(path):
+        return {"levels": {}, "simplify": {}}
+    with open(path) as f:
+        manifest = json.load(f)
+    manifest.setdefault("levels", {})
+    manifest.setdefault("simplify", {})
+    return manifest
+
+
+def save_manifest(manifest, path=None):
+    path = path or manifest_path()
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(manifest, f)
+    os.replace(tmp, path)
+
+
+def record_hash(record):
+    return hashlib.sha256(json.dumps(record, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def plan_refresh(keys, section, max_age=REFRESH_AGE, now=None):
+    """
+    Splits `keys` into the ones that need fetching (new, or last scraped
+    more than `max_age` seconds ago) and the previous records that can be
+    reused as-is. Returns (to_fetch, reused) where reused maps key -> record.
+    """
+    now = now or time.time()
+    to_fetch, reused = [], {}
+    for key in keys:
+        entry = section.get(key)
+        if entry is None or now - entry["scraped_at"] > max_age:
+            to_fetch.append(key)
+        else:
+            reused[key] = entry["record"]
+    return to_fetch, reused
+
+
+def is_empty_record(record):
+    """True for a record with no scraped content, i.e. a failed fetch."""
+    return not any(value for field, value in record.items() if field not in IDENTITY_FIELDS)
+
+
+def update_manifest(section, records, key_field, now=None):
+    """
+    Writes freshly scraped `records` into `section`. Empty records are left
+    out, so a company whose fetch failed is fetched again next run instead
+    of staying blank for REFRESH_AGE. Returns how many records were new or
+    had different content than last time.
+    """
+    now = now or time.time()
+    changed = skipped = 0
+    for record in records:
+        if is_empty_record(record):
+            skipped += 1
+            continue
+        key = record[key_field]
+        digest = record_hash(record)
+        previous = section.get(key)
+        if previous is None or previous["hash"] != digest:
+            changed += 1
+        section[key] = {"hash": digest, "scraped_at": now, "record": record}
+    if skipped:
+        print(f"Manifest: {skipped} empty records not saved, they will be fetched again next run")
+    return changed
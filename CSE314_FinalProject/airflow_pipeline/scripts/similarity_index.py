@@ -0,0 +1,185 @@
+import os
+import pickle
+import re
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+# "Similar internships" over the Adzuna postings: a TF-IDF matrix of each
+# posting's title, cleaned description and (optionally) its company's
+# description, L2-normalized so a dot product is the cosine similarity.
+#
+# Besides the posting x term rows, the index keeps the transpose (term x
+# posting, i.e. an inverted index) in CSR. A query is one sparse
+# vector-matrix product against it, which only touches the postings that
+# share a term with the query instead of every row.
+#
+# add() transforms new postings with the already-fitted vocabulary and idf
+# weights, so nothing is refit; they sit in a small delta block that is
+# folded into the main matrices once it grows past DELTA_FRACTION of them,
+# or on save(). Words first seen after the fit are ignored until fit() is
+# run again. save() writes plain .npy arrays that load() memory-maps.
+
+SIMILARITY_DIR = "/tmp/similarity_index"
+TFIDF_PARAMS = dict(stop_words="english", sublinear_tf=True, min_df=2, max_df=0.5, dtype=np.float32)
+DELTA_FRACTION = 0.1
+TOP_K = 10
+
+_TAGS = re.compile(r"<[^<]+?>")
+_SPACE = re.compile(r"\s+")
+
+
+def clean_text(text):
+    if not isinstance(text, str):
+        return ""
+    return _SPACE.sub(" ", _TAGS.sub(" ", text)).strip()
+
+
+def posting_texts(df, companies=None, title_col="Title", description_col="Description", company_col="Company"):
+    """
+    Title + description per posting, plus the company's description when a
+    companies table (company_name, description) is given.
+    """
+    text = df[title_col].map(clean_text) + " " + df[description_col].map(clean_text)
+    if companies is not None:
+        about = (
+            companies.dropna(subset=["company_name"])
+            .assign(key=lambda c: c["company_name"].str.lower().str.strip())
+            .drop_duplicates(subset=["key"])
+            .set_index("key")["description"]
+            .map(clean_text)
+        )
+        text = text + " " + df[company_col].str.lower().str.strip().map(about).fillna("")
+    return text.tolist()
+
+
+def _top_k(scores, indices, k, exclude=None):
+    # top-k of one sparse result row, best first; ties go to the lower posting
+    if exclude is not None:
+        keep = indices != exclude
+        scores, indices = scores[keep], indices[keep]
+    if len(scores) > k:
+        part = np.argpartition(-scores, k - 1)[:k]
+        scores, indices = scores[part], indices[part]
+    order = np.lexsort((indices, -scores))
+    return indices[order], scores[order]
+
+
+class SimilarityIndex:
+    def __init__(self, **tfidf_params):
+        self.vectorizer = TfidfVectorizer(**{**TFIDF_PARAMS, **tfidf_params})
+        self.ids = np.empty(0, dtype=object)
+        self.rows = None       # posting x term, CSR
+        self.inverted = None   # term x posting, CSR
+        self.delta = None      # posting x term rows added since the last fold
+        self._positions = None  # id -> row, built on first similar_to()
+
+    def __len__(self):
+        return len(self.ids)
+
+    def _require_fit(self, method):
+        if self.rows is None:
+            raise RuntimeError(f"SimilarityIndex.{method}() needs an index; call fit() or load() first")
+
+    def fit(self, texts, ids=None):
+        """Fits the vocabulary and idf weights on `texts` and indexes them (replaces any previous contents)."""
+        self.rows = self.vectorizer.fit_transform(texts).tocsr()
+        self.inverted = self.rows.T.tocsr()
+        self.delta = None
+        self.ids = np.asarray(ids if ids is not None else np.arange(self.rows.shape[0]), dtype=object)
+        self._positions = None
+        return self
+
+    def add(self, texts, ids=None):
+        """Indexes more postings with the fitted vocabulary; no refit."""
+        self._require_fit("add")
+        block = self.vectorizer.transform(texts).tocsr()
+        first = len(self.ids)
+        new_ids = ids if ids is not None else np.arange(first, first + block.shape[0])
+        self.ids = np.concatenate([self.ids, np.asarray(new_ids, dtype=object)])
+        self._positions = None
+        self.delta = block if self.delta is None else sp.vstack([self.delta, block], format="csr")
+        if self.delta.nnz > DELTA_FRACTION * self.rows.nnz:
+            self._fold()
+
+    def _fold(self):
+        if self.delta is None:
+            return
+        self.rows = sp.vstack([self.rows, self.delta], format="csr")
+        self.inverted = self.rows.T.tocsr()
+        self.delta = None
+
+    def _scores(self, queries):
+        # queries x postings cosine similarities, sparse
+        scores = queries @ self.inverted
+        if self.delta is not None:
+            scores = sp.hstack([scores, queries @ self.delta.T], format="csr")
+        return scores.tocsr()
+
+    def _vector(self, position):
+        n = self.rows.shape[0]
+        return self.rows[position] if position < n else self.delta[position - n]
+
+    def _results(self, scores, k, exclude=None):
+        results = []
+        for i in range(scores.shape[0]):
+            start, end = scores.indptr[i], scores.indptr[i + 1]
+            positions, values = _top_k(
+                scores.data[start:end], scores.indices[start:end], k,
+                None if exclude is None else exclude[i],
+            )
+            results.append(pd.DataFrame({"id": self.ids[positions], "score": values}))
+        return results
+
+    def query(self, texts, k=TOP_K):
+        """Top-k most similar indexed postings for each free-text query, as DataFrames of (id, score)."""
+        self._require_fit("query")
+        single = isinstance(texts, str)
+        results = self._results(self._scores(self.vectorizer.transform([texts] if single else texts)), k)
+        return results[0] if single else results
+
+    def similar_to(self, posting_ids, k=TOP_K):
+        """Top-k postings most similar to already indexed ones, excluding the posting itself."""
+        self._require_fit("similar_to")
+        single = not isinstance(posting_ids, (list, tuple, np.ndarray, pd.Series))
+        wanted = [posting_ids] if single else list(posting_ids)
+        if self._positions is None:
+            self._positions = {posting_id: i for i, posting_id in enumerate(self.ids)}
+        positions = [self._positions[p] for p in wanted]
+        queries = sp.vstack([self._vector(p) for p in positions], format="csr")
+        results = self._results(self._scores(queries), k, exclude=positions)
+        return results[0] if single else results
+
+    # ——— persistence ———
+
+    def save(self, directory=SIMILARITY_DIR):
+        self._fold()
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, "vectorizer.pkl"), "wb") as f:
+            pickle.dump(self.vectorizer, f)
+        for name, matrix in (("rows", self.rows), ("inverted", self.inverted)):
+            for part in ("data", "indices", "indptr"):
+                np.save(os.path.join(directory, f"{name}_{part}.npy"), getattr(matrix, part))
+            np.save(os.path.join(directory, f"{name}_shape.npy"), np.array(matrix.shape))
+        # numeric ids stay numeric; anything else (URLs, slugs) is saved as text
+        ids = np.asarray(self.ids.tolist())
+        np.save(os.path.join(directory, "ids.npy"), ids if ids.dtype.kind in "iuf" else ids.astype(str))
+
+    @classmethod
+    def load(cls, directory=SIMILARITY_DIR, mmap=True):
+        """Reopens a saved index; with `mmap` the matrices stay on disk and are paged in as queries touch them."""
+        index = cls()
+        with open(os.path.join(directory, "vectorizer.pkl"), "rb") as f:
+            index.vectorizer = pickle.load(f)
+        mode = "r" if mmap else None
+        for name in ("rows", "inverted"):
+            data, indices, indptr = (
+                np.load(os.path.join(directory, f"{name}_{part}.npy"), mmap_mode=mode)
+                for part in ("data", "indices", "indptr")
+            )
+            shape = tuple(np.load(os.path.join(directory, f"{name}_shape.npy")))
+            setattr(index, name, sp.csr_matrix((data, indices, indptr), shape=shape, copy=False))
+        index.ids = np.load(os.path.join(directory, "ids.npy")).astype(object)
+        return index
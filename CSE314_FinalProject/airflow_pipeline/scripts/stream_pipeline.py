@@ -0,0 +1,201 @@
+import itertools
+import os
+import time
+
+import pandas as pd
+
+from scripts.scrape_jobs import (
+    SIMPLIFY_COMPANY_URL,
+    iter_internships,
+    fetch_company_profiles,
+    empty_company_info,
+    empty_simplify_profile,
+    simplifyify,
+)
+from scripts.clean_jobs_data import (
+    clean_internships,
+    clean_companies,
+    clean_simplify_profiles,
+    build_location_tables,
+    explode_delimited,
+    stable_ids,
+    INTERNSHIP_KEY,
+)
+from scripts.company_resolution import ALIASES_FILE, CompanyResolver
+from scripts.scrape_clean_upload import SIMPLIFY_CLEAN_COLUMNS, resolve_companies, merge_companies
+from utils.handoff import HANDOFF_DIR, conform
+from utils.http_cache import HttpCache
+from utils.schemas import TABLES
+from utils.snowflake_utils import SnowflakeSink
+
+# Streaming mode runs scrape -> clean -> load in one pass. Raw records are
+# pulled `batch_size` at a time, cleaned, resolved and merged with the same
+# functions as clean_data, given ids and appended to the sink before the
+# next batch is read, so peak memory follows the batch size instead of the
+# feed size. Ids come from stable_ids, as in clean_data; the only state
+# kept between batches is the company resolver and which companies /
+# locations / industries were already written, which grow with the number
+# of distinct ones, not with listings.
+#
+# For a feed that fits in one batch the tables hold the same rows as
+# clean_data's exports. Across batches a company is written once, from the
+# profiles fetched in the batch it first appears in, and duplicate listings
+# are only dropped within a batch.
+
+STREAM_BATCH_SIZE = 5_000
+
+# table -> Snowflake table; each is written with the types of clean_data's
+# export_<table>, so both modes load the same values
+STREAM_TABLES = {
+    "internships":          "TEST2_INTERNSHIPS",
+    "companies":            "TEST2_COMPANIES",
+    "locations":            "TEST2_LOCATIONS",
+    "internship_locations": "TEST2_INTERNSHIP_LOCATIONS",
+    "industries":           "TEST2_INDUSTRIES",
+    "company_industries":   "TEST2_COMPANY_INDUSTRIES",
+}
+
+RAW_INTERNSHIP_COLUMNS = [
+    "company_slug", "company_name", "title", "location",
+    "hourly_rate", "monthly_pay", "perks", "apply_link",
+]
+
+INTERNSHIP_COLUMNS = [
+    "company_id", "title", "location",
+    "hourly_rate", "monthly_pay",
+    "degree_requirement", "perks_clean", "apply_link",
+]
+
+
+def batched(records, batch_size):
+    records = iter(records)
+    while True:
+        batch = list(itertools.islice(records, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def _new_profiles(raw, seen, fetch_profiles):
+    # profiles for the slugs / names first seen in this batch, fetched the
+    # way scrape_data fetches them: one Levels.fyi page per raw slug, one
+    # Simplify page per raw name
+    slugs = [slug for slug in raw["company_slug"].dropna().unique() if slug not in seen["slugs"]]
+    names = [name for name in raw["company_name"].dropna().unique() if name not in seen["names"]]
+    seen["slugs"].update(slugs)
+    seen["names"].update(names)
+    if fetch_profiles is not None:
+        company_data, simplify_profiles = fetch_profiles(slugs, names) if slugs or names else ([], [])
+    else:
+        company_data = [empty_company_info(slug) for slug in slugs]
+        simplify_profiles = [
+            empty_simplify_profile(name, simplifyify(name), SIMPLIFY_COMPANY_URL.format(slug=simplifyify(name)))
+            for name in names
+        ]
+    df_levels = pd.DataFrame(company_data, columns=list(TABLES["companies_raw"]))
+    df_simplify = pd.DataFrame(simplify_profiles, columns=list(TABLES["simplify_raw"]))[SIMPLIFY_CLEAN_COLUMNS]
+    return clean_companies(df_levels), clean_simplify_profiles(df_simplify)
+
+
+def _new_companies(df_levels, df_simplify, company_ids):
+    # companies no earlier batch wrote, merged the way clean_data merges them
+    companies = merge_companies(df_levels, df_simplify)
+    companies = companies[~companies["normalized_slug"].isin(company_ids)].reset_index(drop=True)
+    companies["company_id"] = stable_ids(companies, ["normalized_slug"])
+    company_ids.update(zip(companies["normalized_slug"], companies["company_id"].tolist()))
+    return companies
+
+
+def _new_industries(companies, industry_ids):
+    # industries no earlier batch wrote, in first-seen order; exploded the
+    # way clean_data's build_bridge_tables does
+    pairs = explode_delimited(companies, "company_id", "industries")
+    industries_table = pd.DataFrame({"name": [n for n in pairs["industries"].unique() if n not in industry_ids]})
+    industries_table["industry_id"] = stable_ids(industries_table, ["name"])
+    industry_ids.update(zip(industries_table["name"], industries_table["industry_id"].tolist()))
+    company_industries_table = pd.DataFrame({
+        "company_id": pairs["company_id"].to_numpy(),
+        "industry_id": pairs["industries"].map(industry_ids).to_numpy(),
+    })
+    return industries_table, company_industries_table
+
+
+def stream_pipeline(records, sink, fetch_profiles=None, batch_size=STREAM_BATCH_SIZE, tables=STREAM_TABLES,
+                    resolver=None):
+    """
+    Cleans and loads an iterable of raw internship records (the dicts
+    iter_internships yields) `batch_size` at a time, appending every table
+    to `sink`. `fetch_profiles(slugs, names)` should return
+    (company_data, simplify_profiles) like fetch_company_profiles; it is
+    called once per batch for slugs and names not seen in an earlier batch.
+    Without it companies get empty profiles carrying just slug and name.
+    Companies are resolved through `resolver` (a fresh CompanyResolver by
+    default), which is left holding every alias seen.
+
+    Returns the number of rows written per table.
+    """
+    resolver = CompanyResolver() if resolver is None else resolver
+    seen = {"slugs": set(), "names": set()}
+    company_ids, location_ids, industry_ids = {}, {}, {}
+    rows = dict.fromkeys(tables, 0)
+
+    def write(df, name):
+        if len(df):
+            rows[name] += sink.write(conform(df, f"export_{name}"), tables[name])
+
+    start = time.perf_counter()
+    for batch in batched(records, batch_size):
+        raw = pd.DataFrame(batch, columns=RAW_INTERNSHIP_COLUMNS)
+        del batch
+        df_interns = clean_internships(raw)
+
+        df_levels, df_simplify = _new_profiles(raw, seen, fetch_profiles)
+        resolve_companies(df_levels, df_simplify, df_interns, resolver)
+        companies = _new_companies(df_levels, df_simplify, company_ids)
+        write(companies, "companies")
+        industries_table, company_industries_table = _new_industries(companies, industry_ids)
+        write(industries_table, "industries")
+        write(company_industries_table, "company_industries")
+
+        df_interns["normalized_slug"] = resolver.resolve_column(df_interns["company_slug"], df_interns["company_name"])
+        df_interns["company_id"] = df_interns["normalized_slug"].map(company_ids).astype("Int64")
+        internships_table = (
+            df_interns[INTERNSHIP_COLUMNS]
+              .drop_duplicates(subset=INTERNSHIP_KEY, keep="last")
+              .reset_index(drop=True)
+        )
+        internships_table["internship_id"] = stable_ids(internships_table, INTERNSHIP_KEY)
+
+        locations_table, internship_locations_table = build_location_tables(internships_table, location_ids)
+        write(internships_table, "internships")
+        write(locations_table, "locations")
+        write(internship_locations_table, "internship_locations")
+
+    print(
+        f"Streamed {rows['internships']} internships, {rows['companies']} companies, "
+        f"{rows['locations']} locations in {time.perf_counter() - start:.2f}s "
+        f"(batch size {batch_size})"
+    )
+    return rows
+
+
+def stream_scrape_clean_upload(batch_size=STREAM_BATCH_SIZE, harvest=False, aliases_path=None):
+    """Streaming counterpart of scrape_data + clean_data + upload_data, sharing clean_data's alias table."""
+    aliases_path = aliases_path or os.path.join(HANDOFF_DIR, ALIASES_FILE)
+    resolver = CompanyResolver.load(aliases_path)
+    cache = HttpCache()
+    sink = SnowflakeSink()
+    try:
+        rows = stream_pipeline(
+            iter_internships(harvest),
+            sink,
+            fetch_profiles=lambda slugs, names: fetch_company_profiles(slugs, names, cache=cache),
+            batch_size=batch_size,
+            resolver=resolver,
+        )
+        resolver.save(aliases_path)
+        return rows
+    finally:
+        sink.close()
+        cache.report()
+        cache.close()
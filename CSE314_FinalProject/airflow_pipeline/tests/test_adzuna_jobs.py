@@ -0,0 +1,70 @@
+import sqlite3
+
+import pytest
+
+from benchmarks.bench_adzuna import adzuna_route
+from benchmarks.local_server import LocalServer
+from scripts.adzuna_jobs import ADZUNA_RAW_TABLE, ADZUNA_TABLE, scrape_adzuna_jobs
+
+PREVIOUS_CSV = "Title,Company,Location,Category,Created,Description,URL\nold,row,,,,,\n"
+
+
+@pytest.fixture
+def outputs(tmp_path):
+    # a previous harvest, and the cleaned table clean_adzuna_jobs wrote
+    csv_path, db_path = tmp_path / "jobs.csv", tmp_path / "internships.db"
+    csv_path.write_text(PREVIOUS_CSV, encoding="utf-8")
+    with sqlite3.connect(db_path) as conn:
+        for table in (ADZUNA_RAW_TABLE, ADZUNA_TABLE):
+            conn.execute(f'CREATE TABLE "{table}" ("URL" TEXT)')
+            conn.execute(f'INSERT INTO "{table}" VALUES (?)', (f"{table}-previous",))
+    return str(csv_path), str(db_path)
+
+
+def urls(db_path, table):
+    with sqlite3.connect(db_path) as conn:
+        return {row[0] for row in conn.execute(f'SELECT "URL" FROM "{table}"')}
+
+
+def tables(db_path):
+    with sqlite3.connect(db_path) as conn:
+        return {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+
+
+def assert_untouched(csv_path, db_path):
+    with open(csv_path, encoding="utf-8") as f:
+        assert f.read() == PREVIOUS_CSV
+    assert urls(db_path, ADZUNA_RAW_TABLE) == {f"{ADZUNA_RAW_TABLE}-previous"}
+    assert urls(db_path, ADZUNA_TABLE) == {f"{ADZUNA_TABLE}-previous"}
+    assert tables(db_path) == {ADZUNA_RAW_TABLE, ADZUNA_TABLE}
+
+
+def test_missing_credentials_leave_outputs_alone(outputs, monkeypatch):
+    monkeypatch.delenv("ADZUNA_APP_ID", raising=False)
+    monkeypatch.delenv("ADZUNA_APP_KEY", raising=False)
+    with pytest.raises(ValueError, match="ADZUNA_APP_ID"):
+        scrape_adzuna_jobs(*outputs)
+    assert_untouched(*outputs)
+
+
+def test_failed_harvest_leaves_outputs_alone(outputs):
+    with LocalServer(lambda path: (500, "{}"), latency=0) as server:
+        with pytest.raises(RuntimeError, match="left as they were"):
+            scrape_adzuna_jobs(*outputs, url_template=server.url + "/search/{page}", credentials=("x", "y"),
+                               max_pages=3, rate_limit=0)
+    assert_untouched(*outputs)
+
+
+def test_harvest_replaces_raw_outputs_only(outputs):
+    csv_path, db_path = outputs
+    with LocalServer(adzuna_route({"intern": 120, "internship": 80}), latency=0) as server:
+        stats = scrape_adzuna_jobs(csv_path, db_path, url_template=server.url + "/search/{page}",
+                                   credentials=("x", "y"), rate_limit=0)
+
+    kept = urls(db_path, ADZUNA_RAW_TABLE)
+    assert len(kept) == stats["jobs_kept"] > 0
+    with open(csv_path, encoding="utf-8") as f:
+        assert sum(1 for _ in f) - 1 == stats["jobs_kept"]
+    # the cleaned table is clean_adzuna_jobs' to replace
+    assert urls(db_path, ADZUNA_TABLE) == {f"{ADZUNA_TABLE}-previous"}
+    assert tables(db_path) == {ADZUNA_RAW_TABLE, ADZUNA_TABLE}
@@ -0,0 +1,33 @@
+import pandas as pd
+import pytest
+
+from benchmarks.bench_clean_adzuna import synthetic_raw_csv
+from scripts.clean_adzuna_jobs import clean_adzuna_jobs
+
+ROWS = 600
+
+
+@pytest.fixture
+def raw_csv(tmp_path):
+    path = str(tmp_path / "raw.csv")
+    synthetic_raw_csv(path, ROWS)
+    return path
+
+
+def clean(raw_csv, tmp_path, name, **kwargs):
+    out_csv, out_db = str(tmp_path / f"{name}.csv"), str(tmp_path / f"{name}.db")
+    stats = clean_adzuna_jobs(raw_csv, out_csv, out_db, chunk_rows=100, **kwargs)
+    return stats, pd.read_csv(out_csv)
+
+
+def test_small_input_stays_in_process(raw_csv, tmp_path):
+    stats, _ = clean(raw_csv, tmp_path, "small", workers=2, parallel_min_rows=ROWS + 1)
+    assert stats["workers"] == 1
+
+
+@pytest.mark.parametrize("parallel_min_rows", [ROWS, 250])
+def test_pool_output_matches_one_process(raw_csv, tmp_path, parallel_min_rows):
+    _, expected = clean(raw_csv, tmp_path, "serial", workers=1)
+    stats, cleaned = clean(raw_csv, tmp_path, "pool", workers=2, parallel_min_rows=parallel_min_rows)
+    assert stats["workers"] == 2
+    pd.testing.assert_frame_equal(cleaned, expected)
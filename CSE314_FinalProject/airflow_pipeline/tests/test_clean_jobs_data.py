@@ -0,0 +1,187 @@
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from scripts.clean_jobs_data import (
+    build_bridge_tables,
+    build_location_tables,
+    explode_delimited,
+    parse_location,
+    per_category,
+    split_perks,
+    split_perks_columns,
+)
+
+PIECES = ["Undergrad", "undergrad", "Masters", "PhD", "PhDs", "Phd student", "Free Food",
+          "Housing", "Relocation", " ", "", '"', "\\n", "\n", "Masters\\n", "401k"]
+
+
+def random_perks(rng, n):
+    values = []
+    for _ in range(n):
+        if rng.random() < 0.05:
+            values.append(np.nan)
+            continue
+        k = rng.randint(0, 4)
+        values.append("".join(rng.choice(PIECES) + rng.choice(["", "\n", "\\n", " "]) for _ in range(k)))
+    return pd.Series(values, dtype=object)
+
+
+def expected_split(perks):
+    return perks.apply(split_perks).reset_index(drop=True)
+
+
+# ——— split_perks_columns ———
+
+@pytest.mark.parametrize("seed", range(20))
+def test_split_perks_columns_matches_split_perks(seed):
+    perks = random_perks(random.Random(seed), 300)
+    pd.testing.assert_frame_equal(
+        split_perks_columns(perks).reset_index(drop=True), expected_split(perks), check_dtype=False
+    )
+
+
+@pytest.mark.parametrize("cell, degree, perks_clean", [
+    ("Undergrad\nFree Food", "Undergrad", "Free Food"),
+    ("Masters\\nHousing\nGym", "Masters", "Housing\nGym"),
+    ('"PhD"', "PhD", ""),
+    ("Free Food\nHousing", np.nan, "Free Food\nHousing"),
+    ("  Relocation  ", np.nan, "Relocation"),
+])
+def test_split_perks_columns_cases(cell, degree, perks_clean):
+    row = split_perks_columns(pd.Series([cell], dtype=object)).iloc[0]
+    assert (pd.isna(row["degree_requirement"]) and pd.isna(degree)) or row["degree_requirement"] == degree
+    assert row["perks_clean"] == perks_clean
+
+
+def test_split_perks_columns_missing_stays_missing():
+    out = split_perks_columns(pd.Series([np.nan, None], dtype=object))
+    assert out.isna().all().all()
+
+
+def test_split_perks_columns_per_category_matches_object_column():
+    perks = random_perks(random.Random(1), 500)
+    categorical = per_category(perks.astype("category"), split_perks_columns)
+    assert all(isinstance(t, pd.CategoricalDtype) for t in categorical.dtypes)
+    pd.testing.assert_frame_equal(categorical.astype(object), expected_split(perks), check_dtype=False)
+
+
+@pytest.mark.parametrize("values", [[], [np.nan, None, np.nan]])
+@pytest.mark.parametrize("as_category", [False, True])
+def test_split_perks_columns_empty_or_all_missing(values, as_category):
+    # an all-missing perks column comes back from the handoff as a categorical
+    # with no categories, so fn sees an empty Series
+    perks = pd.Series(values, dtype=object)
+    if as_category:
+        perks = perks.astype("category")
+    out = per_category(perks, split_perks_columns)
+    assert list(out.columns) == ["degree_requirement", "perks_clean"]
+    assert len(out) == len(values)
+    assert out.isna().all().all()
+
+
+# ——— build_location_tables ———
+
+LOCATIONS = [
+    "Austin, TX, United States - Summer 2025",
+    "New York, NY - Fall 2025",
+    "Remote",
+    np.nan,
+    "New York, NY - Summer 2025",
+    "Austin, TX, United States - Summer 2025",
+]
+
+
+def resolved(locations_table, internship_locations_table):
+    merged = internship_locations_table.merge(locations_table, on="location_id")
+    return {
+        row.internship_id: (row.city, row.state, row.country)
+        for row in merged.itertuples(index=False)
+    }
+
+
+def test_build_location_tables_resolves_each_listing():
+    df = pd.DataFrame({"internship_id": [10, 11, 12, 13, 14, 15], "location": LOCATIONS})
+    locations_table, internship_locations_table = build_location_tables(df)
+
+    assert len(locations_table) == 3
+    assert locations_table["location_id"].is_unique
+    # the listing without a location gets no bridge row
+    assert resolved(locations_table, internship_locations_table) == {
+        internship_id: parse_location(loc)
+        for internship_id, loc in zip(df["internship_id"], LOCATIONS)
+        if isinstance(loc, str)
+    }
+    assert not internship_locations_table["is_remote"].any()
+
+
+def test_build_location_tables_in_chunks_matches_one_pass():
+    df = pd.DataFrame({"internship_id": range(len(LOCATIONS)), "location": LOCATIONS})
+    whole_locations, whole_bridge = build_location_tables(df)
+
+    location_ids, parts = {}, []
+    for start in range(0, len(df), 2):
+        parts.append(build_location_tables(df.iloc[start:start + 2], location_ids))
+    chunked_locations = pd.concat([p[0] for p in parts], ignore_index=True)
+    chunked_bridge = pd.concat([p[1] for p in parts], ignore_index=True)
+
+    # every location is written once, with the id the one-pass build gives it
+    pd.testing.assert_frame_equal(chunked_locations, whole_locations)
+    pd.testing.assert_frame_equal(chunked_bridge, whole_bridge)
+
+
+def test_build_location_tables_ids_do_not_depend_on_other_rows():
+    df = pd.DataFrame({"internship_id": [1, 2], "location": ["Seattle, WA", "Boston, MA"]})
+    alone = build_location_tables(df.iloc[[1]])[0]
+    together = build_location_tables(df)[0]
+    assert alone.iloc[0]["location_id"] == together.set_index("city").loc["Boston", "location_id"]
+
+
+# ——— explode_delimited / build_bridge_tables ———
+
+COMPANIES = pd.DataFrame({
+    "normalized_slug": ["stripe", "ramp", "meta", "nobody"],
+    "industries": ["Fintech, Payments", "Fintech,,  Spend ", np.nan, ""],
+})
+
+
+def test_explode_delimited_strips_and_keeps_empty_values():
+    pairs = explode_delimited(COMPANIES, "normalized_slug", "industries")
+    assert list(map(tuple, pairs.to_numpy().tolist())) == [
+        ("stripe", "Fintech"), ("stripe", "Payments"),
+        ("ramp", "Fintech"), ("ramp", ""), ("ramp", "Spend"),
+        ("nobody", ""),
+    ]
+
+
+def test_explode_delimited_drop_empty():
+    pairs = explode_delimited(COMPANIES, "normalized_slug", "industries", drop_empty=True)
+    assert list(map(tuple, pairs.to_numpy().tolist())) == [
+        ("stripe", "Fintech"), ("stripe", "Payments"), ("ramp", "Fintech"), ("ramp", "Spend"),
+    ]
+    assert pairs.index.equals(pd.RangeIndex(len(pairs)))
+
+
+def test_explode_delimited_other_separator():
+    df = pd.DataFrame({"key": [1], "benefits": ["Health Insurance\n401k"]})
+    pairs = explode_delimited(df, "key", "benefits", sep="\n")
+    assert pairs["benefits"].tolist() == ["Health Insurance", "401k"]
+
+
+def test_build_bridge_tables():
+    industries, bridge = build_bridge_tables(COMPANIES, "normalized_slug", "industries", "industry_id", drop_empty=True)
+    assert industries["name"].tolist() == ["Fintech", "Payments", "Spend"]
+    assert industries["industry_id"].is_unique
+    named = bridge.merge(industries, on="industry_id")
+    assert sorted(map(tuple, named[["normalized_slug", "name"]].to_numpy().tolist())) == [
+        ("ramp", "Fintech"), ("ramp", "Spend"), ("stripe", "Fintech"), ("stripe", "Payments"),
+    ]
+
+    # an industry keeps its id when others come and go
+    fewer, _ = build_bridge_tables(COMPANIES.iloc[[1]], "normalized_slug", "industries", "industry_id", drop_empty=True)
+    assert fewer.set_index("name")["industry_id"].to_dict() == {
+        name: industry_id for name, industry_id in zip(industries["name"], industries["industry_id"])
+        if name in ("Fintech", "Spend")
+    }
@@ -0,0 +1,46 @@
+import pandas as pd
+import pytest
+
+from scripts.company_resolution import CompanyResolver, company_key
+
+
+@pytest.mark.parametrize("first, second", [
+    (("stripe", None), ("stripe-inc", "Stripe, Inc.")),
+    (("openai", "OpenAI"), ("openai-llc", "OpenAI LLC")),
+    (("doordash", "DoorDash"), ("door-dash", "Door Dash, Inc.")),
+    (("palantir-technologies", "Palantir Technologies"), ("palantir-technologies-inc", "Palantir Technologies Inc.")),
+    (("robinhood-markets", "Robinhood Markets"), ("robinhod-markets", "Robinhod Markets")),
+])
+def test_variants_of_one_company_merge(first, second):
+    resolver = CompanyResolver()
+    assert resolver.resolve(*first) == resolver.resolve(*second)
+
+
+@pytest.mark.parametrize("first, second", [
+    (("apex-group", "Apex Group"), ("apex-technologies", "Apex Technologies")),
+    (("snap", "Snap"), ("snap-holdings", "Snap Holdings")),
+    (("meta", "Meta"), ("metabase", "Metabase")),
+    (("block", "Block"), ("block-tech", "Block Tech")),
+    (("the-trade-desk", "The Trade Desk"), ("trade-co", "Trade Co")),
+])
+def test_distinct_companies_stay_apart(first, second):
+    resolver = CompanyResolver()
+    assert resolver.resolve(*first) != resolver.resolve(*second)
+
+
+def test_company_key_drops_only_legal_suffixes():
+    assert company_key("Stripe, Inc.") == "stripe"
+    assert company_key("Acme Holdings Ltd") == "acmeholdings"
+    assert company_key("LLC") == "llc"
+
+
+def test_aliases_round_trip(tmp_path):
+    path = str(tmp_path / "aliases.csv")
+    resolver = CompanyResolver()
+    slugs = pd.Series(["stripe", "stripe-inc", "apex-group", "apex-technologies"])
+    resolved = resolver.resolve_column(slugs)
+    resolver.save(path)
+
+    reloaded = CompanyResolver.load(path)
+    assert reloaded.merged() == {"stripeinc": "stripe"}
+    assert reloaded.resolve_column(slugs).equals(resolved)
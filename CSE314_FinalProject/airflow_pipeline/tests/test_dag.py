@@ -0,0 +1,107 @@
+import inspect
+
+import pytest
+
+import scripts.scrape_clean_upload as pipeline
+from benchmarks.synthetic import raw_companies, raw_internships, raw_simplify
+from scripts.scrape_manifest import load_manifest, manifest_path
+from utils.handoff import read_table
+
+ROWS, COMPANIES = 400, 50
+
+
+class _NoCache:
+    def report(self):
+        pass
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def offline(monkeypatch):
+    # listings and profiles from benchmarks.synthetic instead of the network
+    listings = raw_internships(ROWS, COMPANIES)
+    levels = raw_companies(COMPANIES).set_index("company_slug", drop=False)
+    simplify = raw_simplify(COMPANIES).set_index("company_name", drop=False)
+
+    def fetch_company_profiles(slugs, names, cache=None, **kwargs):
+        return [levels.loc[s].to_dict() for s in slugs], [simplify.loc[n].to_dict() for n in names]
+
+    monkeypatch.setattr(pipeline, "scrape_internships", lambda harvest=False: listings.copy())
+    monkeypatch.setattr(pipeline, "fetch_company_profiles", fetch_company_profiles)
+    monkeypatch.setattr(pipeline, "HttpCache", _NoCache)
+
+
+def test_fanout_tasks_write_the_same_exports_as_clean_data(offline, tmp_path):
+    sequential, fanout = str(tmp_path / "sequential"), str(tmp_path / "fanout")
+    (tmp_path / "sequential").mkdir()
+    (tmp_path / "fanout").mkdir()
+
+    pipeline.scrape_data(directory=sequential)
+    pipeline.clean_data(directory=sequential)
+
+    # the DAG's order; every mapped fetch gets the kwargs scrape_listings returned
+    shards = pipeline.scrape_listings(shards=3, directory=fanout)
+    assert {kw["source"] for kw in shards} == set(pipeline.PROFILE_SOURCES)
+    for kwargs in shards:
+        inspect.signature(pipeline.fetch_profile_shard).bind(**kwargs)
+        pipeline.fetch_profile_shard(**kwargs, directory=fanout)
+    pipeline.collect_profiles(directory=fanout)
+    pipeline.build_company_tables(directory=fanout)
+    pipeline.clean_listings(directory=fanout)
+    pipeline.build_internship_tables(directory=fanout)
+
+    for name, _ in pipeline.EXPORT_TABLES:
+        assert read_table(name, directory=fanout).equals(read_table(name, directory=sequential)), name
+
+
+def test_incremental_runs_keep_the_manifest_in_their_directory(offline, monkeypatch, tmp_path):
+    fetched = []
+    fetch = pipeline.fetch_company_profiles
+
+    def counting_fetch(slugs, names, **kwargs):
+        fetched.extend([*slugs, *names])
+        return fetch(slugs, names, **kwargs)
+
+    monkeypatch.setattr(pipeline, "fetch_company_profiles", counting_fetch)
+    sequential, fanout = str(tmp_path / "sequential"), str(tmp_path / "fanout")
+    (tmp_path / "sequential").mkdir()
+    (tmp_path / "fanout").mkdir()
+
+    pipeline.scrape_data(incremental=True, directory=sequential)
+    assert len(load_manifest(manifest_path(sequential))["levels"]) == COMPANIES
+
+    # a fresh directory has no manifest yet, so its first run fetches everything
+    fetched.clear()
+    for kwargs in pipeline.scrape_listings(incremental=True, shards=2, directory=fanout):
+        pipeline.fetch_profile_shard(**kwargs, directory=fanout)
+    pipeline.collect_profiles(incremental=True, directory=fanout)
+    assert len(fetched) == 2 * COMPANIES
+
+    fetched.clear()
+    pipeline.scrape_data(incremental=True, directory=sequential)
+    for kwargs in pipeline.scrape_listings(incremental=True, shards=2, directory=fanout):
+        pipeline.fetch_profile_shard(**kwargs, directory=fanout)
+    assert fetched == []
+
+
+def test_dag_structure():
+    pytest.importorskip("airflow")
+    from scrape_clean_upload_dag import dag
+
+    upstream = {task_id: set(task.upstream_task_ids) for task_id, task in dag.task_dict.items()}
+    assert upstream == {
+        "scrape_listings": set(),
+        "fetch_profile_shard": {"scrape_listings"},
+        "collect_profiles": {"fetch_profile_shard"},
+        "build_company_tables": {"collect_profiles"},
+        "clean_listings": {"scrape_listings"},
+        "build_internship_tables": {"build_company_tables", "clean_listings"},
+        "upload_company_tables": {"build_company_tables"},
+        "upload_internship_tables": {"build_internship_tables"},
+    }
+
+    from airflow.models.mappedoperator import MappedOperator
+    mapped = {task_id for task_id, task in dag.task_dict.items() if isinstance(task, MappedOperator)}
+    assert mapped == {"fetch_profile_shard", "upload_company_tables", "upload_internship_tables"}
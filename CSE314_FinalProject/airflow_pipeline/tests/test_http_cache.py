@@ -0,0 +1,44 @@
+import os
+import sqlite3
+
+from utils.http_cache import HttpCache
+
+URL = "https://www.levels.fyi/companies/stripe"
+
+
+def test_hits_do_not_wait_on_another_writer(tmp_path):
+    cache = HttpCache(root=str(tmp_path))
+    cache.store(URL, "<html>stripe</html>", {})
+
+    # another shard's process in the middle of a write
+    other = sqlite3.connect(os.path.join(tmp_path, "index.db"))
+    other.execute("BEGIN IMMEDIATE")
+    try:
+        assert cache.get(URL) == "<html>stripe</html>"
+    finally:
+        other.rollback()
+        other.close()
+    assert cache.stats["hits"] == 1
+    cache.close()
+
+
+def test_access_times_are_written_at_close(tmp_path):
+    cache = HttpCache(root=str(tmp_path))
+    cache.store(URL, "<html>stripe</html>", {})
+    stored = cache.conn.execute("SELECT last_access FROM entries").fetchone()[0]
+    cache.get(URL)
+    cache.close()
+
+    reopened = HttpCache(root=str(tmp_path))
+    assert reopened.conn.execute("SELECT last_access FROM entries").fetchone()[0] > stored
+    reopened.close()
+
+
+def test_two_caches_share_a_directory(tmp_path):
+    first, second = HttpCache(root=str(tmp_path)), HttpCache(root=str(tmp_path))
+    first.store(URL, "<html>stripe</html>", {})
+    assert second.get(URL) == "<html>stripe</html>"
+    second.store(URL + "/salaries", "<html>salaries</html>", {})
+    assert first.get(URL + "/salaries") == "<html>salaries</html>"
+    first.close()
+    second.close()
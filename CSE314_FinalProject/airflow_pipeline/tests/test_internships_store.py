@@ -0,0 +1,67 @@
+import sqlite3
+
+import pandas as pd
+import pytest
+
+from scripts.internships_store import load_internships, recent, search, top_counts
+
+ROWS = pd.DataFrame({
+    "Title": ["Software Engineering Intern", "Data Science Intern", "Marketing Intern", "ML Intern", None],
+    "Company": ["Acme", "Globex", "Acme", "Initech", "Acme"],
+    "Location": ["Austin", "NYC", "Austin", "SF", "NYC"],
+    "Created": ["2025-06-01", "2025-05-20", "2025-04-01", "2025-06-10", "2025-06-05"],
+    "Description": ["Python and SQL", "pandas, SQL", "social media", "PyTorch models", "Summer role in PYTHON"],
+})
+
+
+@pytest.fixture
+def conn(tmp_path):
+    path = str(tmp_path / "internships.db")
+    load_internships(ROWS, path)
+    conn = sqlite3.connect(path)
+    yield conn
+    conn.close()
+
+
+def like_titles(conn, terms, fields=("Title", "Description")):
+    # the unindexed query search() stands in for
+    where = " OR ".join(f'LOWER("{f}") LIKE ?' for f in fields for _ in terms)
+    params = [f"%{t.lower()}%" for f in fields for t in terms]
+    return pd.read_sql_query(f'SELECT * FROM "internships" WHERE {where} ORDER BY rowid', conn, params=params)
+
+
+@pytest.mark.parametrize("terms", ["python", "PYTHON", ["sql", "torch"], "intern", "ml", ["ml", "scien"], "nothing"])
+def test_search_matches_like(conn, terms):
+    terms_list = [terms] if isinstance(terms, str) else terms
+    pd.testing.assert_frame_equal(search(conn, terms), like_titles(conn, terms_list))
+
+
+def test_search_uses_the_trigram_index(conn):
+    plan = conn.execute(
+        "EXPLAIN QUERY PLAN SELECT rowid FROM internships_fts WHERE internships_fts MATCH ?", ('"python"',)
+    ).fetchall()
+    assert any("VIRTUAL TABLE" in row[-1] for row in plan)
+
+
+def test_index_follows_inserts_updates_and_deletes(conn):
+    conn.execute("INSERT INTO internships (Title, Company) VALUES ('Rust Intern', 'Hooli')")
+    conn.execute("UPDATE internships SET Description = 'kotlin' WHERE Company = 'Globex'")
+    conn.execute("DELETE FROM internships WHERE Title = 'Marketing Intern'")
+    conn.commit()
+    assert search(conn, "rust", columns=["Company"])["Company"].tolist() == ["Hooli"]
+    assert search(conn, "kotlin", columns=["Company"])["Company"].tolist() == ["Globex"]
+    assert search(conn, "pandas").empty
+    assert search(conn, "social").empty
+
+
+def test_search_fields_columns_and_limit(conn):
+    assert search(conn, "python", fields=["Title"]).empty
+    out = search(conn, "intern", columns=["Title"], limit=2)
+    assert out["Title"].tolist() == ["Software Engineering Intern", "Data Science Intern"]
+
+
+def test_recent_and_top_counts(conn):
+    latest = recent(conn, days=10, now="2025-06-10")
+    assert latest["Title"].tolist() == ["ML Intern", None, "Software Engineering Intern"]
+    assert recent(conn, days=10, limit=1, now="2025-06-10")["Title"].tolist() == ["ML Intern"]
+    assert top_counts(conn, "Company", limit=1).values.tolist() == [["Acme", 3]]
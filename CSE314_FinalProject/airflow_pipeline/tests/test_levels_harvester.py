@@ -0,0 +1,34 @@
+from benchmarks.bench_harvest import VirtualTableDriver, fixture_rows
+from scripts.html_parsers import parse_internship_rows
+from scripts.levels_harvester import PROGRESS_SCRIPT, harvest_internship_rows, wait_for_rows
+
+ROWS = 300
+
+
+class NoBottomDriver(VirtualTableDriver):
+    """A page whose scroll container the harvester can't find the bottom of."""
+
+    def execute_script(self, script, *args):
+        if script == PROGRESS_SCRIPT:
+            return [super().execute_script(script)[0], False]
+        return super().execute_script(script, *args)
+
+
+def harvest(driver_class, settle_timeout):
+    rows = fixture_rows(ROWS)
+    driver = driver_class(rows, window=40, render_delay=0.01, load_delay=0)
+    wait_for_rows(driver)
+    harvested, stats = harvest_internship_rows(driver, settle_timeout=settle_timeout, poll=0.01)
+    assert harvested == parse_internship_rows("<table><tbody>" + "".join(rows) + "</tbody></table>")
+    assert stats["completeness"] == 1.0
+    return stats
+
+
+def test_stops_at_the_bottom_without_waiting_out_the_settle_timeout():
+    stats = harvest(VirtualTableDriver, settle_timeout=5)
+    assert stats["seconds"] < 2
+
+
+def test_falls_back_to_patience_when_the_bottom_is_unknown():
+    stats = harvest(NoBottomDriver, settle_timeout=0.2)
+    assert stats["seconds"] >= 0.4
@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+
+from scripts.near_duplicates import NearDuplicateIndex, cluster_postings, drop_near_duplicates, posting_tokens
+
+DESCRIPTION = (
+    "Join our platform team to build data pipelines in Python and SQL, ship features to millions "
+    "of users, and work with mentors on scalable distributed systems all summer long"
+)
+
+
+def postings():
+    return pd.DataFrame({
+        "Title": ["Data Engineering Intern", "Data Engineering Intern", "Marketing Intern", np.nan, "Sales Intern"],
+        "Description": [
+            f"<p>{DESCRIPTION}</p>",
+            f"{DESCRIPTION} today",
+            "Plan campaigns, write copy and run social media for a consumer brand in New York",
+            "Help the finance team close the books",
+            np.nan,
+        ],
+    })
+
+
+def test_posting_tokens_treats_missing_as_empty():
+    assert posting_tokens(np.nan, None) == []
+    assert posting_tokens("Data Intern", float("nan")) == ["data", "intern"]
+    assert posting_tokens(None, "<b>Python</b> SQL") == ["python", "sql"]
+
+
+def test_cluster_postings_groups_near_duplicates():
+    clustered = cluster_postings(postings())
+    assert clustered["cluster_id"].tolist() == [0, 0, 2, 3, 4]
+    assert len(drop_near_duplicates(postings())) == 4
+
+
+def test_cluster_postings_does_not_depend_on_batch_size():
+    df = pd.concat([postings()] * 20, ignore_index=True)
+    one_batch = cluster_postings(df)["cluster_id"].to_numpy()
+    for batch_size in (1, 3, 7):
+        np.testing.assert_array_equal(cluster_postings(df, batch_size=batch_size)["cluster_id"].to_numpy(), one_batch)
+
+
+def test_index_save_load_matches_against_earlier_postings(tmp_path):
+    index = NearDuplicateIndex()
+    cluster_postings(postings(), index=index)
+    path = tmp_path / "index.npz"
+    index.save(path)
+
+    loaded = NearDuplicateIndex.load(path)
+    again = cluster_postings(postings().iloc[[1]], index=loaded)
+    assert again["cluster_id"].tolist() == [0]
+    assert len(loaded) == len(postings()) + 1
@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from scripts.parse_amounts import (
+    fix_size_encoding,
+    parse_amount,
+    parse_amount_range,
+    parse_headcount,
+)
+
+
+@pytest.mark.parametrize("text, amount", [
+    ("45", 45.0),
+    ("$45", 45.0),
+    ("$7,800", 7800.0),
+    ("22.50", 22.5),
+    ("$40/hr", 40.0),
+    ("$40 - $50/hr", 45.0),
+    ("$1.2B", 1.2e9),
+    ("$300m", 300e6),
+    ("$1-5M", 3e6),
+    ("$10M+", 10e6),
+    ("€2K", 2000.0),
+    # what pd.to_numeric parsed still parses the same
+    ("-5", -5.0),
+    ("+3", 3.0),
+    ("1e3", 1000.0),
+    ("1.5E-2", 0.015),
+])
+def test_parse_amount(text, amount):
+    assert parse_amount(pd.Series([text]))[0] == amount
+
+
+@pytest.mark.parametrize("text", ["", "n/a", "Undisclosed", "$", "1-2-3", "1e", "Jan-00"])
+def test_parse_amount_unparsable_is_nan(text):
+    assert np.isnan(parse_amount(pd.Series([text]))[0])
+
+
+def test_parse_amount_keeps_index_and_missing_values():
+    values = pd.Series(["$1K", None, np.nan, "$1K"], index=[5, 6, 7, 8], dtype=object)
+    out = parse_amount(values)
+    assert out.index.equals(values.index)
+    assert out.tolist()[0] == out.tolist()[3] == 1000.0
+    assert out.isna().tolist() == [False, True, True, False]
+
+
+def test_parse_amount_categorical_matches_object():
+    values = pd.Series(["$45", "$1.2B", None, "$45", "junk"], dtype=object)
+    pd.testing.assert_series_equal(parse_amount(values.astype("category")), parse_amount(values))
+
+
+def test_parse_amount_matches_to_numeric_wherever_it_parses():
+    rng = np.random.default_rng(0)
+    numbers = rng.uniform(-1e5, 1e5, 1000).round(2)
+    values = pd.Series(
+        np.r_[numbers.astype(str), np.char.mod("%.3e", numbers), ["1-2", "abc", "", "12"]], dtype=object
+    )
+    expected = pd.to_numeric(values, errors="coerce")
+    parsed = expected.notna()
+    pd.testing.assert_series_equal(parse_amount(values)[parsed], expected[parsed], check_names=False)
+
+
+def test_parse_amount_range():
+    out = parse_amount_range(pd.Series(["$40 - $50/hr", "$10M+", "$7,800"]))
+    assert out["low"].tolist() == [40.0, 10e6, 7800.0]
+    assert out["high"].tolist()[0] == 50.0 and np.isnan(out["high"][1]) and out["high"][2] == 7800.0
+
+
+def test_fix_size_encoding():
+    values = pd.Series(["10-Jan", "Nov-50", "51-200", "1-10", None, "10,001+"], dtype=object)
+    assert fix_size_encoding(values).tolist() == ["1-10", "11-50", "51-200", "1-10", None, "10,001+"]
+
+
+def test_fix_size_encoding_leaves_dates_that_are_not_buckets():
+    # low end not below the high end, or a four-digit year
+    values = pd.Series(["Jan-00", "1-Jan", "Dec-2020"], dtype=object)
+    assert fix_size_encoding(values).tolist() == ["Jan-00", "1-Jan", "Dec-2020"]
+    assert parse_headcount(values).isna().all()
+
+
+@pytest.mark.parametrize("text, count", [
+    ("5000", 5000), ("1-10", 1), ("10-Jan", 1), ("Nov-50", 11), ("1,001-5,000", 1001), ("10,001+", 10001),
+])
+def test_parse_headcount(text, count):
+    assert parse_headcount(pd.Series([text]))[0] == count
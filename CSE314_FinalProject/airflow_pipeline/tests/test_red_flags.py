@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.bench_red_flags import stand_in
+from benchmarks.local_server import LocalServer
+from scripts.red_flags import (
+    RedFlagCache,
+    add_red_flag_columns,
+    pack_batches,
+    parse_reply,
+    score_texts,
+    text_hash,
+)
+
+
+@pytest.mark.parametrize("raw, expected", [
+    ('{"1": {"long hours": 3}, "2": {}}', [{"long hours": 3}, {}]),
+    ('```json\n{"1": {"layoffs": 5}, "2": {"unpaid": 4.5}}\n```', [{"layoffs": 5}, {"unpaid": 4.5}]),
+    # left-out, garbled and non-numeric entries
+    ('{"1": {"layoffs": "high", "unpaid": true, "long hours": 2}}', [{"long hours": 2}, None]),
+    ('{"1": ["layoffs"], "2": {"unpaid": 5}}', [None, {"unpaid": 5}]),
+    ("not json", [None, None]),
+    ('["a list"]', [None, None]),
+])
+def test_parse_reply(raw, expected):
+    assert parse_reply(raw, 2) == expected
+
+
+def test_pack_batches_caps_texts_and_characters():
+    texts = ["a" * 40, "b" * 40, "c" * 40, "d", "e", "f", "g"]
+    batches = list(pack_batches(texts, per_request=3, max_chars=100))
+    assert batches == [["a" * 40, "b" * 40], ["c" * 40, "d", "e"], ["f", "g"]]
+    # one text longer than max_chars still goes out, on its own
+    assert list(pack_batches(["x" * 200, "y"], max_chars=100)) == [["x" * 200], ["y"]]
+
+
+def test_text_hash_ignores_surrounding_whitespace_but_not_model():
+    assert text_hash(" layoffs \n") == text_hash("layoffs")
+    assert text_hash("layoffs", model="other") != text_hash("layoffs")
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = RedFlagCache(str(tmp_path / "red_flags.db"))
+    yield cache
+    cache.close()
+
+
+def test_score_texts_sends_only_uncached_distinct_texts(cache):
+    texts = ["Long hours here.", "Layoffs and unpaid.", "Long hours here.", "", None, "Nice team."]
+    with LocalServer(latency=0, post=stand_in(0)) as server:
+        url = server.url + "/v1/chat/completions"
+        flags, stats = score_texts(texts, cache, url=url, api_key="x", per_request=2, rate_limit=0)
+        assert flags == {"Long hours here.": {"long hours": 3}, "Layoffs and unpaid.": {"layoffs": 5, "unpaid": 5},
+                         "Nice team.": {}}
+        assert stats == {"texts": 3, "cached": 0, "requests": 2, "failed": 0}
+
+        again, stats = score_texts(texts + ["Unpaid."], cache, url=url, api_key="x", rate_limit=0)
+        assert stats == {"texts": 4, "cached": 3, "requests": 1, "failed": 0}
+        assert again["Unpaid."] == {"unpaid": 5}
+    assert server.requests == 3
+
+
+def test_failed_texts_are_not_cached(cache):
+    with LocalServer(latency=0, post=lambda path, body: (400, "{}")) as server:
+        flags, stats = score_texts(["Layoffs."], cache, url=server.url, api_key="x", rate_limit=0)
+    assert flags == {"Layoffs.": {}}
+    assert stats["failed"] == 1
+    assert cache.get_many([text_hash("Layoffs.")]) == {}
+
+
+def test_add_red_flag_columns(tmp_path):
+    df = pd.DataFrame({
+        "company_name": ["A", "B", "C"],
+        "description": ["Long hours.", None, "Long hours."],
+        "overview": ["Layoffs.", "Nice team.", np.nan],
+    })
+    with LocalServer(latency=0, post=stand_in(0)) as server:
+        out, stats = add_red_flag_columns(df, cache_path=str(tmp_path / "cache.db"), url=server.url,
+                                          api_key="x", rate_limit=0)
+    assert stats["texts"] == 3
+    assert out["description_red_flags_with_weights"].tolist() == [{"long hours": 3}, {}, {"long hours": 3}]
+    assert out["overview_red_flags_with_weights"].tolist() == [{"layoffs": 5}, {}, {}]
+    assert out["red_flag_score"].tolist() == [8.0, 0.0, 3.0]
+    assert "believer_points_red_flags_with_weights" not in out
@@ -0,0 +1,24 @@
+from benchmarks.local_server import LocalServer
+from scripts.scrape_jobs import empty_company_info, fetch_company_profiles
+
+
+def test_profiles_queued_for_a_slot_do_not_time_out():
+    # 40 pages through 2 slots at 0.1s each take ~2s, far past the 0.5s
+    # timeout, but no single request comes close to it
+    slugs = [f"company-{i}" for i in range(40)]
+    with LocalServer(latency=0.1) as server:
+        companies, profiles = fetch_company_profiles(
+            slugs, [], max_per_host=2, levels_url=server.url + "/companies/{slug}/", timeout=0.5
+        )
+    assert profiles == []
+    assert [c["company_slug"] for c in companies] == slugs
+    assert not [c for c in companies if c == empty_company_info(c["company_slug"])]
+    assert server.requests == len(slugs)
+
+
+def test_slow_profile_times_out_to_empty_row():
+    with LocalServer(latency=0.5) as server:
+        companies, _ = fetch_company_profiles(
+            ["slow"], [], levels_url=server.url + "/companies/{slug}/", timeout=0.1
+        )
+    assert companies == [empty_company_info("slow")]
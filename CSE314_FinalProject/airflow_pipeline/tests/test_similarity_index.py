@@ -0,0 +1,90 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.bench_near_duplicates import synthetic_postings
+from scripts.similarity_index import SimilarityIndex, posting_texts
+
+ROWS, ADDED = 400, 60
+
+
+@pytest.fixture(scope="module")
+def texts():
+    titles, descriptions, _ = synthetic_postings(ROWS + ADDED)
+    return [f"{t} {d}" for t, d in zip(titles, descriptions)]
+
+
+def mapped(array):
+    # scipy keeps views of the loaded arrays; what matters is they're backed by the file
+    while isinstance(array, np.ndarray):
+        if isinstance(array, np.memmap):
+            return True
+        array = array.base
+    return False
+
+
+def matrices_mapped(index):
+    return [mapped(getattr(m, part)) for m in (index.rows, index.inverted) for part in ("data", "indices", "indptr")]
+
+
+def assert_same_results(left, right):
+    assert len(left) == len(right)
+    for a, b in zip(left, right):
+        assert a["id"].tolist() == b["id"].tolist()
+        np.testing.assert_allclose(a["score"].to_numpy(float), b["score"].to_numpy(float), rtol=1e-6)
+
+
+@pytest.mark.parametrize("ids", [None, "urls"])
+def test_saved_index_memory_maps_and_answers_the_same(texts, tmp_path, ids):
+    all_ids = [f"https://jobs/{i}" for i in range(ROWS + ADDED)] if ids else list(range(ROWS + ADDED))
+    index = SimilarityIndex().fit(texts[:ROWS], all_ids[:ROWS])
+    index.add(texts[ROWS:ROWS + 5], all_ids[ROWS:ROWS + 5])  # still in the delta block
+    assert index.delta is not None
+    probes = [all_ids[0], all_ids[17], all_ids[ROWS + 2]]
+    before = index.similar_to(probes), index.query(texts[3:6])
+
+    index.save(str(tmp_path))
+    loaded = SimilarityIndex.load(str(tmp_path))
+    assert all(matrices_mapped(loaded))
+    assert not any(matrices_mapped(SimilarityIndex.load(str(tmp_path), mmap=False)))
+    assert loaded.ids.tolist() == all_ids[:ROWS + 5]
+    assert_same_results(loaded.similar_to(probes), before[0])
+    assert_same_results(loaded.query(texts[3:6]), before[1])
+
+    # a loaded index keeps taking postings without a refit
+    loaded.add(texts[ROWS + 5:], all_ids[ROWS + 5:])
+    assert len(loaded) == ROWS + ADDED
+    assert loaded.similar_to(all_ids[-1], k=3)["id"].isin(all_ids).all()
+
+
+def test_add_matches_fit_on_the_same_vocabulary(texts):
+    index = SimilarityIndex().fit(texts[:ROWS])
+    index.add(texts[ROWS:])
+    refit = SimilarityIndex().fit(texts[:ROWS])
+    refit.rows = refit.vectorizer.transform(texts).tocsr()
+    refit.inverted = refit.rows.T.tocsr()
+    refit.ids = np.arange(ROWS + ADDED).astype(object)
+    assert_same_results(index.similar_to([1, ROWS + 1]), refit.similar_to([1, ROWS + 1]))
+
+
+def test_similar_to_excludes_the_posting_itself(texts):
+    index = SimilarityIndex().fit(texts[:ROWS])
+    result = index.similar_to(5, k=4)
+    assert len(result) == 4 and 5 not in result["id"].tolist()
+    assert result["score"].is_monotonic_decreasing
+
+
+def test_posting_texts_joins_company_description():
+    df = pd.DataFrame({"Title": ["Intern"], "Description": ["<b>Build</b>  things"], "Company": [" Acme "]})
+    companies = pd.DataFrame({"company_name": ["ACME"], "description": ["Rockets"]})
+    assert posting_texts(df, companies) == ["Intern Build things Rockets"]
+
+
+@pytest.mark.parametrize("call", [
+    lambda index: index.add(["a posting"]),
+    lambda index: index.query("a posting"),
+    lambda index: index.similar_to(0),
+])
+def test_unfitted_index_raises_clear_error(call):
+    with pytest.raises(RuntimeError, match="call fit"):
+        call(SimilarityIndex())
@@ -0,0 +1,89 @@
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import raw_companies, raw_internships, raw_simplify
+from scripts.scrape_clean_upload import EXPORT_TABLES, clean_data
+from utils.handoff import read_table, write_table
+from utils.snowflake_utils import ROW_HASH, SQLiteSink, bulk_load, upsert_dataframe, with_row_hash
+
+KEYS = ["title", "location", "apply_link"]
+
+
+@pytest.fixture
+def sink():
+    sink = SQLiteSink()
+    yield sink
+    sink.close()
+
+
+def table(sink, name):
+    return pd.read_sql_query(f'SELECT * FROM "{name}"', sink.conn)
+
+
+def listings(*rows):
+    return pd.DataFrame(rows, columns=KEYS + ["hourly_rate"])
+
+
+def test_upsert_loads_only_new_and_changed_rows(sink):
+    first = listings(("SWE", "NYC", "a", 40.0), ("SWE", "SF", "b", 50.0))
+    assert upsert_dataframe(first, "T", KEYS, sink) == 2
+    assert upsert_dataframe(first, "T", KEYS, sink) == 0
+
+    second = listings(("SWE", "NYC", "a", 45.0), ("SWE", "SF", "b", 50.0), ("PM", "LA", "c", 30.0))
+    assert upsert_dataframe(second, "T", KEYS, sink) == 2
+    loaded = table(sink, "T").drop(columns=[ROW_HASH]).sort_values(KEYS).reset_index(drop=True)
+    pd.testing.assert_frame_equal(loaded, second.sort_values(KEYS).reset_index(drop=True))
+
+
+def test_existing_hashes_only_returns_incoming_matches(sink):
+    loaded = listings(("SWE", "NYC", "a", 40.0), ("SWE", "SF", "b", 50.0), ("PM", "LA", "c", 30.0))
+    upsert_dataframe(loaded, "T", KEYS, sink)
+
+    incoming = with_row_hash(listings(("SWE", "NYC", "a", 40.0), ("SWE", "SF", "b", 55.0)))
+    assert sink.existing_hashes("T", incoming[ROW_HASH]) == [incoming[ROW_HASH].iloc[0]]
+    assert sink.existing_hashes("MISSING", incoming[ROW_HASH]) is None
+    # the staged hashes don't outlive the lookup
+    names = {row[0] for row in sink.conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    assert names == {"T"}
+
+
+def test_upsert_replaces_table_loaded_in_append_mode(sink):
+    first = listings(("SWE", "NYC", "a", 40.0))
+    sink.write(first, "T")
+    # no row_hash column yet: reloaded whole rather than appended to
+    assert upsert_dataframe(first, "T", KEYS, sink) == 1
+    assert len(table(sink, "T")) == 1
+    assert upsert_dataframe(first, "T", KEYS, sink) == 0
+
+
+def run_clean_data(directory, interns):
+    directory.mkdir()
+    write_table(interns, "internships_raw", str(directory))
+    write_table(raw_companies(50), "companies_raw", str(directory))
+    write_table(raw_simplify(50), "simplify_raw", str(directory))
+    clean_data(str(directory))
+    return [(read_table(name, directory=str(directory)), table_name) for name, table_name in EXPORT_TABLES]
+
+
+def internship_locations(frames):
+    # (title, apply_link, city) for every listing, joined through the bridge table
+    internships, locations, bridge = (
+        frames["TEST2_INTERNSHIPS"], frames["TEST2_LOCATIONS"], frames["TEST2_INTERNSHIP_LOCATIONS"]
+    )
+    joined = internships.merge(bridge, on="internship_id").merge(locations, on="location_id")
+    return sorted(map(tuple, joined[["title", "apply_link", "city"]].astype(object).to_numpy().tolist()))
+
+
+def test_upserted_bridge_tables_follow_new_listings(sink, tmp_path):
+    interns = raw_internships(300)
+    bulk_load(run_clean_data(tmp_path / "first", interns), sink, upsert=True)
+
+    # a listing that sorts first used to shift every internship id after it
+    extra = interns.iloc[[0]].assign(title="AAA Intern", location="Zzz, NY", apply_link="https://new")
+    latest = run_clean_data(tmp_path / "second", pd.concat([extra, interns], ignore_index=True))
+    bulk_load(latest, sink, upsert=True)
+
+    loaded = {name: table(sink, name) for _, name in latest}
+    expected = {name: df for df, name in latest}
+    assert len(loaded["TEST2_INTERNSHIP_LOCATIONS"]) == len(expected["TEST2_INTERNSHIP_LOCATIONS"])
+    assert internship_locations(loaded) == internship_locations(expected)
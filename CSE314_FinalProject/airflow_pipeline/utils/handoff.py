@@ -0,0 +1,85 @@
+import os
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+from utils.metrics import count, timer
+from utils.schemas import TABLES, arrow_schema, encode_categories
+
+# every DAG task reads and writes here, so with workers on more than one
+# machine point PIPELINE_HANDOFF_DIR at storage they all mount
+HANDOFF_DIR = os.environ.get("PIPELINE_HANDOFF_DIR", "/tmp")
+
+# Arrow IPC (Feather v2) files are what the DAG tasks hand each other instead
+# of CSVs: dtypes survive the round trip, readers can pick columns, and files
+# are opened memory-mapped. lz4 keeps them well under the CSV size while
+# costing little on read; pass compression="uncompressed" for zero-copy reads.
+
+# column types live in utils.schemas; every registered table can be handed off
+SCHEMAS = {name: arrow_schema(name) for name in TABLES}
+
+
+def handoff_path(name, directory=HANDOFF_DIR):
+    return os.path.join(directory, f"{name}.arrow")
+
+
+def _coerce(df, schema):
+    # line pandas columns up with the schema so from_pandas never has to guess.
+    # empty strings become nulls, which is what the old CSV round trip did
+    out = {}
+    for field in schema:
+        col = df[field.name] if field.name in df.columns else pd.Series(None, index=df.index, dtype=object)
+        if pa.types.is_string(field.type):
+            col = col.astype("string").replace("", pd.NA)
+        elif pa.types.is_integer(field.type):
+            col = pd.to_numeric(col, errors="coerce").astype("Int64")
+        elif pa.types.is_floating(field.type):
+            col = pd.to_numeric(col, errors="coerce").astype("float64")
+        elif pa.types.is_boolean(field.type):
+            col = col.astype("boolean")
+        out[field.name] = col
+    return pd.DataFrame(out, index=df.index)
+
+
+def _to_pandas(table):
+    return table.to_pandas(types_mapper={pa.int64(): pd.Int64Dtype()}.get)
+
+
+def conform(df, name):
+    """
+    `df` with the columns and types table `name` has after a write_table /
+    read_table round trip, for loading a frame that never went through a
+    handoff file exactly like one that did.
+    """
+    schema = SCHEMAS[name]
+    table = pa.Table.from_pandas(_coerce(df, schema), schema=schema, preserve_index=False)
+    return _to_pandas(encode_categories(table, name))
+
+
+def write_table(df, name, directory=HANDOFF_DIR, compression="lz4"):
+    schema = SCHEMAS[name]
+    with timer("handoff_write_seconds", table=name):
+        table = pa.Table.from_pandas(_coerce(df, schema), schema=schema, preserve_index=False)
+        path = handoff_path(name, directory)
+        tmp = f"{path}.tmp"
+        feather.write_feather(table, tmp, compression=compression)
+        os.replace(tmp, path)
+    count("handoff_rows_total", table.num_rows, table=name)
+    count("handoff_bytes_total", os.path.getsize(path), table=name)
+    return path
+
+
+def read_arrow(name, columns=None, memory_map=True, directory=HANDOFF_DIR):
+    return feather.read_table(handoff_path(name, directory), columns=columns, memory_map=memory_map)
+
+
+def read_table(name, columns=None, memory_map=True, directory=HANDOFF_DIR):
+    """
+    Loads a handoff table as a DataFrame. Integer columns come back as
+    nullable Int64 so ids with gaps stay integers, and the registry's
+    CATEGORY columns as Categoricals.
+    """
+    with timer("handoff_read_seconds", table=name):
+        table = encode_categories(read_arrow(name, columns=columns, memory_map=memory_map, directory=directory), name)
+        return _to_pandas(table)
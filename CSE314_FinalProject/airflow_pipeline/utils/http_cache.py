@@ -0,0 +1,232 @@
+import hashlib
+import os
+import sqlite3
+import time
+
+import requests
+
+from utils.metrics import count
+
+CACHE_DIR = "/tmp/http_cache"
+DEFAULT_TTL = 24 * 60 * 60          # seconds a page is served without asking upstream
+DEFAULT_MAX_BYTES = 256 * 1024 ** 2  # total size of stored bodies before LRU eviction
+BUSY_TIMEOUT = 30                    # seconds to wait on another process's write lock
+
+
+class HttpCache:
+    """
+    Persistent response cache for profile pages.
+
+    Bodies are stored once per content hash under `root/bodies/`, and an
+    SQLite index maps each URL to its body hash, validators (ETag /
+    Last-Modified) and fetch/access times. Within `ttl` a URL is served
+    locally; after that it is revalidated with a conditional GET and a 304
+    just refreshes the entry. When stored bodies exceed `max_bytes` the
+    least recently used URLs are dropped.
+
+    Several processes can share one cache directory (the DAG's profile
+    shards do), each with its own HttpCache: a cache hit doesn't write
+    (access times are kept in memory and written with the next store or
+    at close) and writers wait up to BUSY_TIMEOUT for each other.
+    """
+
+    def __init__(self, root=CACHE_DIR, ttl=DEFAULT_TTL, max_bytes=DEFAULT_MAX_BYTES):
+        self.root = root
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.stats = {"hits": 0, "revalidated": 0, "misses": 0}
+        self.accessed = {}  # url -> last access not yet written to the index
+
+        os.makedirs(os.path.join(root, "bodies"), exist_ok=True)
+        self.conn = sqlite3.connect(os.path.join(root, "index.db"), timeout=BUSY_TIMEOUT)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS entries (
+                url           TEXT PRIMARY KEY,
+                body_hash     TEXT NOT NULL,
+                etag          TEXT,
+                last_modified TEXT,
+                fetched_at    REAL NOT NULL,
+                last_access   REAL NOT NULL
+            )
+        """)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS bodies (
+                body_hash TEXT PRIMARY KEY,
+                size      INTEGER NOT NULL
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS entries_lru ON entries (last_access)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS entries_body ON entries (body_hash)")
+        self.conn.commit()
+
+    def _body_path(self, body_hash):
+        return os.path.join(self.root, "bodies", body_hash[:2], body_hash)
+
+    def lookup(self, url):
+        row = self.conn.execute(
+            "SELECT body_hash, etag, last_modified, fetched_at FROM entries WHERE url = ?",
+            (url,)
+        ).fetchone()
+        if row is None:
+            return None
+        body_hash, etag, last_modified, fetched_at = row
+        if not os.path.exists(self._body_path(body_hash)):
+            return None
+        return {
+            "body_hash": body_hash,
+            "etag": etag,
+            "last_modified": last_modified,
+            "fetched_at": fetched_at,
+        }
+
+    def is_fresh(self, entry):
+        return time.time() - entry["fetched_at"] < self.ttl
+
+    def conditional_headers(self, entry):
+        headers = {}
+        if entry and entry["etag"]:
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry["last_modified"]:
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def read(self, url, entry):
+        self.accessed[url] = time.time()
+        with open(self._body_path(entry["body_hash"]), encoding="utf-8") as f:
+            return f.read()
+
+    def refresh(self, url, entry, headers):
+        # 304: body is unchanged, only the validators and timestamps move
+        now = time.time()
+        self.conn.execute(
+            "UPDATE entries SET etag = ?, last_modified = ?, fetched_at = ?, last_access = ? WHERE url = ?",
+            (headers.get("ETag", entry["etag"]),
+             headers.get("Last-Modified", entry["last_modified"]),
+             now, now, url)
+        )
+        self.conn.commit()
+
+    def store(self, url, text, headers):
+        data = text.encode("utf-8")
+        body_hash = hashlib.sha256(data).hexdigest()
+        path = self._body_path(body_hash)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+
+        old = self.conn.execute("SELECT body_hash FROM entries WHERE url = ?", (url,)).fetchone()
+        now = time.time()
+        self.conn.execute(
+            "INSERT OR IGNORE INTO bodies (body_hash, size) VALUES (?, ?)",
+            (body_hash, len(data))
+        )
+        self.conn.execute(
+            "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?)",
+            (url, body_hash, headers.get("ETag"), headers.get("Last-Modified"), now, now)
+        )
+        if old and old[0] != body_hash:
+            self._release(old[0])
+        self._evict()
+        self.conn.commit()
+
+    def _release(self, body_hash):
+        # bodies are shared between URLs with identical content, so only
+        # delete the file once nothing points at it
+        in_use = self.conn.execute(
+            "SELECT 1 FROM entries WHERE body_hash = ? LIMIT 1", (body_hash,)
+        ).fetchone()
+        if in_use:
+            return
+        self.conn.execute("DELETE FROM bodies WHERE body_hash = ?", (body_hash,))
+        try:
+            os.remove(self._body_path(body_hash))
+        except FileNotFoundError:
+            pass
+
+    def _write_access_times(self):
+        self.conn.executemany(
+            "UPDATE entries SET last_access = ? WHERE url = ?",
+            [(at, url) for url, at in self.accessed.items()]
+        )
+        self.accessed.clear()
+
+    def _evict(self):
+        self._write_access_times()
+        total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM bodies").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        lru = self.conn.execute(
+            "SELECT url, body_hash FROM entries ORDER BY last_access"
+        ).fetchall()
+        for url, body_hash in lru:
+            size = self.conn.execute(
+                "SELECT size FROM bodies WHERE body_hash = ?", (body_hash,)
+            ).fetchone()
+            self.conn.execute("DELETE FROM entries WHERE url = ?", (url,))
+            self._release(body_hash)
+            if size and not self.conn.execute(
+                "SELECT 1 FROM bodies WHERE body_hash = ?", (body_hash,)
+            ).fetchone():
+                total -= size[0]
+            if total <= self.max_bytes:
+                break
+
+    def _record(self, outcome):
+        self.stats[outcome] += 1
+        count("http_cache_total", outcome=outcome)
+
+    def get(self, url, timeout=10):
+        entry = self.lookup(url)
+        if entry and self.is_fresh(entry):
+            self._record("hits")
+            return self.read(url, entry)
+
+        res = requests.get(url, timeout=timeout, headers=self.conditional_headers(entry))
+        if res.status_code == 304 and entry:
+            self._record("revalidated")
+            self.refresh(url, entry, res.headers)
+            return self.read(url, entry)
+
+        self._record("misses")
+        if res.status_code == 200:
+            self.store(url, res.text, res.headers)
+        return res.text
+
+    async def get_async(self, session, url):
+        entry = self.lookup(url)
+        if entry and self.is_fresh(entry):
+            self._record("hits")
+            return self.read(url, entry)
+
+        async with session.get(url, headers=self.conditional_headers(entry)) as res:
+            if res.status == 304 and entry:
+                self._record("revalidated")
+                self.refresh(url, entry, res.headers)
+                return self.read(url, entry)
+            text = await res.text(errors="replace")
+
+        self._record("misses")
+        if res.status == 200:
+            self.store(url, text, res.headers)
+        return text
+
+    def report(self):
+        total = sum(self.stats.values())
+        local = self.stats["hits"] + self.stats["revalidated"]
+        rate = local / total if total else 0.0
+        print(
+            f"HTTP cache: {self.stats['hits']} hits, {self.stats['revalidated']} revalidated (304), "
+            f"{self.stats['misses']} misses ({rate:.0%} served without a full download)"
+        )
+        return dict(self.stats)
+
+    def close(self):
+        if self.accessed:
+            self._write_access_times()
+            self.conn.commit()
+        self.conn.close()
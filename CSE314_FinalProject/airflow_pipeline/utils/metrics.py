@@ -0,0 +1,199 @@
+import functools
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+
+# Process-wide timers, counters and latency histograms for the pipeline.
+# Call sites use the module-level count/observe/timer/stage helpers; with
+# PIPELINE_METRICS=0 they return after a single attribute check, and timer()
+# hands back a shared no-op context manager.
+#
+# instrument_task wraps a DAG task: it resets the registry, runs the task,
+# writes a Prometheus textfile (node_exporter textfile collector format) and
+# returns the snapshot so Airflow stores it as the task's XCom.
+
+METRICS_ENV = "PIPELINE_METRICS"
+TEXTFILE_DIR = os.environ.get("PIPELINE_METRICS_DIR", "/tmp/metrics")
+PREFIX = "pipeline_"
+
+# seconds; covers a cached page read up to a slow Snowflake load
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300)
+
+
+class _NullTimer:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class _Timer:
+    __slots__ = ("registry", "name", "labels", "log", "start")
+
+    def __init__(self, registry, name, labels, log):
+        self.registry = registry
+        self.name = name
+        self.labels = labels
+        self.log = log
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        seconds = time.perf_counter() - self.start
+        self.registry.observe(self.name, seconds, **self.labels)
+        if self.log:
+            log_event(self.name, seconds=round(seconds, 4), error=exc_type.__name__ if exc_type else None, **self.labels)
+        return False
+
+
+class Registry:
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.counters = {}
+            self.histograms = {}  # key -> [bucket counts, count, sum]
+
+    def count(self, name, value=1, **labels):
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name, value, **labels):
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            hist = self.histograms.get(key)
+            if hist is None:
+                hist = self.histograms[key] = [[0] * len(BUCKETS), 0, 0.0]
+            i = bisect_left(BUCKETS, value)
+            if i < len(BUCKETS):
+                hist[0][i] += 1
+            hist[1] += 1
+            hist[2] += value
+
+    def timer(self, name, **labels):
+        """Context manager observing its duration in the `name` histogram."""
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self, name, labels, log=False)
+
+    def stage(self, name, **labels):
+        """Like timer, for coarse pipeline stages: also logs a structured line when the stage ends."""
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self, "stage_seconds", {"stage": name, **labels}, log=True)
+
+    def snapshot(self):
+        # JSON-serializable, so it can go straight into XCom
+        with self.lock:
+            counters = [
+                {"name": name, "labels": dict(labels), "value": value}
+                for (name, labels), value in sorted(self.counters.items())
+            ]
+            histograms = []
+            for (name, labels), (buckets, n, total) in sorted(self.histograms.items()):
+                cumulative, running = {}, 0
+                for le, hits in zip(BUCKETS, buckets):
+                    running += hits
+                    cumulative[str(le)] = running
+                histograms.append({"name": name, "labels": dict(labels), "count": n, "sum": total, "buckets": cumulative})
+        return {"counters": counters, "histograms": histograms}
+
+    def prometheus(self):
+        snapshot = self.snapshot()
+        lines, typed = [], set()
+
+        def labelset(labels, **extra):
+            items = {**labels, **extra}
+            if not items:
+                return ""
+            return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in sorted(items.items())) + "}"
+
+        for c in snapshot["counters"]:
+            metric = PREFIX + c["name"]
+            if metric not in typed:
+                lines.append(f"# TYPE {metric} counter")
+                typed.add(metric)
+            lines.append(f"{metric}{labelset(c['labels'])} {c['value']}")
+        for h in snapshot["histograms"]:
+            metric = PREFIX + h["name"]
+            if metric not in typed:
+                lines.append(f"# TYPE {metric} histogram")
+                typed.add(metric)
+            for le, running in h["buckets"].items():
+                lines.append(f"{metric}_bucket{labelset(h['labels'], le=le)} {running}")
+            lines.append(f"{metric}_bucket{labelset(h['labels'], le='+Inf')} {h['count']}")
+            lines.append(f"{metric}_sum{labelset(h['labels'])} {h['sum']}")
+            lines.append(f"{metric}_count{labelset(h['labels'])} {h['count']}")
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, job, directory=TEXTFILE_DIR):
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{PREFIX}{job}.prom")
+        tmp = f"{path}.tmp"
+        with open(tmp, "w") as f:
+            f.write(self.prometheus())
+        os.replace(tmp, path)  # the collector must never see a half-written file
+        return path
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+REGISTRY = Registry(enabled=os.environ.get(METRICS_ENV, "1") != "0")
+
+count = REGISTRY.count
+observe = REGISTRY.observe
+timer = REGISTRY.timer
+stage = REGISTRY.stage
+
+
+def log_event(event, **fields):
+    if not REGISTRY.enabled:
+        return
+    print(json.dumps({"event": event, "ts": round(time.time(), 3), **fields}, default=str))
+
+
+def instrument_task(fn, keep_result=False, label_kwargs=()):
+    """
+    Wraps a DAG task callable: metrics start from zero, the whole task is a
+    stage, and on the way out the registry is written as a Prometheus
+    textfile named after the task and returned (Airflow pushes the return
+    value to XCom) in place of the task's own return value.
+
+    keep_result=True returns the task's own value instead, for tasks whose
+    XCom feeds downstream tasks. label_kwargs names keyword arguments whose
+    values go into the textfile name, so the instances of a mapped task
+    don't overwrite each other's file.
+    """
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        job = "_".join([fn.__name__] + [str(kwargs[k]) for k in label_kwargs if k in kwargs])
+        REGISTRY.reset()
+        try:
+            with stage(fn.__name__):
+                result = fn(*args, **kwargs)
+        finally:
+            if REGISTRY.enabled:
+                path = REGISTRY.write_textfile(job)
+                log_event("metrics_written", task=job, path=path)
+        if keep_result:
+            return result
+        return REGISTRY.snapshot() if REGISTRY.enabled else None
+    return wrapper
@@ -0,0 +1,20 @@
+import asyncio
+import time
+
+# Shared request budget for the async scrapers (Adzuna search, red-flag
+# completions): every request awaits wait() before it goes out, so starts
+# stay at least 1/rate seconds apart however many run concurrently.
+
+
+class RateLimiter:
+    """Spaces request starts at least 1/rate seconds apart."""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate else 0.0
+        self.next_slot = 0.0
+
+    async def wait(self):
+        now = time.monotonic()
+        slot = max(now, self.next_slot)
+        self.next_slot = slot + self.interval
+        await asyncio.sleep(slot - now)
@@ -0,0 +1,198 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from utils.metrics import log_event
+
+# Column types of every table the pipeline reads: the handoff tables, the
+# Adzuna CSV and the company alias file. Handoff files are written with the
+# Arrow schema derived from here, CSVs are read with the matching dtypes, and
+# both are loaded with:
+#   - CATEGORY for strings that repeat a lot (a listing's company, title,
+#     location, perks): one small int code per row plus each distinct value
+#     once, instead of a Python str object per row. Handoff files store them
+#     as plain strings; they are dictionary-encoded by Arrow on read, so no
+#     per-row Python objects are ever built.
+#   - INT as nullable Int64, so ids with gaps stay integers.
+#   - STRING (object) for text that is mostly unique: descriptions, URLs.
+
+STRING, CATEGORY, FLOAT, INT, BOOL = "string", "category", "float", "int", "bool"
+
+_ARROW_TYPES = {STRING: pa.string(), CATEGORY: pa.string(), FLOAT: pa.float64(), INT: pa.int64(), BOOL: pa.bool_()}
+_PANDAS_DTYPES = {STRING: object, CATEGORY: "category", FLOAT: "float64", INT: "Int64", BOOL: "boolean"}
+
+TABLES = {
+    # ——— scraped, as scrape_data hands them to clean_data ———
+    "internships_raw": {
+        "company_slug": CATEGORY,
+        "company_name": CATEGORY,
+        "title": CATEGORY,
+        "location": CATEGORY,
+        "hourly_rate": STRING,
+        "monthly_pay": STRING,
+        "perks": CATEGORY,
+        "apply_link": STRING,
+    },
+    "companies_raw": {
+        "company_slug": STRING,
+        "description": STRING,
+        "website": STRING,
+        "twitter": STRING,
+        "linkedin": STRING,
+        "year_founded": STRING,
+        "num_employees": STRING,
+        "headquarters": STRING,
+    },
+    "simplify_raw": {
+        "company_name": STRING,
+        "company_simplify_slug": STRING,
+        "simplify_url": STRING,
+        "simplify_take": STRING,
+        "believer_points": STRING,
+        "critic_points": STRING,
+        "what_makes_unique": STRING,
+        "benefits": STRING,
+        "about_text": STRING,
+        "simplify_rating": STRING,
+        "competitive_edge": STRING,
+        "growth_potential": STRING,
+        "rating_differentiation": STRING,
+    },
+    # clean_internships' output, passed from clean_listings to build_internship_tables
+    "internships_clean": {
+        "company_slug": CATEGORY,
+        "company_name": CATEGORY,
+        "title": CATEGORY,
+        "location": CATEGORY,
+        "hourly_rate": FLOAT,
+        "monthly_pay": FLOAT,
+        "degree_requirement": CATEGORY,
+        "perks_clean": CATEGORY,
+        "apply_link": STRING,
+    },
+    # ——— exports, one per Snowflake table ———
+    "export_internships": {
+        "company_id": INT,
+        "title": STRING,
+        "location": STRING,
+        "hourly_rate": FLOAT,
+        "monthly_pay": FLOAT,
+        "degree_requirement": STRING,
+        "perks_clean": STRING,
+        "apply_link": STRING,
+        "internship_id": INT,
+    },
+    "export_companies": {
+        "normalized_slug": STRING,
+        "company_name": STRING,
+        "description": STRING,
+        "overview": STRING,
+        "website": STRING,
+        "twitter": STRING,
+        "linkedin": STRING,
+        "year_founded": INT,
+        "founded_year": INT,
+        "num_employees": INT,
+        "company_size": STRING,
+        "headquarters": STRING,
+        "simplify_headquarters": STRING,
+        "company_stage": STRING,
+        "total_funding": STRING,
+        "simplify_url": STRING,
+        "simplify_take": STRING,
+        "believer_points": STRING,
+        "critic_points": STRING,
+        "what_makes_unique": STRING,
+        "benefits": STRING,
+        "industries": STRING,
+        "company_id": INT,
+    },
+    "export_locations": {
+        "city": STRING,
+        "state": STRING,
+        "country": STRING,
+        "location_id": INT,
+    },
+    "export_internship_locations": {
+        "internship_id": INT,
+        "location_id": INT,
+        "is_remote": BOOL,
+    },
+    "export_industries": {
+        "name": STRING,
+        "industry_id": INT,
+    },
+    "export_company_industries": {
+        "company_id": INT,
+        "industry_id": INT,
+    },
+    # ——— CSVs ———
+    "adzuna_jobs": {
+        "Title": STRING,
+        "Company": CATEGORY,
+        "Location": CATEGORY,
+        "Category": CATEGORY,
+        "Created": STRING,
+        "Description": STRING,
+        "URL": STRING,
+    },
+    "company_aliases": {
+        "alias": STRING,
+        "canonical": STRING,
+        "key": STRING,
+        "score": FLOAT,
+    },
+}
+
+
+def arrow_schema(name):
+    return pa.schema([(column, _ARROW_TYPES[kind]) for column, kind in TABLES[name].items()])
+
+
+def pandas_dtypes(name, columns=None):
+    kinds = TABLES[name]
+    return {column: _PANDAS_DTYPES[kinds[column]] for column in (columns or kinds)}
+
+
+def category_columns(name):
+    return [column for column, kind in TABLES[name].items() if kind == CATEGORY]
+
+
+def encode_categories(table, name):
+    """Dictionary-encodes the CATEGORY columns of an Arrow table, so to_pandas() makes them Categoricals."""
+    categories = set(category_columns(name)) if name in TABLES else set()
+    for i, field in enumerate(table.schema):
+        if field.name in categories and pa.types.is_string(field.type):
+            table = table.set_column(i, field.name, pc.dictionary_encode(table.column(i)))
+    return table
+
+
+def read_csv(path, name, columns=None, **kwargs):
+    """pd.read_csv with the registry's dtypes; `columns` limits what is parsed at all."""
+    columns = list(columns or TABLES[name])
+    return pd.read_csv(path, usecols=columns, dtype=pandas_dtypes(name, columns), **kwargs)
+
+
+def memory_report(frames, log=True):
+    """
+    Deep memory use of each DataFrame in `frames` ({name: df}), and how much
+    of it is object / string columns (a Python str per row). Returns the
+    report as a DataFrame; with `log` each table is also logged as a
+    table_memory event.
+    """
+    rows = []
+    for name, df in frames.items():
+        usage = df.memory_usage(deep=True, index=False)
+        is_object = np.array([t == object or isinstance(t, pd.StringDtype) for t in df.dtypes], dtype=bool)
+        rows.append({
+            "table": name,
+            "rows": len(df),
+            "mib": usage.sum() / 2**20,
+            "object_mib": usage[is_object].sum() / 2**20,
+            "categorical_columns": sum(isinstance(t, pd.CategoricalDtype) for t in df.dtypes),
+        })
+        if log:
+            log_event("table_memory", table=name, rows=len(df), bytes=int(usage.sum()),
+                      object_bytes=int(usage[is_object].sum()))
+    return pd.DataFrame(rows, columns=["table", "rows", "mib", "object_mib", "categorical_columns"])
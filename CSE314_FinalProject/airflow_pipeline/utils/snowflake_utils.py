@@ -1,25 +1,292 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
 import snowflake.connector
+from snowflake.connector.errors import ProgrammingError
 from snowflake.connector.pandas_tools import write_pandas
 
-def upload_dataframe_to_snowflake(df, table_name):
-    conn = snowflake.connector.connect(
-        user="MALLARD",
-        password="L1lysunsk@ter@gmail.com",
-        account="IOB55870",
-        warehouse="MALLARD_WH",
-        database="MALLARD_DB",
-        schema="FINAL_PROJECT"
-    )
-    try:
-        success, nchunks, nrows, _ = write_pandas(
-            conn=conn,
+from scripts.clean_jobs_data import INTERNSHIP_KEY
+from utils.metrics import count, observe, timer
+
+# credentials come from the environment (or a JSON file named by
+# SNOWFLAKE_CONFIG_FILE), never from the code
+SNOWFLAKE_ENV = {
+    "user":      "SNOWFLAKE_USER",
+    "password":  "SNOWFLAKE_PASSWORD",
+    "account":   "SNOWFLAKE_ACCOUNT",
+    "warehouse": "SNOWFLAKE_WAREHOUSE",
+    "database":  "SNOWFLAKE_DATABASE",
+    "schema":    "SNOWFLAKE_SCHEMA",
+}
+SNOWFLAKE_DEFAULTS = {
+    "warehouse": "MALLARD_WH",
+    "database":  "MALLARD_DB",
+    "schema":    "FINAL_PROJECT",
+}
+
+UPLOAD_WORKERS = 4
+UPLOAD_CHUNK_SIZE = None  # None lets write_pandas upload each table as one chunk
+
+# natural keys used by upsert loads. The ids are derived from natural keys
+# (clean_jobs_data.stable_ids), so they are the same on every run and the
+# bridge tables, which are nothing but ids, can be keyed on them.
+UPSERT_KEYS = {
+    "TEST2_INTERNSHIPS":          INTERNSHIP_KEY,
+    "TEST2_COMPANIES":            ["normalized_slug"],
+    "TEST2_LOCATIONS":            ["city", "state", "country"],
+    "TEST2_INTERNSHIP_LOCATIONS": ["internship_id", "location_id"],
+    "TEST2_INDUSTRIES":           ["name"],
+    "TEST2_COMPANY_INDUSTRIES":   ["company_id", "industry_id"],
+}
+ROW_HASH = "row_hash"
+
+
+def load_snowflake_config(path=None):
+    config = dict(SNOWFLAKE_DEFAULTS)
+    path = path or os.environ.get("SNOWFLAKE_CONFIG_FILE")
+    if path:
+        with open(path) as f:
+            config.update(json.load(f))
+    for key, env_var in SNOWFLAKE_ENV.items():
+        if os.environ.get(env_var):
+            config[key] = os.environ[env_var]
+
+    missing = [key for key in ("user", "password", "account") if not config.get(key)]
+    if missing:
+        raise ValueError(
+            f"Missing Snowflake settings {missing}; set "
+            + ", ".join(SNOWFLAKE_ENV[key] for key in missing)
+            + " or point SNOWFLAKE_CONFIG_FILE at a JSON config"
+        )
+    return config
+
+
+def _quote(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+def with_row_hash(df):
+    """
+    Returns a copy of `df` with a `row_hash` column: a 64-bit hash of every
+    column's value, so a row whose hash is already in the target is unchanged.
+    """
+    hashed = pd.util.hash_pandas_object(df[sorted(df.columns)], index=False)
+    df = df.copy()
+    df[ROW_HASH] = hashed.to_numpy().view("int64")
+    return df
+
+
+class SnowflakeSink:
+    """One Snowflake session shared by every table in a load."""
+
+    def __init__(self, config=None):
+        self.conn = snowflake.connector.connect(**(config or load_snowflake_config()))
+
+    def existing_hashes(self, table_name, hashes):
+        # which of `hashes` are already in the table, compared server-side
+        # against a staged copy so only matches come back. None when the
+        # table doesn't exist yet, or has no row_hash column because it was
+        # loaded in append mode.
+        stage = f"{table_name}_HASHES"
+        success, _, _, _ = write_pandas(
+            conn=self.conn,
+            df=pd.DataFrame({ROW_HASH: hashes}),
+            table_name=stage,
+            auto_create_table=True,
+            overwrite=True,
+            table_type="temporary"
+        )
+        if not success:
+            raise RuntimeError(f"Staging {table_name} hashes failed.")
+
+        cur = self.conn.cursor()
+        try:
+            cur.execute(
+                f"SELECT DISTINCT s.{_quote(ROW_HASH)} FROM {_quote(stage)} s "
+                f"JOIN {_quote(table_name)} t ON t.{_quote(ROW_HASH)} = s.{_quote(ROW_HASH)}"
+            )
+            return [row[0] for row in cur.fetchall()]
+        except ProgrammingError as e:
+            if "does not exist" in str(e) or "invalid identifier" in str(e):
+                return None
+            raise
+        finally:
+            cur.execute(f"DROP TABLE IF EXISTS {_quote(stage)}")
+            cur.close()
+
+    def merge(self, df, table_name, keys):
+        stage = f"{table_name}_STAGE"
+        success, _, nrows, _ = write_pandas(
+            conn=self.conn,
             df=df,
-            table_name=table_name,
-            auto_create_table=True
+            table_name=stage,
+            auto_create_table=True,
+            overwrite=True,
+            table_type="temporary"
         )
-        if success:
-            print(f"Uploaded {nrows} rows to Snowflake table {table_name}.")
+        if not success:
+            raise RuntimeError(f"Staging {table_name} failed.")
+
+        cols = list(df.columns)
+        on = " AND ".join(f"t.{_quote(k)} IS NOT DISTINCT FROM s.{_quote(k)}" for k in keys)
+        updates = ", ".join(f"t.{_quote(c)} = s.{_quote(c)}" for c in cols if c not in keys)
+        col_list = ", ".join(_quote(c) for c in cols)
+        values = ", ".join(f"s.{_quote(c)}" for c in cols)
+        cur = self.conn.cursor()
+        try:
+            cur.execute(
+                f"MERGE INTO {_quote(table_name)} t USING {_quote(stage)} s ON {on} "
+                f"WHEN MATCHED THEN UPDATE SET {updates} "
+                f"WHEN NOT MATCHED THEN INSERT ({col_list}) VALUES ({values})"
+            )
+            cur.execute(f"DROP TABLE IF EXISTS {_quote(stage)}")
+        finally:
+            cur.close()
+        return nrows
+
+    def write(self, df, table_name, chunk_size=None, overwrite=False):
+        with timer("write_pandas_seconds", table=table_name):
+            success, nchunks, nrows, _ = write_pandas(
+                conn=self.conn,
+                df=df,
+                table_name=table_name,
+                chunk_size=chunk_size,
+                auto_create_table=True,
+                overwrite=overwrite
+            )
+        if not success:
+            raise RuntimeError(f"Upload to {table_name} failed.")
+        return nrows
+
+    def close(self):
+        self.conn.close()
+
+
+class SQLiteSink:
+    """
+    Local stand-in for SnowflakeSink with the same write/close interface, so
+    bulk loads can be run and timed offline. SQLite allows one writer at a
+    time, so writes are serialized on a lock.
+    """
+
+    def __init__(self, path=":memory:"):
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.lock = threading.Lock()
+
+    def write(self, df, table_name, chunk_size=None, overwrite=False):
+        with self.lock:
+            df.to_sql(table_name, self.conn, if_exists="replace" if overwrite else "append",
+                      index=False, chunksize=chunk_size)
+            self.conn.commit()
+        return len(df)
+
+    def existing_hashes(self, table_name, hashes):
+        # no columns at all when the table doesn't exist. Checked up front:
+        # SQLite reads a quoted name that isn't a column as a string literal.
+        stage = f"{table_name}_HASHES"
+        with self.lock:
+            columns = [row[1] for row in self.conn.execute(f"PRAGMA table_info({_quote(table_name)})")]
+            if ROW_HASH not in columns:
+                return None
+            pd.DataFrame({ROW_HASH: hashes}).to_sql(stage, self.conn, if_exists="replace", index=False)
+            rows = self.conn.execute(
+                f"SELECT DISTINCT s.{_quote(ROW_HASH)} FROM {_quote(stage)} s "
+                f"JOIN {_quote(table_name)} t ON t.{_quote(ROW_HASH)} = s.{_quote(ROW_HASH)}"
+            ).fetchall()
+            self.conn.execute(f"DROP TABLE {_quote(stage)}")
+            self.conn.commit()
+        return [row[0] for row in rows]
+
+    def merge(self, df, table_name, keys):
+        # SQLite has no MERGE: delete the matching keys, then insert the
+        # staged rows. `IS` is SQLite's null-safe equality.
+        stage = f"{table_name}_STAGE"
+        cols = ", ".join(_quote(c) for c in df.columns)
+        on = " AND ".join(f"{_quote(table_name)}.{_quote(k)} IS s.{_quote(k)}" for k in keys)
+        with self.lock:
+            df.to_sql(stage, self.conn, if_exists="replace", index=False)
+            self.conn.execute(f"CREATE INDEX {_quote(stage + '_KEYS')} ON {_quote(stage)} ({', '.join(map(_quote, keys))})")
+            self.conn.execute(
+                f"DELETE FROM {_quote(table_name)} WHERE EXISTS "
+                f"(SELECT 1 FROM {_quote(stage)} s WHERE {on})"
+            )
+            self.conn.execute(f"INSERT INTO {_quote(table_name)} ({cols}) SELECT {cols} FROM {_quote(stage)}")
+            self.conn.execute(f"DROP TABLE {_quote(stage)}")
+            self.conn.commit()
+        return len(df)
+
+    def close(self):
+        self.conn.close()
+
+
+def upsert_dataframe(df, table_name, keys, sink, chunk_size=None):
+    """
+    Loads only the rows of `df` that are new or changed since the last
+    upsert into `table_name`, merging them on `keys`. Rows are compared by
+    content hash: only the incoming hashes are staged and matched in the
+    database, so a run with no changes uploads no rows. A table that
+    doesn't exist yet, or has no row hashes because it was loaded in append
+    mode, is replaced with `df` whole. Returns the number of rows staged.
+    """
+    df = with_row_hash(df.drop_duplicates(subset=keys, keep="last"))
+    existing = sink.existing_hashes(table_name, df[ROW_HASH])
+    if existing is None:
+        return sink.write(df, table_name, chunk_size, overwrite=True)
+
+    changed = df[~df[ROW_HASH].isin(existing)]
+    if changed.empty:
+        return 0
+    return sink.merge(changed, table_name, keys)
+
+
+def bulk_load(tables, sink, max_workers=UPLOAD_WORKERS, chunk_size=UPLOAD_CHUNK_SIZE, chunk_sizes=None,
+              upsert=False, keys=UPSERT_KEYS):
+    """
+    Loads several tables through one sink concurrently.
+
+    `tables` is a list of (source, table_name) where source is a DataFrame
+    or a zero-argument callable returning one, so reading the next table
+    overlaps with uploading the previous. `chunk_sizes` can override
+    `chunk_size` per table. With `upsert=True` each table goes through
+    upsert_dataframe on its `keys` instead of being appended. Returns one
+    {"table", "rows", "seconds"} dict per table, in input order.
+    """
+    chunk_sizes = chunk_sizes or {}
+
+    def load_one(source, table_name):
+        start = time.perf_counter()
+        df = source() if callable(source) else source
+        table_chunk_size = chunk_sizes.get(table_name, chunk_size)
+        if upsert:
+            nrows = upsert_dataframe(df, table_name, keys[table_name], sink, table_chunk_size)
         else:
-            print(f"Upload to {table_name} failed.")
+            nrows = sink.write(df, table_name, table_chunk_size)
+        seconds = time.perf_counter() - start
+        observe("table_load_seconds", seconds, table=table_name)
+        count("rows_loaded_total", nrows, table=table_name)
+        print(f"Uploaded {nrows} rows to {table_name} in {seconds:.2f}s.")
+        return {"table": table_name, "rows": nrows, "seconds": seconds}
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = [pool.submit(load_one, source, table_name) for source, table_name in tables]
+        results = [future.result() for future in futures]
+    total_rows = sum(r["rows"] for r in results)
+    print(f"Bulk load: {total_rows} rows across {len(results)} tables in {time.perf_counter() - start:.2f}s.")
+    return results
+
+
+def upload_dataframe_to_snowflake(df, table_name):
+    sink = SnowflakeSink()
+    try:
+        nrows = sink.write(df, table_name)
+        print(f"Uploaded {nrows} rows to Snowflake table {table_name}.")
+    except RuntimeError:
+        print(f"Upload to {table_name} failed.")
     finally:
-        conn.close()
+        sink.close()
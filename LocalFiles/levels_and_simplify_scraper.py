@@ -30,13 +30,16 @@ def scrape_internships():
     rows = soup.find_all("tr", attrs={"data-index": True})
     internships = []
 
+    def text_of(el):
+        return el.get_text(strip=True) if el else ""
+
     for row in rows:
         try:
-            company_name = row.select_one(".company-info-cell h6").get_text(strip=True) if row.select_one(".company-info-cell h6") else ""
-            location_season = row.select_one(".company-info-cell p").get_text(strip=True) if row.select_one(".company-info-cell p") else ""
-            title = row.select_one("span.badge").get_text(strip=True) if row.select_one("span.badge") else ""
-            hourly = row.select_one(".hourly-salary-td h6 span.cashInText").get_text(strip=True) if row.select_one(".hourly-salary-td h6 span.cashInText") else ""
-            monthly = row.select_one(".hourly-salary-td p.text-muted span.cashInText").get_text(strip=True) if row.select_one(".hourly-salary-td p.text-muted span.cashInText") else ""
+            company_name = text_of(row.select_one(".company-info-cell h6"))
+            location_season = text_of(row.select_one(".company-info-cell p"))
+            title = text_of(row.select_one("span.badge"))
+            hourly = text_of(row.select_one(".hourly-salary-td h6 span.cashInText"))
+            monthly = text_of(row.select_one(".hourly-salary-td p.text-muted span.cashInText"))
             perk_tags = row.select(".tags-th p.cashInText")
             perks = "\n".join(p.get_text(strip=True) for p in perk_tags)
             apply_link_tag = row.select_one("a[href*='greenhouse']")